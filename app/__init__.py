@@ -4,6 +4,11 @@ Main application package
 Contains the app factory function.
 """
 
+# Standard library imports
+import os
+import threading
+import time
+
 # Third party imports
 import dash
 import dash_bootstrap_components as dbc
@@ -13,10 +18,11 @@ from flask_cas import login_required
 
 # Local application imports
 from config import DevConfig, ProdConfig
+from app.utils import figures
 from app.utils import jinja_filters
 
 
-def create_app():
+def create_app(config_object=None):
     """Application factory.
 
         - Creates a Flask object
@@ -24,18 +30,27 @@ def create_app():
         - Registers Flask extensions on routing (Flask blueprints)
         - Registers Dash applications
 
+    Args:
+        config_object (class, optional): Config to use instead of the default, e.g. `config.LocalConfig`
+
     Returns:
         Flask object
     """
     server = Flask(__name__)
 
     # Apply either development or production config
-    Config = DevConfig if get_debug_flag() else ProdConfig
+    Config = config_object or (DevConfig if get_debug_flag() else ProdConfig)
     server.config.from_object(Config)
 
-    # Register Flask extensions and routing
+    # Register Flask extensions, caches and routing
     register_extensions(server)
+    register_caches(server)
     register_blueprints(server)
+    register_commands(server)
+    register_metrics(server)
+
+    # Check chart figure dicts against Plotly's validators
+    figures.set_validation(server.config['VALIDATE_FIGURES'])
 
     # Register Jinja filters
     server.jinja_env.filters['datetimeformat'] = jinja_filters.datetimeformat
@@ -174,11 +189,100 @@ def register_extensions(server):
     """
     from app.extensions import cas
     from app.extensions import dynamo
+    from app.backends import init_backend
 
     cas.init_app(server)
+    init_backend(server, dynamo)  # Must precede dynamo.init_app
     dynamo.init_app(server)
 
 
+def register_caches(server):
+    """
+    Sizes process-wide caches from the server config and, if DEPTPROFILE_WARM_CACHE/SEARCHCOM_WARM_REFERENCE
+    are set, preloads the department profile data/searchcom reference data in background threads.
+
+    Args:
+        server (Flask object)
+
+    Returns:
+        None
+    """
+    from app.users import permission_cache, user_index
+    from app.deptprofile.data import department_cache, figure_cache, data_version, warm_department_cache
+    from app.searchcom.postings import posting_cache, posting_index_cache
+    from app.searchcom.reference import reference_cache, reload_reference_data
+    from app.utils.dynamo import configure_batch_workers
+    from app.utils.session_store import session_store
+
+    permission_cache.configure(maxsize=server.config['USER_CACHE_SIZE'], ttl=server.config['USER_CACHE_TTL'])
+    user_index.configure(ttl=server.config['USER_INDEX_TTL'], segments=server.config['USER_SCAN_SEGMENTS'])
+    department_cache.configure(maxsize=server.config['DEPTPROFILE_CACHE_SIZE'],
+                               ttl=server.config['DEPTPROFILE_CACHE_TTL'])
+    figure_cache.configure(maxsize=server.config['DEPTPROFILE_FIGURE_CACHE_SIZE'],
+                           ttl=server.config['DEPTPROFILE_CACHE_TTL'])
+    data_version.interval = server.config['DEPTPROFILE_VERSION_CHECK_INTERVAL']
+    data_version.reset()
+    posting_cache.configure(maxsize=server.config['SEARCHCOM_POSTING_CACHE_SIZE'],
+                            ttl=server.config['SEARCHCOM_POSTING_CACHE_TTL'])
+    posting_index_cache.configure(ttl=server.config['SEARCHCOM_POSTING_INDEX_TTL'])
+    reference_cache.configure(ttl=server.config['SEARCHCOM_REFERENCE_TTL'])
+    configure_batch_workers(server.config['DYNAMO_BATCH_WORKERS'])
+    session_store.configure(backend=server.config['SESSION_STORE_BACKEND'], maxsize=server.config['SESSION_STORE_SIZE'],
+                            ttl=server.config['SESSION_STORE_TTL'],
+                            path=server.config['SESSION_STORE_PATH'] or os.path.join(server.instance_path, 'sessions.db'))
+
+    if server.config['DEPTPROFILE_WARM_CACHE']:
+        _start_warmup(server, 'Department profile cache', warm_department_cache)
+
+    if server.config['SEARCHCOM_WARM_REFERENCE']:
+        _start_warmup(server, 'Searchcom reference data', reload_reference_data)
+
+
+def _start_warmup(server, description, load):
+    """
+    Runs a cache warm-up function in a daemon thread with an application context and logs its result
+
+    Args:
+        server (Flask object)
+        description (str): Name of the cache for log messages
+        load (func): Warm-up function, returns stats to log
+    """
+
+    def warm():
+        with server.app_context():
+            try:
+                stats = load()
+                server.logger.info(f'{description} warmed: {stats}')
+            except Exception:
+                server.logger.exception(f'{description} warm-up failed')
+
+    threading.Thread(target=warm, name=f'warmup-{load.__name__}', daemon=True).start()
+
+
+def register_metrics(server):
+    """
+    Logs the DynamoDB read metrics of the worker process every DYNAMO_METRICS_LOG_INTERVAL seconds, if set.
+
+    Args:
+        server (Flask object)
+
+    Returns:
+        None
+    """
+    from app.utils.dynamo import read_metrics
+
+    interval = server.config['DYNAMO_METRICS_LOG_INTERVAL']
+    if not interval:
+        return
+
+    def log():
+        while True:
+            time.sleep(interval)
+            server.logger.info(f'DynamoDB reads: {read_metrics.stats()}')
+
+    threading.Thread(target=log, name='dynamo-read-metrics', daemon=True).start()
+
+
 def register_blueprints(server):
     """
     Registers web routing to the Flask server.
@@ -204,3 +308,24 @@ def register_blueprints(server):
     # Register errors
     from app.errors import handlers
     server.register_blueprint(handlers.bp)
+
+
+def register_commands(server):
+    """
+    Registers Flask CLI commands, e.g. `flask build-posting-index`, `flask annotate-applicants`,
+    `flask rekey-course-types`, `flask build-permission-edges`.
+
+    Args:
+        server (Flask object)
+
+    Returns:
+        None
+    """
+    from app.searchcom.ingest import build_posting_index_command, annotate_applicants_command
+    from app.deptprofile.ingest import rekey_course_types_command
+    from app.users import build_permission_edges_command
+
+    server.cli.add_command(build_posting_index_command)
+    server.cli.add_command(annotate_applicants_command)
+    server.cli.add_command(rekey_course_types_command)
+    server.cli.add_command(build_permission_edges_command)
@@ -0,0 +1,24 @@
+"""
+Data backends
+
+The app talks to DynamoDB through `app.extensions.dynamo` and to S3 through the `S3_RESOURCE` config value.
+Setting DATA_BACKEND to 'memory' swaps both for in-process stand-ins, so that the app can run
+and be benchmarked without AWS. See `app.backends.memory` and `app.backends.fixtures`.
+"""
+
+
+def init_backend(server, dynamo):
+    """
+    Installs the data backend selected by the DATA_BACKEND config value.
+    Must be called before `dynamo.init_app`.
+
+    Args:
+        server (Flask object)
+        dynamo (flask_dynamo.Dynamo): Dynamo extension to install the backend on
+
+    Returns:
+        None
+    """
+    if server.config.get('DATA_BACKEND') == 'memory':
+        from app.backends.memory import install_memory_backend
+        install_memory_backend(server, dynamo)
@@ -0,0 +1,345 @@
+"""
+Synthetic fixtures for the app's DynamoDB tables and S3 buckets
+
+Generates departments, years, requisitions, applicants, users and faculty governance files
+with the same item layout as the production tables, at a configurable scale.
+Used with the in-memory backend for offline development and benchmarking.
+
+Example:
+        fixtures = generate_fixtures(scale=2)
+        load_fixtures(fixtures, app.config, dynamo_resource, s3_resource)
+"""
+
+# Standard library imports
+import random
+from decimal import Decimal
+
+# Local application imports
+from app.deptprofile.data import VERSION_KEY
+from app.deptprofile.layouts.filters import ALL_DROPDOWN_OPTIONS
+from app.deptprofile.utils.years import YEARS, MAX_FISCAL_YEAR
+from app.searchcom.crosstab import gen_cat, ethn_cat, hisp_cat
+from app.searchcom.ingest import build_posting_index, suppress_applicant
+from app.users import permission_edges
+
+
+ADMIN_UNI = 'admin1'  # User with access to everything
+
+# Counts per unit of scale
+REQS_PER_SCALE = 40
+USERS_PER_SCALE = 25
+FACGOV_FILES_PER_SCALE = 12  # Per committee
+REQS_PER_USER = 5
+
+AGGREGATE_DEPTS = ('AS', 'HUM', 'NS', 'SS')
+FORMER_LAYOUT_DEPTS = ('BIOL', 'HIST')  # Course items keyed as the data loader writes them, see app.deptprofile.ingest
+FACULTY_STATS = ('Tenured', 'NTBOT', 'NTBOT-professor-term', 'Lecturers', 'Other Full-Time', 'Adjunct')
+CLASSES_STATS = ('Tenured', 'NTBOT', 'NTBOT-professor-term', 'Lecturer', 'Supplemental', 'Part-time',
+                 'Graduate-student')
+GRAD_PROGRAMS = ('MASTERS', 'INTDMASTERS', 'HYBRIDMASTERS', 'SPS', 'PHD')
+PIPELINE_GROUPS = ('combined_1993-2012', 'tenured_1993-2007', 'untenured_2008-2012', 'untenured_2013-2016')
+COMMITTEES = ('EPPC', 'PPC', 'CED')
+
+
+def _decimal(value, places=2):
+    return Decimal(str(round(value, places)))
+
+
+def _departments():
+    """
+    Returns:
+        list[dict]: Dropdown options that are not separators
+    """
+    return [option for option in ALL_DROPDOWN_OPTIONS if not option.get('disabled')]
+
+
+def generate_deptprofile_items(rng):
+    """
+    One `DEPT#{code}` partition per department, with FACULTY_DATA, AGG#CLASSES, CLASSES#{course type},
+    AGG#ENRL, ENRL#{course type}, STUDENTS#* and FACULTY_LIST items for every year, plus the data version metadata item.
+    CLASSES and ENRL items of FORMER_LAYOUT_DEPTS have the course type after the fiscal year.
+    """
+    items = []
+    fiscal_years = [year.fiscal for _, year in sorted(YEARS.items())]
+
+    for dept in _departments():
+        pk = f"DEPT#{dept['value']}"
+        size = 10 if dept['value'] in AGGREGATE_DEPTS else 1
+        blank_grad = rng.random() < 0.2  # Some departments have no graduate programs
+
+        for fiscal in fiscal_years:
+
+            for ten_stat in FACULTY_STATS:
+                items.append({
+                    'PK': pk,
+                    'SK': f'DATA#FACULTY_DATA#{fiscal}#{ten_stat}',
+                    'ten_stat': ten_stat,
+                    'fte': _decimal(rng.uniform(0, 30) * size, 1),
+                    'percent_fem': _decimal(rng.uniform(0.1, 0.6)) if rng.random() > 0.1 else None,
+                    'percent_urm': _decimal(rng.uniform(0, 0.3)) if rng.random() > 0.1 else None,
+                })
+
+            if fiscal >= '2008':
+                for dataset in ('CLASSES', 'ENRL'):
+                    scale = 1 if dataset == 'CLASSES' else 25
+                    for ten_stat in CLASSES_STATS:
+                        count = rng.randint(0, 40) * size * scale
+                        items.append({
+                            'PK': pk,
+                            'SK': f'DATA#AGG#{dataset}#{fiscal}#{ten_stat}',
+                            'ten_stat': ten_stat,
+                            'count': Decimal(count),
+                        })
+                        for course_type in ('Core', 'Elective'):
+                            if dept['value'] in FORMER_LAYOUT_DEPTS:
+                                sk = f'DATA#{dataset}#{fiscal}#{course_type}#{ten_stat}'
+                            else:
+                                sk = f'DATA#{dataset}#{course_type.upper()}#{fiscal}#{ten_stat}'
+                            items.append({
+                                'PK': pk,
+                                'SK': sk,
+                                'ten_stat': ten_stat,
+                                'course_type': course_type,
+                                'count': Decimal(count // 2),
+                            })
+
+            items.append({
+                'PK': pk,
+                'SK': f'DATA#STUDENTS#UG#{fiscal}',
+                'year': fiscal,
+                'maj': str(rng.randint(0, 120) * size),
+                'conc': str(rng.randint(0, 40) * size),
+                'intdmaj': str(rng.randint(0, 15) * size),
+                'min': str(rng.randint(0, 30) * size),
+            })
+
+            for program in GRAD_PROGRAMS:
+                blank = blank_grad or rng.random() < 0.1
+                items.append({
+                    'PK': pk,
+                    'SK': f'DATA#STUDENTS#{program}#{fiscal}',
+                    'year': fiscal,
+                    'existing': '0' if blank else str(rng.randint(0, 60) * size),
+                    'cohort': '0' if blank else str(rng.randint(0, 20) * size),
+                    'selectivity': None if blank else _decimal(rng.uniform(0.05, 0.5)),
+                    'yield': None if blank else _decimal(rng.uniform(0.2, 0.8)),
+                })
+
+        if dept['value'] not in AGGREGATE_DEPTS:
+            for i in range(rng.randint(10, 60)):
+                items.append({
+                    'PK': pk,
+                    'SK': f'DATA#FACULTY_LIST#{MAX_FISCAL_YEAR}#{i:04d}',
+                    'ten_stat': rng.choice(FACULTY_STATS[:3]),
+                    'rank': rng.choice(('Professor', 'Associate Professor', 'Assistant Professor')),
+                    'name': f'Faculty Member {i}',
+                    'joint_interdisc': rng.choice(('', 'Joint', 'Interdisc.')),
+                    'fte': _decimal(rng.choice((0.5, 1, 1))),
+                })
+
+    items.append(dict(VERSION_KEY, data_version=f'{MAX_FISCAL_YEAR}.1'))
+
+    return items
+
+
+def generate_searchcom_items(rng, n_reqs):
+    """
+    Posting and applicant items for `n_reqs` requisitions, pipeline and subfields items for every department
+
+    Returns:
+        tuple: (postings, applicants, pipelines, subfields)
+    """
+    departments = [dept for dept in _departments() if dept['value'] not in AGGREGATE_DEPTS]
+    postings, applicants = [], []
+
+    for i in range(n_reqs):
+        req_num = str(10000 + i)
+        dept = rng.choice(departments)
+        start_year = rng.randint(2016, 2021)
+
+        postings.append({
+            'req_num': req_num,
+            'dept_code': dept['value'],
+            'dept_name': dept['label'],
+            'position_title': rng.choice(('Assistant Professor', 'Associate Professor', 'Professor')),
+            'academic_year': f'{start_year - 1}-{str(start_year)[-2:]}',
+            'open_date': f'{start_year - 1}-09-01',
+            'start_date': f'{start_year}-07-01',
+            'field': f"{dept['label']} (open field)",
+        })
+
+        # Small searches exercise the privacy thresholds
+        size = rng.choice((2, 8, 40, 150, 400))
+        xtab = {g: {e: {h: Decimal(0) for h in hisp_cat} for e in ethn_cat} for g in gen_cat}
+        for _ in range(size):
+            xtab[rng.choice(gen_cat)][rng.choice(ethn_cat)][rng.choice(hisp_cat)] += 1
+
+        def total(gender=None, ethnicities=None):
+            return sum(
+                count
+                for g, by_ethnicity in xtab.items() if gender in (None, g)
+                for e, by_hisp in by_ethnicity.items() if ethnicities is None or e in ethnicities
+                for count in by_hisp.values()
+            )
+
+        urm = ('American Indian or Alaska Native', 'Black or African American',
+               'Native Hawaiian or Other Pacific Islander')
+        agg = {
+            'person_id_count': Decimal(size),
+            'gender_Female_sum': total('Female'),
+            'gender_Male_sum': total('Male'),
+            'ethnicity_URM_sum': total(ethnicities=urm),
+            'ethnicity_Asian_sum': total(ethnicities=('Asian',)),
+            'ethnicity_White_sum': total(ethnicities=('White',)),
+        }
+        for name in ('gender_Female', 'ethnicity_URM', 'ethnicity_Asian', 'ethnicity_White'):
+            agg[f'{name}_pcnt'] = _decimal(100 * agg[f'{name}_sum'] / size, 1)
+
+        applicant = {
+            'req_num': req_num,
+            'refresh_date': '2020-11-15',
+            'agg': agg,
+            'xtab': xtab,
+        }
+        applicant.update(suppress_applicant(applicant))  # As `flask annotate-applicants` does
+        applicants.append(applicant)
+
+    pipelines, subfields = [], []
+    for dept in departments:
+        pipeline = {'Dept': dept['value']}
+        for group in PIPELINE_GROUPS:
+            for measure in ('women', 'urm', 'asian', 'white'):
+                pipeline[f'{group}_{measure}'] = _decimal(rng.uniform(1, 60), 1)
+        pipelines.append(pipeline)
+        subfields.append({'Dept': dept['value'], 'Subfield': f"{dept['label']}; related fields"})
+
+    return postings, applicants, pipelines, subfields
+
+
+def generate_user_items(rng, n_users, req_nums):
+    """
+    Users with random permissions, plus ADMIN_UNI with access to everything
+    """
+    all_depts = [dept['value'] for dept in _departments()]
+    users = [{
+        'UNI': ADMIN_UNI,
+        'fif': {'dept': set(all_depts), 'chair_dept': set(all_depts)},
+        'deptprofile': {'dept': set(all_depts), 'dept_chair': set(all_depts)},
+        'searchcom': {'reqs': set(req_nums)},
+        'admin_tag': True,
+        'facgov': True,
+    }]
+
+    for i in range(n_users):
+        depts = set(rng.sample(all_depts, rng.randint(1, 3)))
+        users.append({
+            'UNI': f'user{i}',
+            'fif': {'dept': depts, 'chair_dept': set()},
+            'deptprofile': {'dept': depts, 'dept_chair': set(rng.sample(sorted(depts), 1))},
+            'searchcom': {'reqs': set(rng.sample(req_nums, min(REQS_PER_USER, len(req_nums))))},
+            'admin_tag': False,
+            'facgov': rng.random() < 0.5,
+        })
+
+    return users
+
+
+def generate_facgov_items(rng, n_files):
+    """
+    Faculty governance file items and the matching S3 objects
+
+    Returns:
+        tuple: (items, objects by key)
+    """
+    items, objects = [], {}
+    years = [year.fiscal for _, year in sorted(YEARS.items())][-5:]
+
+    for committee in COMMITTEES:
+        for i in range(n_files):
+            year = rng.choice(years)
+            file_name = f'{committee} Report {i}.pdf'
+            items.append({'key': f'{committee}/{year}/{file_name}', 'unit': committee, 'year': year,
+                          'file_name': file_name})
+
+    for i in range(n_files):
+        year = rng.choice(years)
+        date = f'{int(year) - 1}-{rng.randint(9, 12)}-{rng.randint(10, 28)}'
+        for category in ('Agenda', 'Minutes'):
+            file_name = f'Faculty Meeting {category} {date}'
+            items.append({'key': f'faculty_meeting/{year}/{file_name}.pdf', 'unit': 'faculty_meeting',
+                          'year': year, 'file_name': file_name})
+
+    for item in items:
+        objects[item['key']] = f"%PDF-1.4 {item['file_name']}".encode('utf-8')
+
+    return items, objects
+
+
+def generate_fixtures(scale=1, seed=0):
+    """
+    Generates fixtures for every table and bucket of the app.
+
+    Args:
+        scale (int): Multiplier for the number of requisitions, users and faculty governance files.
+            Department profile data always covers all departments and years.
+        seed (int): Seed for reproducible fixtures
+
+    Returns:
+        dict: {'tables': {table config key: [items]}, 'objects': {bucket config key: {key: bytes}}}
+    """
+    rng = random.Random(seed)
+
+    postings, applicants, pipelines, subfields = generate_searchcom_items(rng, REQS_PER_SCALE * scale)
+    req_nums = [posting['req_num'] for posting in postings]
+    users = generate_user_items(rng, USERS_PER_SCALE * scale, req_nums)
+    facgov_items, facgov_objects = generate_facgov_items(rng, FACGOV_FILES_PER_SCALE * scale)
+
+    lab_occupancy = [
+        {'uni': ADMIN_UNI, 'timestamp': f'2020-07-{day:02d}T14:00:00Z', 'action': 'Entry',
+         'destination': 'My Lab', 'room': '501'}
+        for day in range(1, 29)
+    ]
+
+    return {
+        'tables': {
+            'DB_USERS': users,
+            'DB_USER_PERMISSIONS': [edge for user in users for edge in permission_edges(user)],
+            'DB_SEARCHCOM_POSTING': postings,
+            'DB_SEARCHCOM_POSTING_INDEX': build_posting_index(postings),
+            'DB_SEARCHCOM_APPLICANT': applicants,
+            'DB_SEARCHCOM_PIPELINE': pipelines,
+            'DB_SEARCHCOM_SUBFIELDS': subfields,
+            'DB_DEPTPROFILE': generate_deptprofile_items(rng),
+            'DB_FACGOV': facgov_items,
+            'DB_LAB_OCCUPANCY': lab_occupancy,
+        },
+        'objects': {
+            'FACGOV_BUCKET': facgov_objects,
+            'FIF_FILES_BUCKET': {f'{ADMIN_UNI}/FIF {year}.pdf': b'%PDF-1.4 FIF' for year in ('2019', '2020')},
+            'TEMPLATES_BUCKET': {'fif_changelog.html': b'{% extends "base.html" %}'},
+        },
+    }
+
+
+def load_fixtures(fixtures, config, dynamo_resource, s3_resource):
+    """
+    Writes fixtures to DynamoDB/S3 resources. Works with the in-memory stand-ins and with real boto3 resources.
+
+    Args:
+        fixtures (dict): Output of `generate_fixtures`
+        config (dict): App config with table and bucket names. Tables without a name are skipped.
+        dynamo_resource: boto3 DynamoDB resource or `MemoryDynamoResource`
+        s3_resource: boto3 S3 resource or `MemoryS3Resource`
+    """
+    for config_key, items in fixtures['tables'].items():
+        if not config.get(config_key):
+            continue
+        table = dynamo_resource.Table(config[config_key])
+        with table.batch_writer() as writer:
+            for item in items:
+                writer.put_item(Item=item)
+
+    for config_key, objects in fixtures['objects'].items():
+        bucket = s3_resource.Bucket(config[config_key])
+        for key, body in objects.items():
+            bucket.put_object(Key=key, Body=body)
@@ -0,0 +1,735 @@
+"""
+In-memory stand-ins for the DynamoDB and S3 resources
+
+Implements the subset of the boto3 resource API that the app uses:
+    - Table: get_item, put_item, query, scan, batch_writer
+    - Resource: batch_get_item
+    - S3: Bucket().Object().get(), Bucket().objects.filter(), Bucket().put_object()
+
+Queries support KeyConditionExpression (string or boto3 `Key` conditions, including BETWEEN and begins_with),
+FilterExpression (boto3 `Attr` conditions), ProjectionExpression, ExpressionAttributeNames/Values,
+IndexName, ScanIndexForward, Limit, ExclusiveStartKey and, for scans, Segment/TotalSegments.
+Results are paginated at DynamoDB's 1 MB limit (or MEMORY_PAGE_BYTES) and returned with LastEvaluatedKey,
+like the real service. With ReturnConsumedCapacity, read capacity units are estimated from the size of the
+items read, at 4 KB per unit.
+
+Every call is counted per table and operation in `MemoryDynamoResource.calls` for benchmarking,
+and can be delayed by MEMORY_LATENCY_MS to model network round trips.
+"""
+
+# Standard library imports
+import copy
+import datetime
+import io
+import json
+import math
+import re
+import threading
+import time
+import zlib
+from collections import Counter, namedtuple
+from decimal import Decimal
+from types import SimpleNamespace
+
+# Third party imports
+from boto3.dynamodb.conditions import AttributeBase, ConditionBase
+
+
+KeySchema = namedtuple('KeySchema', ['hash', 'range'])
+
+# Key schemas of the app's tables, by config key of the table name
+TABLE_SCHEMAS = {
+    'DB_USERS': KeySchema('UNI', None),
+    'DB_USER_PERMISSIONS': KeySchema('PK', 'SK'),
+    'DB_ACCESS_LOGS': KeySchema('resource-timestamp', 'accessedBy'),
+    'DB_SEARCHCOM_APPLICANT': KeySchema('req_num', None),
+    'DB_SEARCHCOM_POSTING': KeySchema('req_num', None),
+    'DB_SEARCHCOM_POSTING_INDEX': KeySchema('dept', 'part'),
+    'DB_SEARCHCOM_PIPELINE': KeySchema('Dept', None),
+    'DB_SEARCHCOM_SUBFIELDS': KeySchema('Dept', None),
+    'DB_LAB_OCCUPANCY': KeySchema('uni', 'timestamp'),
+    'DB_DEPTPROFILE': KeySchema('PK', 'SK'),
+    'DB_FACGOV': KeySchema('key', None),
+}
+
+# Global secondary indexes, by config key of the table name
+TABLE_INDEXES = {
+    'DB_FACGOV': {'unit-year-index': KeySchema('unit', 'year')},
+}
+
+# Config keys of the app's S3 buckets
+BUCKETS = ('FIF_FILES_BUCKET', 'TEMPLATES_BUCKET', 'FACGOV_BUCKET')
+
+MAX_PAGE_BYTES = 1024 * 1024  # DynamoDB returns at most 1 MB per query/scan call
+READ_UNIT_BYTES = 4 * 1024  # Item bytes per read capacity unit
+MAX_BATCH_GET_KEYS = 100  # Keys per BatchGetItem call
+BATCH_GET_PAGES = 16  # BatchGetItem returns at most 16 MB, i.e. 16 pages
+
+
+class MemoryBackendError(ValueError):
+    """Raised for requests the real service would reject"""
+    pass
+
+
+def install_memory_backend(server, dynamo):
+    """
+    Replaces the DynamoDB connection of `dynamo` and the S3_RESOURCE config value with in-memory stand-ins.
+    Tables are created for every table name in the config. If DATA_FIXTURES_SCALE is set,
+    synthetic fixtures of that scale are loaded.
+
+    Args:
+        server (Flask object)
+        dynamo (flask_dynamo.Dynamo): Must not be initialized yet
+    """
+    resource = MemoryDynamoResource(page_bytes=server.config.get('MEMORY_PAGE_BYTES', MAX_PAGE_BYTES),
+                                    latency=server.config.get('MEMORY_LATENCY_MS', 0) / 1000)
+
+    for config_key, schema in TABLE_SCHEMAS.items():
+        table_name = server.config.get(config_key)
+        if table_name:
+            resource.create_table(table_name, schema, TABLE_INDEXES.get(config_key, {}))
+
+    s3 = MemoryS3Resource()
+    for config_key in BUCKETS:
+        bucket_name = server.config.get(config_key)
+        if bucket_name:
+            s3.create_bucket(bucket_name)
+
+    # flask_dynamo caches its boto3 resource on the extension object, reuse that slot
+    dynamo._connection_instance = resource
+    server.config['S3_RESOURCE'] = s3
+
+    scale = server.config.get('DATA_FIXTURES_SCALE')
+    if scale:
+        from app.backends.fixtures import generate_fixtures, load_fixtures
+        load_fixtures(generate_fixtures(scale=scale), server.config, resource, s3)
+        resource.reset_calls()
+        s3.calls.clear()
+
+
+# EXPRESSIONS
+
+_MISSING = object()
+
+
+def _resolve_name(name, names):
+    """
+    Replaces #placeholders in a (dotted) attribute path with real names.
+
+    Returns:
+        list[str]: Path elements
+    """
+    names = names or {}
+    return [names.get(part, part) for part in name.split('.')]
+
+
+def _get_path(item, path):
+    """
+    Returns the value at a path in an item, or a sentinel if it does not exist
+    """
+    value = item
+    for part in path:
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _type(value):
+    """
+    DynamoDB type of a value. Python treats True as 1, DynamoDB's BOOL and N types never match.
+    """
+    if isinstance(value, bool):
+        return 'BOOL'
+    if isinstance(value, (int, float, Decimal)):
+        return 'N'
+    return type(value)
+
+
+def _equal(left, right):
+    return _type(left) == _type(right) and left == right
+
+
+def _compare(operator, left, right):
+    """
+    DynamoDB-style comparison: values of different types never match
+    """
+    if left is _MISSING:
+        return False
+
+    if _type(left) != _type(right):
+        return operator == '<>'
+
+    try:
+        if operator == '=':
+            return left == right
+        if operator == '<>':
+            return left != right
+        if operator == '<':
+            return left < right
+        if operator == '<=':
+            return left <= right
+        if operator == '>':
+            return left > right
+        if operator == '>=':
+            return left >= right
+    except TypeError:
+        return False
+
+    raise MemoryBackendError(f'Unsupported operator {operator}')
+
+
+def _evaluate_condition(condition, item):
+    """
+    Evaluates a boto3 `Key`/`Attr` condition against an item
+    """
+    expression = condition.get_expression()
+    operator = expression['operator']
+    values = expression['values']
+
+    if operator == 'AND':
+        return _evaluate_condition(values[0], item) and _evaluate_condition(values[1], item)
+    if operator == 'OR':
+        return _evaluate_condition(values[0], item) or _evaluate_condition(values[1], item)
+    if operator == 'NOT':
+        return not _evaluate_condition(values[0], item)
+
+    attribute = values[0]
+    if not isinstance(attribute, AttributeBase):
+        raise MemoryBackendError(f'Unsupported condition operand {attribute!r}')
+    value = _get_path(item, attribute.name.split('.'))
+
+    if operator == 'attribute_exists':
+        return value is not _MISSING
+    if operator == 'attribute_not_exists':
+        return value is _MISSING
+    if value is _MISSING:
+        return False
+    if operator == 'BETWEEN':
+        return _compare('>=', value, values[1]) and _compare('<=', value, values[2])
+    if operator == 'begins_with':
+        return isinstance(value, str) and value.startswith(values[1])
+    if operator == 'contains':
+        if isinstance(value, str):
+            return isinstance(values[1], str) and values[1] in value
+        return isinstance(value, (list, set)) and any(_equal(member, values[1]) for member in value)
+    if operator == 'IN':
+        return any(_equal(value, candidate) for candidate in values[1])
+
+    return _compare(operator, value, values[1])
+
+
+_KEY_BETWEEN = re.compile(r'^\s*(\S+)\s+BETWEEN\s+(:\w+)\s+AND\s+(:\w+)\s*$', re.IGNORECASE)
+_KEY_BEGINS_WITH = re.compile(r'^\s*begins_with\s*\(\s*([^,\s]+)\s*,\s*(:\w+)\s*\)\s*$', re.IGNORECASE)
+_KEY_COMPARISON = re.compile(r'^\s*(\S+)\s*(<=|>=|<|>|=)\s*(:\w+)\s*$')
+
+
+def _parse_key_condition(expression, names, values):
+    """
+    Parses a KeyConditionExpression string into a list of (attribute name, operator, operands) tuples.
+    Supports `=`, `<`, `<=`, `>`, `>=`, `BETWEEN` and `begins_with`.
+    """
+    values = values or {}
+    parts = re.split(r'\s+AND\s+', expression.strip(), flags=re.IGNORECASE)
+
+    # Re-join the two halves of BETWEEN ... AND ...
+    conditions = []
+    while parts:
+        part = parts.pop(0)
+        if re.search(r'\sBETWEEN\s', part, re.IGNORECASE):
+            part = f'{part} AND {parts.pop(0)}'
+        conditions.append(part)
+
+    parsed = []
+    for condition in conditions:
+        match = _KEY_BETWEEN.match(condition)
+        if match:
+            name, lower, upper = match.groups()
+            parsed.append(('.'.join(_resolve_name(name, names)), 'BETWEEN', (values[lower], values[upper])))
+            continue
+
+        match = _KEY_BEGINS_WITH.match(condition)
+        if match:
+            name, prefix = match.groups()
+            parsed.append(('.'.join(_resolve_name(name, names)), 'begins_with', (values[prefix],)))
+            continue
+
+        match = _KEY_COMPARISON.match(condition)
+        if match:
+            name, operator, value = match.groups()
+            parsed.append(('.'.join(_resolve_name(name, names)), operator, (values[value],)))
+            continue
+
+        raise MemoryBackendError(f'Unsupported key condition: {condition}')
+
+    return parsed
+
+
+def _flatten_key_condition(condition):
+    """
+    Converts a boto3 `Key` condition into the same tuples as `_parse_key_condition`
+    """
+    expression = condition.get_expression()
+    operator = expression['operator']
+    values = expression['values']
+
+    if operator == 'AND':
+        return _flatten_key_condition(values[0]) + _flatten_key_condition(values[1])
+
+    return [(values[0].name, operator, tuple(values[1:]))]
+
+
+def _matches_key_condition(parsed, item):
+    for name, operator, operands in parsed:
+        value = item.get(name, _MISSING)
+        if operator == 'BETWEEN':
+            matches = _compare('>=', value, operands[0]) and _compare('<=', value, operands[1])
+        elif operator == 'begins_with':
+            matches = isinstance(value, str) and value.startswith(operands[0])
+        else:
+            matches = _compare(operator, value, operands[0])
+
+        if not matches:
+            return False
+
+    return True
+
+
+def _projection_paths(expression, names):
+    """
+    Parses a ProjectionExpression. Like DynamoDB, rejects paths that are equal or where one is
+    a parent of the other.
+
+    Returns:
+        list[list[str]]: Path elements of every projected path
+    """
+    paths = [_resolve_name(raw_path.strip(), names) for raw_path in expression.split(',')]
+
+    for i, path in enumerate(paths):
+        for other in paths[i + 1:]:
+            if path[:len(other)] == other or other[:len(path)] == path:
+                raise MemoryBackendError(f'Invalid ProjectionExpression: Two document paths overlap with each other; '
+                                         f'path one: {path}, path two: {other}')
+
+    return paths
+
+
+def _project(item, expression, names):
+    """
+    Applies a ProjectionExpression to an item
+    """
+    projected = {}
+
+    for path in _projection_paths(expression, names):
+        value = _get_path(item, path)
+        if value is _MISSING:
+            continue
+
+        target = projected
+        for part in path[:-1]:
+            target = target.setdefault(part, {})
+        target[path[-1]] = value
+
+    return projected
+
+
+def _item_size(item):
+    """
+    Approximate size of an item in bytes, used for 1 MB pagination
+    """
+    return len(json.dumps(item, default=str))
+
+
+# DYNAMODB
+
+class MemoryTable(object):
+    """In-memory DynamoDB table. See module docstring for supported operations.
+
+    Args:
+        resource (MemoryDynamoResource): Owning resource, used for call counting and locking
+        name (str): Table name
+        schema (KeySchema): Primary key
+        indexes (dict[str, KeySchema]): Global secondary indexes
+    """
+
+    def __init__(self, resource, name, schema, indexes=None):
+        self._resource = resource
+        self.name = name
+        self.table_name = name
+        self.schema = schema
+        self.indexes = indexes or {}
+        self._items = {}
+        self._partitions = {}  # Hash key value -> {primary key: item}, to avoid full scans on query
+
+    def _key(self, item):
+        try:
+            return (item[self.schema.hash], item[self.schema.range] if self.schema.range else None)
+        except KeyError:
+            raise MemoryBackendError(f'Item is missing key attributes of table {self.name}')
+
+    def _count(self, operation):
+        self._resource.record_call(self.name, operation)
+
+    def get_item(self, Key, ProjectionExpression=None, ExpressionAttributeNames=None, ConsistentRead=False):
+        self._count('get_item')
+
+        with self._resource.lock:
+            item = self._items.get(self._key(Key))
+
+        if item is None:
+            return {}
+
+        if ProjectionExpression:
+            item = _project(item, ProjectionExpression, ExpressionAttributeNames)
+
+        return {'Item': copy.deepcopy(item)}
+
+    def put_item(self, Item):
+        self._count('put_item')
+
+        with self._resource.lock:
+            self._put(Item)
+
+        return {}
+
+    def delete_item(self, Key):
+        self._count('delete_item')
+
+        with self._resource.lock:
+            self._delete(Key)
+
+        return {}
+
+    def _put(self, item):
+        key = self._key(item)
+        item = copy.deepcopy(item)
+        self._items[key] = item
+        self._partitions.setdefault(key[0], {})[key] = item
+
+    def _delete(self, key):
+        key = self._key(key)
+        self._items.pop(key, None)
+        self._partitions.get(key[0], {}).pop(key, None)
+
+    def batch_writer(self, overwrite_by_pkeys=None):
+        return MemoryBatchWriter(self)
+
+    def query(self, KeyConditionExpression, IndexName=None, FilterExpression=None, ProjectionExpression=None,
+              ExpressionAttributeNames=None, ExpressionAttributeValues=None, ScanIndexForward=True,
+              Limit=None, ExclusiveStartKey=None, ConsistentRead=False, Select=None, ReturnConsumedCapacity=None):
+        self._count('query')
+
+        if IndexName is not None and IndexName not in self.indexes:
+            raise MemoryBackendError(f'Table {self.name} has no index {IndexName}')
+        schema = self.indexes[IndexName] if IndexName else self.schema
+
+        if isinstance(KeyConditionExpression, ConditionBase):
+            key_condition = _flatten_key_condition(KeyConditionExpression)
+        else:
+            key_condition = _parse_key_condition(KeyConditionExpression, ExpressionAttributeNames,
+                                                 ExpressionAttributeValues)
+
+        if not any(name == schema.hash and operator == '=' for name, operator, _ in key_condition):
+            raise MemoryBackendError(f'Query condition must include an equality on {schema.hash}')
+
+        with self._resource.lock:
+            if IndexName is None:
+                hash_value = next(operands[0] for name, operator, operands in key_condition
+                                  if name == schema.hash and operator == '=')
+                candidates = self._partitions.get(hash_value, {}).values()
+            else:
+                candidates = self._items.values()
+            items = [item for item in candidates if _matches_key_condition(key_condition, item)]
+
+        if schema.range:
+            items = [item for item in items if schema.range in item]
+            items.sort(key=lambda item: item[schema.range], reverse=not ScanIndexForward)
+
+        key_names = [name for name in (self.schema.hash, self.schema.range, schema.hash, schema.range) if name]
+        response = self._page(items, key_names, FilterExpression, ProjectionExpression, ExpressionAttributeNames,
+                              Limit, ExclusiveStartKey, Select)
+        return self._consumed(response, ReturnConsumedCapacity, ConsistentRead)
+
+    def scan(self, FilterExpression=None, ProjectionExpression=None, ExpressionAttributeNames=None,
+             ExpressionAttributeValues=None, Limit=None, ExclusiveStartKey=None, ConsistentRead=False, Select=None,
+             ReturnConsumedCapacity=None, Segment=None, TotalSegments=None):
+        self._count('scan')
+
+        with self._resource.lock:
+            items = list(self._items.values())
+
+        if TotalSegments:
+            # Segments split the table by hash key, like DynamoDB's partitions
+            items = [item for item in items
+                     if zlib.crc32(repr(item[self.schema.hash]).encode()) % TotalSegments == Segment]
+
+        key_names = [name for name in self.schema if name]
+        response = self._page(items, key_names, FilterExpression, ProjectionExpression, ExpressionAttributeNames,
+                              Limit, ExclusiveStartKey, Select)
+        return self._consumed(response, ReturnConsumedCapacity, ConsistentRead)
+
+    def _consumed(self, response, return_consumed_capacity, consistent_read):
+        """
+        Adds ConsumedCapacity to a query or scan response if requested. Eventually consistent reads cost half.
+        """
+        page_bytes = response.pop('_bytes')
+        if return_consumed_capacity in ('TOTAL', 'INDEXES'):
+            units = max(1, math.ceil(page_bytes / READ_UNIT_BYTES)) * (1 if consistent_read else 0.5)
+            response['ConsumedCapacity'] = {'TableName': self.name, 'CapacityUnits': units}
+        return response
+
+    def _page(self, items, key_names, filter_expression, projection, names, limit, start_key, select):
+        """
+        Reads one page of items (up to `limit` items or the page size in bytes),
+        then applies the filter and projection, as DynamoDB does.
+        The response includes the size of the items read as `_bytes`.
+        """
+        if start_key is not None:
+            start = tuple(start_key.get(name) for name in key_names)
+            for position, item in enumerate(items):
+                if tuple(item.get(name) for name in key_names) == start:
+                    items = items[position + 1:]
+                    break
+
+        page, page_bytes = [], 0
+        for item in items:
+            size = _item_size(item)
+            if page and page_bytes + size > self._resource.page_bytes:
+                break
+            page.append(item)
+            page_bytes += size
+            if limit is not None and len(page) >= limit:
+                break
+
+        response = {'ScannedCount': len(page), '_bytes': page_bytes}
+
+        if len(page) < len(items):
+            last = page[-1]
+            response['LastEvaluatedKey'] = {name: last[name] for name in key_names if name in last}
+
+        if filter_expression is not None:
+            page = [item for item in page if _evaluate_condition(filter_expression, item)]
+
+        response['Count'] = len(page)
+        if select == 'COUNT':
+            return response
+
+        if projection:
+            page = [_project(item, projection, names) for item in page]
+
+        response['Items'] = copy.deepcopy(page)
+        return response
+
+
+class MemoryBatchWriter(object):
+    """Stand-in for boto3's BatchWriter. Counts one call per 25 items, like BatchWriteItem."""
+
+    def __init__(self, table):
+        self._table = table
+        self._buffer = []
+
+    def put_item(self, Item):
+        self._buffer.append(('put', Item))
+        if len(self._buffer) >= 25:
+            self._flush()
+
+    def delete_item(self, Key):
+        self._buffer.append(('delete', Key))
+        if len(self._buffer) >= 25:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+
+        self._table._count('batch_write_item')
+        with self._table._resource.lock:
+            for action, item in self._buffer:
+                if action == 'put':
+                    self._table._put(item)
+                else:
+                    self._table._delete(item)
+        self._buffer = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self._flush()
+
+
+class MemoryDynamoResource(object):
+    """Stand-in for `boto3.resource('dynamodb')`.
+
+    Args:
+        page_bytes (int): Approximate size at which query and scan results are paginated.
+        latency (float): Seconds every call is delayed by
+
+    Attributes:
+        calls (collections.Counter): Number of calls by (table name, operation)
+    """
+
+    def __init__(self, page_bytes=MAX_PAGE_BYTES, latency=0):
+        self.lock = threading.RLock()
+        self.page_bytes = page_bytes
+        self.latency = latency
+        self.calls = Counter()
+        self._tables = {}
+
+    def record_call(self, name, operation):
+        """
+        Counts a call and waits for the configured latency
+        """
+        with self.lock:
+            self.calls[(name, operation)] += 1
+
+        if self.latency:
+            time.sleep(self.latency)
+
+    def create_table(self, name, schema, indexes=None):
+        self._tables[name] = MemoryTable(self, name, schema, indexes)
+        return self._tables[name]
+
+    def Table(self, name):
+        try:
+            return self._tables[name]
+        except KeyError:
+            raise MemoryBackendError(f'Table {name} does not exist')
+
+    def batch_get_item(self, RequestItems):
+        """
+        Reads up to 100 items across tables. Keys beyond the 16 MB response limit are returned as UnprocessedKeys.
+        Counted as one call under the table name (names joined with '+' for multi-table requests).
+        """
+        if sum(len(request['Keys']) for request in RequestItems.values()) > MAX_BATCH_GET_KEYS:
+            raise MemoryBackendError(f'Too many keys in BatchGetItem, the maximum is {MAX_BATCH_GET_KEYS}')
+
+        self.record_call('+'.join(sorted(RequestItems)), 'batch_get_item')
+
+        responses, unprocessed = {}, {}
+        response_bytes = 0
+
+        for name, request in RequestItems.items():
+            table = self.Table(name)
+            keys = [table._key(key) for key in request['Keys']]
+            if len(set(keys)) < len(keys):
+                raise MemoryBackendError('Provided list of item keys contains duplicates')
+
+            responses[name] = []
+            for key, request_key in zip(keys, request['Keys']):
+                with self.lock:
+                    item = table._items.get(key)
+
+                if item is None:
+                    continue
+
+                response_bytes += _item_size(item)
+                if response_bytes > BATCH_GET_PAGES * self.page_bytes and responses[name]:
+                    unprocessed.setdefault(name, dict(request, Keys=[]))['Keys'].append(request_key)
+                    continue
+
+                if request.get('ProjectionExpression'):
+                    item = _project(item, request['ProjectionExpression'], request.get('ExpressionAttributeNames'))
+                responses[name].append(copy.deepcopy(item))
+
+        return {'Responses': responses, 'UnprocessedKeys': unprocessed}
+
+    def reset_calls(self):
+        self.calls.clear()
+
+
+# S3
+
+class NoSuchKey(Exception):
+    """Raised when an S3 object does not exist"""
+    pass
+
+
+class MemoryObjectSummary(object):
+
+    def __init__(self, bucket_name, key, body, last_modified):
+        self.bucket_name = bucket_name
+        self.key = key
+        self.size = len(body)
+        self.last_modified = last_modified
+
+
+class MemoryObject(object):
+
+    def __init__(self, bucket, key):
+        self._bucket = bucket
+        self.bucket_name = bucket.name
+        self.key = key
+
+    def get(self):
+        self._bucket._resource.calls[(self.bucket_name, 'get_object')] += 1
+
+        try:
+            body, last_modified = self._bucket._objects[self.key]
+        except KeyError:
+            raise NoSuchKey(self.key)
+
+        return {
+            'Body': io.BytesIO(body),
+            'ContentLength': len(body),
+            'LastModified': last_modified,
+        }
+
+
+class MemoryObjectCollection(object):
+
+    def __init__(self, bucket):
+        self._bucket = bucket
+
+    def all(self):
+        return self.filter()
+
+    def filter(self, Prefix=''):
+        self._bucket._resource.calls[(self._bucket.name, 'list_objects')] += 1
+        return [
+            MemoryObjectSummary(self._bucket.name, key, body, last_modified)
+            for key, (body, last_modified) in sorted(self._bucket._objects.items())
+            if key.startswith(Prefix)
+        ]
+
+
+class MemoryBucket(object):
+
+    def __init__(self, resource, name):
+        self._resource = resource
+        self._objects = {}
+        self.name = name
+        self.objects = MemoryObjectCollection(self)
+
+    def Object(self, key):
+        return MemoryObject(self, key)
+
+    def put_object(self, Key, Body):
+        if isinstance(Body, str):
+            Body = Body.encode('utf-8')
+        self._objects[Key] = (Body, datetime.datetime.now(datetime.timezone.utc))
+
+
+class MemoryS3Resource(object):
+    """Stand-in for `boto3.resource('s3')`.
+
+    `meta.client.exceptions.NoSuchKey` mirrors the boto3 attribute used to catch missing objects.
+
+    Attributes:
+        calls (collections.Counter): Number of calls by (bucket name, operation)
+    """
+
+    def __init__(self):
+        self._buckets = {}
+        self.calls = Counter()
+        self.meta = SimpleNamespace(client=SimpleNamespace(exceptions=SimpleNamespace(NoSuchKey=NoSuchKey)))
+
+    def create_bucket(self, name):
+        self._buckets[name] = MemoryBucket(self, name)
+        return self._buckets[name]
+
+    def Bucket(self, name):
+        try:
+            return self._buckets[name]
+        except KeyError:
+            raise MemoryBackendError(f'Bucket {name} does not exist')
@@ -4,18 +4,15 @@ Faculty tab callacks
 
 # Third party imports
 from dash.dependencies import Input, Output
-import plotly.graph_objs as go
-
-from flask import current_app
-
-from boto3.dynamodb.conditions import Attr
 
 # Local application imports
-from app.extensions import dynamo
+from app.utils import figures
+from app.deptprofile.data import get_department_data, memoize_figure, pluck
 
 from app.deptprofile.utils.styling import axes, margin
 from app.deptprofile.utils.colors import enrollments_colors, classes_colors
-from app.deptprofile.utils.years import YEARS, MAX_YEAR_ID, MAX_FISCAL_YEAR, make_academic_year_range
+from app.deptprofile.utils.years import YEARS, MAX_YEAR_ID, make_academic_year_range, make_fiscal_year_range
+from app.deptprofile.utils.charts import map_values
 
 from app.deptprofile.layouts.classes import classes_group, enrollments_group
 
@@ -44,44 +41,32 @@ def register_classes_callbacks(dashapp):
         elif choice == 'classes':
             return classes_group
 
-    table = dynamo.tables[current_app.config['DB_DEPTPROFILE']]
-
     # CLASSES
 
     @dashapp.callback(Output('classes-bar-chart', 'figure'),
                       [Input('dept-dropdown', 'value')])
+    @memoize_figure
     def update_classes_bar_chart(dept):
 
-        # Use ExpressionAttributeNames because 'count' is a restricted keyword for ProjectionExpression
-        resp = table.query(
-            KeyConditionExpression='PK = :pk AND SK BETWEEN :lower AND :upper',
-            ExpressionAttributeValues={
-                ':pk': f'DEPT#{dept}',
-                ':lower': 'DATA#AGG#CLASSES#2008',
-                ':upper': f'DATA#AGG#CLASSES#{int(MAX_FISCAL_YEAR) + 1}$',
-            },
-            ProjectionExpression='#c, ten_stat',
-            ExpressionAttributeNames={'#c': 'count'},
-            ScanIndexForward=True,
-        )
-
-        data = resp['Items']
+        dept_data = get_department_data(dept)
+        by_category = dept_data.series('AGG#CLASSES', make_fiscal_year_range(3, MAX_YEAR_ID), by='ten_stat')
 
         chart_data = []
         x_axis = make_academic_year_range(3, MAX_YEAR_ID)
 
         for data_cat, chart_cat in tenure_categories.items():
 
-            y_axis = [item.get('count') for item in data if item.get('ten_stat') == data_cat]
+            y_axis = pluck(by_category[data_cat], 'count')
 
             chart_data.append(
-                go.Bar(
+                figures.bar(
                     name=chart_cat,
                     x=x_axis,
                     y=y_axis,
-                    text=[f' {round(float(i)):,} ' for i in y_axis],  # pad with spaces to prevent labels from rotating
+                    # Pad with spaces to prevent labels from rotating
+                    text=map_values(y_axis, lambda i: f' {round(float(i)):,} '),
                     textposition='inside',
-                    hovertext=[f'{chart_cat}: {i}' for i in y_axis],
+                    hovertext=map_values(y_axis, lambda i: f'{chart_cat}: {i}'),
                     hoverinfo='text',
                     marker=dict(
                         color=classes_colors.get(data_cat),
@@ -93,7 +78,7 @@ def register_classes_callbacks(dashapp):
                 )
             )
 
-        chart_layout = go.Layout(
+        chart_layout = figures.layout(
             barmode='stack',
             xaxis=axes(),
             yaxis=axes(
@@ -109,37 +94,27 @@ def register_classes_callbacks(dashapp):
 
     @dashapp.callback(Output('classes-core-chart', 'figure'),
                       [Input('dept-dropdown', 'value')])
+    @memoize_figure
     def update_classes_core_chart(dept):
 
-        resp = table.query(
-            KeyConditionExpression='PK = :pk AND SK BETWEEN :lower AND :upper',
-            ExpressionAttributeValues={
-                ':pk': f'DEPT#{dept}',
-                ':lower': 'DATA#CLASSES#2008',
-                ':upper': f'DATA#CLASSES#{int(MAX_FISCAL_YEAR) + 1}$',
-            },
-            FilterExpression=Attr('course_type').eq('Core'),
-            ProjectionExpression='#c, ten_stat',
-            ExpressionAttributeNames={'#c': 'count'},
-            ScanIndexForward=True,
-        )
-
-        data = resp['Items']
+        dept_data = get_department_data(dept)
+        by_category = dept_data.series('CLASSES#CORE', make_fiscal_year_range(3, MAX_YEAR_ID), by='ten_stat')
 
         x_axis = make_academic_year_range(3, MAX_YEAR_ID)
         chart_data = []
         for data_cat, chart_cat in tenure_categories.items():
 
-            y_axis = [item.get('count') for item in data if item.get('ten_stat') == data_cat]
+            y_axis = pluck(by_category[data_cat], 'count')
 
             chart_data.append(
-                go.Bar(
+                figures.bar(
                     name=chart_cat,
                     x=x_axis,
                     y=y_axis,
-                    text=[f' {round(float(i)):,} ' for i in y_axis],  # pad with spaces to prevent labels from rotating
+                    # Pad with spaces to prevent labels from rotating
+                    text=map_values(y_axis, lambda i: f' {round(float(i)):,} '),
                     textposition='inside',
-                    hovertext=[f'{chart_cat}: {i}' for i in y_axis],
+                    hovertext=map_values(y_axis, lambda i: f'{chart_cat}: {i}'),
                     hoverinfo='text',
                     marker=dict(
                         color=classes_colors.get(data_cat),
@@ -151,7 +126,7 @@ def register_classes_callbacks(dashapp):
                 )
             )
 
-        chart_layout = go.Layout(
+        chart_layout = figures.layout(
             barmode='stack',
             xaxis=axes(),
             yaxis=axes(
@@ -166,35 +141,25 @@ def register_classes_callbacks(dashapp):
     @dashapp.callback(Output('classes-tree-chart', 'figure'),
                       [Input('dept-dropdown', 'value'),
                        Input('classes-tree-chart-slider', 'value')])
+    @memoize_figure
     def update_classes_tree_chart(dept, slider_year):
 
         chart_year = YEARS.get(slider_year).academic
         data_year = YEARS.get(slider_year).fiscal
 
-        resp = table.query(
-            KeyConditionExpression='PK = :pk AND SK BETWEEN :lower AND :upper',
-            ExpressionAttributeValues={
-                ':pk': f'DEPT#{dept}',
-                ':lower': f'DATA#AGG#CLASSES#{data_year}',
-                ':upper': f'DATA#AGG#CLASSES#{int(data_year) + 1}$',
-            },
-            ProjectionExpression='#c, ten_stat',
-            ExpressionAttributeNames={'#c': 'count'},
-            ScanIndexForward=True,
-        )
-
-        data = resp['Items']
+        dept_data = get_department_data(dept)
+        by_category = dept_data.series('AGG#CLASSES', [data_year], by='ten_stat')
 
         labels, parents, values = [], [], []
         for data_cat, chart_cat in tenure_categories.items():
             labels.append(chart_cat)
             parents.append(chart_year)
-            value = [int(float(item.get('count'))) for item in data if item.get('ten_stat') == data_cat]
-            values.append(value[0])
+            count, = pluck(by_category[data_cat], 'count')
+            values.append(0 if count is None else int(float(count)))
 
         chart_data = []
         chart_data.append(
-            go.Treemap(
+            figures.treemap(
                 labels=labels,
                 parents=parents,
                 values=values,
@@ -202,7 +167,7 @@ def register_classes_callbacks(dashapp):
             )
         )
 
-        chart_layout = go.Layout(
+        chart_layout = figures.layout(
             margin=margin(l=70),
         )
 
@@ -212,37 +177,28 @@ def register_classes_callbacks(dashapp):
 
     @dashapp.callback(Output('enrollments-bar-chart', 'figure'),
                       [Input('dept-dropdown', 'value')])
+    @memoize_figure
     def update_enrollments_bar_chart(dept):
 
-        resp = table.query(
-            KeyConditionExpression='PK = :pk AND SK BETWEEN :lower AND :upper',
-            ExpressionAttributeValues={
-                ':pk': f'DEPT#{dept}',
-                ':lower': 'DATA#AGG#ENRL#2008',
-                ':upper': f'DATA#AGG#ENRL#{int(MAX_FISCAL_YEAR) + 1}$',
-            },
-            ProjectionExpression='#c, ten_stat',
-            ExpressionAttributeNames={'#c': 'count'},
-            ScanIndexForward=True,
-        )
-
-        data = resp['Items']
+        dept_data = get_department_data(dept)
+        by_category = dept_data.series('AGG#ENRL', make_fiscal_year_range(3, MAX_YEAR_ID), by='ten_stat')
 
         chart_data = []
         x_axis = make_academic_year_range(3, MAX_YEAR_ID)
 
         for data_cat, chart_cat in tenure_categories.items():
 
-            y_axis = [item.get('count') for item in data if item.get('ten_stat') == data_cat]
+            y_axis = pluck(by_category[data_cat], 'count')
 
             chart_data.append(
-                go.Bar(
+                figures.bar(
                     name=chart_cat,
                     x=x_axis,
                     y=y_axis,
-                    text=[f' {round(float(i)):,} ' for i in y_axis],  # pad with spaces to prevent labels from rotating
+                    # Pad with spaces to prevent labels from rotating
+                    text=map_values(y_axis, lambda i: f' {round(float(i)):,} '),
                     textposition='inside',
-                    hovertext=[f'{chart_cat}: {i}' for i in y_axis],
+                    hovertext=map_values(y_axis, lambda i: f'{chart_cat}: {i}'),
                     hoverinfo='text',
                     marker=dict(
                         color=enrollments_colors.get(data_cat),
@@ -254,7 +210,7 @@ def register_classes_callbacks(dashapp):
                 )
             )
 
-        chart_layout = go.Layout(
+        chart_layout = figures.layout(
             barmode='stack',
             xaxis=axes(),
             yaxis=axes(
@@ -270,37 +226,27 @@ def register_classes_callbacks(dashapp):
 
     @dashapp.callback(Output('enrollments-core-chart', 'figure'),
                       [Input('dept-dropdown', 'value')])
+    @memoize_figure
     def update_enrollments_core_chart(dept):
 
-        resp = table.query(
-            KeyConditionExpression='PK = :pk AND SK BETWEEN :lower AND :upper',
-            ExpressionAttributeValues={
-                ':pk': f'DEPT#{dept}',
-                ':lower': 'DATA#ENRL#2008',
-                ':upper': f'DATA#ENRL#{int(MAX_FISCAL_YEAR) + 1}$',
-            },
-            FilterExpression=Attr('course_type').eq('Core'),
-            ProjectionExpression='#c, ten_stat',
-            ExpressionAttributeNames={'#c': 'count'},
-            ScanIndexForward=True,
-        )
-
-        data = resp['Items']
+        dept_data = get_department_data(dept)
+        by_category = dept_data.series('ENRL#CORE', make_fiscal_year_range(3, MAX_YEAR_ID), by='ten_stat')
 
         x_axis = make_academic_year_range(3, MAX_YEAR_ID)
         chart_data = []
         for data_cat, chart_cat in tenure_categories.items():
 
-            y_axis = [item.get('count') for item in data if item.get('ten_stat') == data_cat]
+            y_axis = pluck(by_category[data_cat], 'count')
 
             chart_data.append(
-                go.Bar(
+                figures.bar(
                     name=chart_cat,
                     x=x_axis,
                     y=y_axis,
-                    text=[f' {round(float(i)):,} ' for i in y_axis],  # pad with spaces to prevent labels from rotating
+                    # Pad with spaces to prevent labels from rotating
+                    text=map_values(y_axis, lambda i: f' {round(float(i)):,} '),
                     textposition='inside',
-                    hovertext=[f'{chart_cat}: {i}' for i in y_axis],
+                    hovertext=map_values(y_axis, lambda i: f'{chart_cat}: {i}'),
                     hoverinfo='text',
                     marker=dict(
                         color=enrollments_colors.get(data_cat),
@@ -312,7 +258,7 @@ def register_classes_callbacks(dashapp):
                 )
             )
 
-        chart_layout = go.Layout(
+        chart_layout = figures.layout(
             barmode='stack',
             xaxis=axes(),
             yaxis=axes(
@@ -3,29 +3,24 @@ Faculty tab callacks
 """
 
 # Third party imports
+import numpy as np
 from dash.dependencies import Input, Output
-import plotly.graph_objs as go
-
-from flask import current_app
-
-from boto3.dynamodb.conditions import Attr
 
 # Local application imports
+from app.utils import figures
 from app.users import User
-from app.extensions import dynamo
+from app.deptprofile.data import get_department_data, memoize_figure, pluck, to_list
 
 from app.deptprofile.utils.styling import axes, margin
 from app.deptprofile.utils.colors import colors, faculty_colors
-from app.deptprofile.utils.years import MAX_YEAR_ID, MAX_FISCAL_YEAR, make_academic_year_range
-from app.deptprofile.utils.charts import make_text_labels
+from app.deptprofile.utils.years import MAX_YEAR_ID, MAX_FISCAL_YEAR, make_academic_year_range, make_fiscal_year_range
+from app.deptprofile.utils.charts import make_text_labels, map_values
 
 from app.deptprofile.layouts.faculty import faculty_fte_chart, faculty_demo_chart
 
 
 def register_faculty_callbacks(dashapp):
 
-    table = dynamo.tables[current_app.config['DB_DEPTPROFILE']]
-
     # CHART
 
     @dashapp.callback(Output('faculty-chart-container', 'children'),
@@ -41,20 +36,11 @@ def register_faculty_callbacks(dashapp):
 
     @dashapp.callback(Output('faculty-fte-chart', 'figure'),
                       [Input('dept-dropdown', 'value')])
+    @memoize_figure
     def update_faculty_fte_chart(dept):
 
-        resp = table.query(
-            KeyConditionExpression='PK = :pk AND SK BETWEEN :lower AND :upper',
-            ExpressionAttributeValues={
-                ':pk': f'DEPT#{dept}',
-                ':lower': 'DATA#FACULTY_DATA#2005',
-                ':upper': f'DATA#FACULTY_DATA#{int(MAX_FISCAL_YEAR) + 1}$',
-            },
-            ProjectionExpression='fte, ten_stat',
-            ScanIndexForward=True,
-        )
-
-        data = resp['Items']
+        dept_data = get_department_data(dept)
+        by_category = dept_data.series('FACULTY_DATA', make_fiscal_year_range(0, MAX_YEAR_ID), by='ten_stat')
 
         chart_data = []
         x_axis = make_academic_year_range(0, MAX_YEAR_ID)
@@ -71,16 +57,17 @@ def register_faculty_callbacks(dashapp):
 
         for cat in category_names.keys():
 
-            y_axis = [item.get('fte') for item in data if item.get('ten_stat') == cat]
+            y_axis = pluck(by_category[cat], 'fte')
 
             chart_data.append(
-                go.Bar(
+                figures.bar(
                     name=category_names.get(cat),
                     x=x_axis,
                     y=y_axis,
-                    text=[f' {round(float(i))} ' for i in y_axis],  # pad with spaces to prevent labels from rotating
+                    # Pad with spaces to prevent labels from rotating
+                    text=map_values(y_axis, lambda i: f' {round(float(i))} '),
                     textposition='inside',
-                    hovertext=[f'{cat}: {i}' for i in y_axis],
+                    hovertext=map_values(y_axis, lambda i: f'{cat}: {i}'),
                     hoverinfo='text',
                     marker=dict(
                         color=faculty_colors.get(cat),
@@ -92,7 +79,7 @@ def register_faculty_callbacks(dashapp):
                 )
             )
 
-        chart_layout = go.Layout(
+        chart_layout = figures.layout(
             barmode='stack',
             xaxis=axes(),
             yaxis=axes(
@@ -106,36 +93,35 @@ def register_faculty_callbacks(dashapp):
 
     @dashapp.callback(Output('faculty-demo-chart', 'figure'),
                       [Input('dept-dropdown', 'value')])
+    @memoize_figure
     def update_faculty_demo_chart(dept):
 
-        resp = table.query(
-            KeyConditionExpression='PK = :pk AND SK BETWEEN :lower AND :upper',
-            ExpressionAttributeValues={
-                ':pk': f'DEPT#{dept}',
-                ':lower': 'DATA#FACULTY_DATA#2005',
-                ':upper': f'DATA#FACULTY_DATA#{int(MAX_FISCAL_YEAR) + 1}$',
-            },
-            FilterExpression=Attr('ten_stat').eq('Tenured') | Attr('ten_stat').eq('NTBOT'),
-            ProjectionExpression='fte, ten_stat, percent_fem, percent_urm',
-            ScanIndexForward=True,
-        )
+        dept_data = get_department_data(dept)
+        years = make_fiscal_year_range(0, MAX_YEAR_ID)
+        by_category = dept_data.series('FACULTY_DATA', years, by='ten_stat')
+        tenured, ntbot = by_category['Tenured'], by_category['NTBOT']
+
+        # Rows: Tenured, NTBOT. Columns: years. NaN where there is no data.
+        columns = dept_data.columns('FACULTY_DATA', years, 'ten_stat', ('Tenured', 'NTBOT'),
+                                    ('fte', 'percent_fem', 'percent_urm'))
+        percent_fem = np.round(columns['percent_fem'] * 100)
 
-        data = resp['Items']
         chart_data = []
         x_axis = make_academic_year_range(0, MAX_YEAR_ID)
 
         # Construct charts without a loop to preserve y values for further calculation
 
-        y_axis_bar_t = [item.get('fte') for item in data if item.get('ten_stat') == 'Tenured']
+        y_axis_bar_t = pluck(tenured, 'fte')
 
         chart_data.append(
-            go.Bar(
+            figures.bar(
                 name='Tenured',
                 x=x_axis,
                 y=y_axis_bar_t,
-                text=[f' {round(float(i))} ' for i in y_axis_bar_t],  # pad with spaces to prevent labels from rotating
+                # Pad with spaces to prevent labels from rotating
+                text=map_values(y_axis_bar_t, lambda i: f' {round(float(i))} '),
                 textposition='inside',
-                hovertext=[f'Tenured: {i}' for i in y_axis_bar_t],
+                hovertext=map_values(y_axis_bar_t, lambda i: f'Tenured: {i}'),
                 hoverinfo='text',
                 marker=dict(
                     color=faculty_colors.get('Tenured'),
@@ -147,16 +133,17 @@ def register_faculty_callbacks(dashapp):
             )
         )
 
-        y_axis_bar_nt = [item.get('fte') for item in data if item.get('ten_stat') == 'NTBOT']
+        y_axis_bar_nt = pluck(ntbot, 'fte')
 
         chart_data.append(
-            go.Bar(
+            figures.bar(
                 name='NTBOT',
                 x=x_axis,
                 y=y_axis_bar_nt,
-                text=[f' {round(float(i))} ' for i in y_axis_bar_nt],  # pad with spaces to prevent labels from rotating
+                # Pad with spaces to prevent labels from rotating
+                text=map_values(y_axis_bar_nt, lambda i: f' {round(float(i))} '),
                 textposition='inside',
-                hovertext=[f'NTBOT: {i}' for i in y_axis_bar_nt],
+                hovertext=map_values(y_axis_bar_nt, lambda i: f'NTBOT: {i}'),
                 hoverinfo='text',
                 marker=dict(
                     color=faculty_colors.get('NTBOT'),
@@ -170,13 +157,12 @@ def register_faculty_callbacks(dashapp):
 
         # LINE PLOTS
 
-        y_axis_line_t = [round(float(item.get('percent_fem')) * 100) if item.get('percent_fem') is not None else None
-                         for item in data if item.get('ten_stat') == 'Tenured']
+        y_axis_line_t = to_list(percent_fem[0], int)
         hover_labels = [f'{i}%' if i is not None else None for i in y_axis_line_t]
         text_labels = make_text_labels(hover_labels)
 
         chart_data.append(
-            go.Scatter(
+            figures.scatter(
                 name='% Tenured Female',
                 x=x_axis,
                 y=y_axis_line_t,
@@ -195,13 +181,12 @@ def register_faculty_callbacks(dashapp):
             )
         )
 
-        y_axis_line_nt = [round(float(item.get('percent_fem')) * 100) if item.get('percent_fem') is not None else None
-                          for item in data if item.get('ten_stat') == 'NTBOT']
+        y_axis_line_nt = to_list(percent_fem[1], int)
         hover_labels = [f'{i}%' if i is not None else None for i in y_axis_line_nt]
         text_labels = make_text_labels(hover_labels)
 
         chart_data.append(
-            go.Scatter(
+            figures.scatter(
                 name='% NTBOT Female',
                 x=x_axis,
                 y=y_axis_line_nt,
@@ -223,34 +208,21 @@ def register_faculty_callbacks(dashapp):
         # URM line calculation
         # (Tenured FTE * Tenured % URM + NTBOT FTE * NTBOT% URM) / (Tenured FTE + NTBOT FTE)
 
-        urm_t = [float(item.get('percent_urm')) if item.get('percent_urm') is not None else None
-                 for item in data if item.get('ten_stat') == 'Tenured']
-
-        urm_nt = [float(item.get('percent_urm')) if item.get('percent_urm') is not None else None
-                  for item in data if item.get('ten_stat') == 'NTBOT']
-
-        y_axis_line_urm = []
+        # Missing % URM counts as 0 as long as one of the groups has a value, missing FTE counts as 0
+        fte = np.nan_to_num(columns['fte'])
+        urm = columns['percent_urm']
 
-        for t_fte, nt_fte, t_urm, nt_urm in zip(y_axis_bar_t, y_axis_bar_nt, urm_t, urm_nt):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            urm_blend = (fte * np.nan_to_num(urm)).sum(axis=0) / fte.sum(axis=0)
+        urm_blend[np.isnan(urm).all(axis=0) | ~np.isfinite(urm_blend)] = np.nan
 
-            calc = None
-            if t_urm is not None and nt_urm is not None:
-                calc = (float(t_fte) * t_urm + float(nt_fte) * nt_urm) / (float(t_fte) + float(nt_fte))
-            elif t_urm is not None and nt_urm is None:
-                calc = (float(t_fte) * t_urm + float(nt_fte) * 0) / (float(t_fte) + float(nt_fte))
-            elif nt_urm is not None and t_urm is None:
-                calc = (float(t_fte) * 0 + float(nt_fte) * nt_urm) / (float(t_fte) + float(nt_fte))
-
-            if calc is None:
-                y_axis_line_urm.append(None)
-            else:
-                y_axis_line_urm.append(round(calc * 100))
+        y_axis_line_urm = to_list(np.round(urm_blend * 100), int)
 
         hover_labels = [f'{i}%' if i is not None else None for i in y_axis_line_urm]
         text_labels = make_text_labels(hover_labels)
 
         chart_data.append(
-            go.Scatter(
+            figures.scatter(
                 name='% NTBOT and Tenured URM',
                 x=x_axis,
                 y=y_axis_line_urm,
@@ -269,7 +241,7 @@ def register_faculty_callbacks(dashapp):
             )
         )
 
-        chart_layout = go.Layout(
+        chart_layout = figures.layout(
             barmode='stack',
             xaxis=axes(),
             yaxis=axes(
@@ -306,14 +278,7 @@ def register_faculty_callbacks(dashapp):
         if dept not in current_user.deptprofile_access('dept_chair'):
             return [], {'display': 'none'}
         else:
-            resp = table.query(
-                KeyConditionExpression='PK = :pk AND SK BETWEEN :lower AND :upper',
-                ExpressionAttributeValues={
-                    ':pk': f'DEPT#{dept}',
-                    ':lower': f'DATA#FACULTY_LIST#{MAX_FISCAL_YEAR}',
-                    ':upper': f'DATA#FACULTY_LIST#{MAX_FISCAL_YEAR}$',
-                },
-                ScanIndexForward=True
-            )
+            dept_data = get_department_data(dept)
+            data = dept_data.records('FACULTY_LIST', first_year=MAX_FISCAL_YEAR, last_year=MAX_FISCAL_YEAR)
 
-            return resp['Items'], {'display': 'inline'}
+            return data, {'display': 'inline'}
@@ -4,22 +4,20 @@ Students tab callacks
 
 # Third party imports
 from dash.dependencies import Input, Output
-import plotly.graph_objs as go
-
-from flask import current_app
 
 # Local application imports
-from app.extensions import dynamo
+from app.utils import figures
+from app.deptprofile.data import get_department_data, memoize_figure, pluck
 
 from app.deptprofile.utils.styling import axes, margin
 from app.deptprofile.utils.colors import students_ug_colors, students_grad_colors
-from app.deptprofile.utils.years import MAX_YEAR_ID, MAX_FISCAL_YEAR, make_academic_year_range
-from app.deptprofile.utils.charts import make_text_labels
+from app.deptprofile.utils.years import MAX_YEAR_ID, make_academic_year_range, make_fiscal_year_range
+from app.deptprofile.utils.charts import make_text_labels, map_values
 
 
 def is_blank_grad(data):
     """
-    Returns True if all year records are zero.
+    Returns True if all year records are zero or missing.
     {
         'year': '2005',
         'existing': '0',
@@ -28,7 +26,7 @@ def is_blank_grad(data):
     """
 
     for year in data:
-        if (year['existing'] != '0' or year['cohort'] != '0'):
+        if year is not None and (year['existing'] != '0' or year['cohort'] != '0'):
             return False
 
     return True
@@ -36,27 +34,17 @@ def is_blank_grad(data):
 
 def register_students_callbacks(dashapp):
 
-    table = dynamo.tables[current_app.config['DB_DEPTPROFILE']]
-
     #################
     # UNDERGRADUATE #
     #################
 
     @dashapp.callback(Output('students-ug-chart', 'figure'),
                       [Input('dept-dropdown', 'value')])
+    @memoize_figure
     def update_student_ug_chart(dept):
 
-        resp = table.query(
-            KeyConditionExpression='PK = :pk AND SK BETWEEN :lower AND :upper',
-            ExpressionAttributeValues={
-                ':pk': f'DEPT#{dept}',
-                ':lower': 'DATA#STUDENTS#UG#2005',
-                ':upper': f'DATA#STUDENTS#UG#{int(MAX_FISCAL_YEAR) + 1}$',
-            },
-            ScanIndexForward=True,
-        )
-
-        data = resp['Items']
+        dept_data = get_department_data(dept)
+        data = dept_data.series('STUDENTS#UG', make_fiscal_year_range(0, MAX_YEAR_ID))
 
         chart_data = []
         x_axis = make_academic_year_range(0, MAX_YEAR_ID)
@@ -71,16 +59,17 @@ def register_students_callbacks(dashapp):
 
         for cat in categories.keys():
 
-            y_axis = [item.get(cat) for item in data]
+            y_axis = pluck(data, cat)
 
             chart_data.append(
-                go.Bar(
+                figures.bar(
                     name=categories.get(cat),
                     x=x_axis,
                     y=y_axis,
-                    text=[i if len(i) > 1 else f' {i} ' for i in y_axis],  # pad single-digit numbers to prevent rotation
+                    # Pad single-digit numbers to prevent rotation
+                    text=map_values(y_axis, lambda i: i if len(i) > 1 else f' {i} '),
                     textposition='inside',
-                    hovertext=[f'{categories.get(cat)}: {i}' for i in y_axis],
+                    hovertext=map_values(y_axis, lambda i: f'{categories.get(cat)}: {i}'),
                     hoverinfo='text',
                     marker=dict(
                         color=students_ug_colors.get(cat),
@@ -92,7 +81,7 @@ def register_students_callbacks(dashapp):
                 )
             )
 
-        chart_layout = go.Layout(
+        chart_layout = figures.layout(
             barmode='stack',
             xaxis=axes(),
             yaxis=axes(
@@ -107,19 +96,11 @@ def register_students_callbacks(dashapp):
     @dashapp.callback([Output('students-masters-chart', 'figure'),
                        Output('students-masters-container', 'style')],
                       [Input('dept-dropdown', 'value')])
+    @memoize_figure
     def update_student_masters_chart(dept):
 
-        resp = table.query(
-            KeyConditionExpression='PK = :pk AND SK BETWEEN :lower AND :upper',
-            ExpressionAttributeValues={
-                ':pk': f'DEPT#{dept}',
-                ':lower': 'DATA#STUDENTS#MASTERS#2005',
-                ':upper': f'DATA#STUDENTS#MASTERS#{int(MAX_FISCAL_YEAR) + 1}$',
-            },
-            ScanIndexForward=True,
-        )
-
-        data = resp['Items']
+        dept_data = get_department_data(dept)
+        data = dept_data.series('STUDENTS#MASTERS', make_fiscal_year_range(0, MAX_YEAR_ID))
 
         if is_blank_grad(data):
             return [], {'display': 'none'}
@@ -135,16 +116,17 @@ def register_students_callbacks(dashapp):
 
         for cat in categories.keys():
 
-            y_axis = [item.get(cat) for item in data]
+            y_axis = pluck(data, cat)
 
             chart_data.append(
-                go.Bar(
+                figures.bar(
                     name=categories.get(cat),
                     x=x_axis,
                     y=y_axis,
-                    text=[i if len(i) > 1 else f' {i} ' for i in y_axis],  # pad single-digit numbers to prevent rotation
+                    # Pad single-digit numbers to prevent rotation
+                    text=map_values(y_axis, lambda i: i if len(i) > 1 else f' {i} '),
                     textposition='inside',
-                    hovertext=[f'{categories.get(cat)}: {i}' for i in y_axis],
+                    hovertext=map_values(y_axis, lambda i: f'{categories.get(cat)}: {i}'),
                     hoverinfo='text',
                     marker=dict(
                         color=students_grad_colors.get(cat),
@@ -160,13 +142,12 @@ def register_students_callbacks(dashapp):
             # Do not add selectivity/yield for aggregates
             for cat in ('selectivity', 'yield'):
 
-                y_axis_selectivity = [round(float(item.get(cat)) * 100) if item.get(cat) is not None
-                                      else None for item in data]
+                y_axis_selectivity = map_values(pluck(data, cat), lambda i: round(float(i) * 100))
                 hover_labels = [f'{i}%' if i is not None else None for i in y_axis_selectivity]
                 text_labels = make_text_labels(hover_labels)
 
                 chart_data.append(
-                    go.Scatter(
+                    figures.scatter(
                         name=f'{cat.title()}',
                         x=x_axis,
                         y=y_axis_selectivity,
@@ -185,7 +166,7 @@ def register_students_callbacks(dashapp):
                     )
                 )
 
-            chart_layout = go.Layout(
+            chart_layout = figures.layout(
                 barmode='stack',
                 xaxis=axes(),
                 yaxis=axes(
@@ -205,7 +186,7 @@ def register_students_callbacks(dashapp):
 
         else:
 
-            chart_layout = go.Layout(
+            chart_layout = figures.layout(
                 barmode='stack',
                 xaxis=axes(),
                 yaxis=axes(
@@ -221,19 +202,11 @@ def register_students_callbacks(dashapp):
     @dashapp.callback([Output('students-interdept-chart', 'figure'),
                        Output('students-interdept-container', 'style')],
                       [Input('dept-dropdown', 'value')])
+    @memoize_figure
     def update_student_interdept_chart(dept):
 
-        resp = table.query(
-            KeyConditionExpression='PK = :pk AND SK BETWEEN :lower AND :upper',
-            ExpressionAttributeValues={
-                ':pk': f'DEPT#{dept}',
-                ':lower': 'DATA#STUDENTS#INTDMASTERS#2005',
-                ':upper': f'DATA#STUDENTS#INTDMASTERS#{int(MAX_FISCAL_YEAR) + 1}$',
-            },
-            ScanIndexForward=True,
-        )
-
-        data = resp['Items']
+        dept_data = get_department_data(dept)
+        data = dept_data.series('STUDENTS#INTDMASTERS', make_fiscal_year_range(0, MAX_YEAR_ID))
 
         if is_blank_grad(data):
             return [], {'display': 'none'}
@@ -249,16 +222,17 @@ def register_students_callbacks(dashapp):
 
         for cat in categories.keys():
 
-            y_axis = [item.get(cat) for item in data]
+            y_axis = pluck(data, cat)
 
             chart_data.append(
-                go.Bar(
+                figures.bar(
                     name=categories.get(cat),
                     x=x_axis,
                     y=y_axis,
-                    text=[i if len(i) > 1 else f' {i} ' for i in y_axis],  # pad single-digit numbers to prevent rotation
+                    # Pad single-digit numbers to prevent rotation
+                    text=map_values(y_axis, lambda i: i if len(i) > 1 else f' {i} '),
                     textposition='inside',
-                    hovertext=[f'{categories.get(cat)}: {i}' for i in y_axis],
+                    hovertext=map_values(y_axis, lambda i: f'{categories.get(cat)}: {i}'),
                     hoverinfo='text',
                     marker=dict(
                         color=students_grad_colors.get(cat),
@@ -274,13 +248,12 @@ def register_students_callbacks(dashapp):
             # Do not add selectivity/yield for aggregates
             for cat in ('selectivity', 'yield'):
 
-                y_axis_selectivity = [round(float(item.get(cat)) * 100) if item.get(cat) is not None
-                                      else None for item in data]
+                y_axis_selectivity = map_values(pluck(data, cat), lambda i: round(float(i) * 100))
                 hover_labels = [f'{i}%' if i is not None else None for i in y_axis_selectivity]
                 text_labels = make_text_labels(hover_labels)
 
                 chart_data.append(
-                    go.Scatter(
+                    figures.scatter(
                         name=f'{cat.title()}',
                         x=x_axis,
                         y=y_axis_selectivity,
@@ -299,7 +272,7 @@ def register_students_callbacks(dashapp):
                     )
                 )
 
-            chart_layout = go.Layout(
+            chart_layout = figures.layout(
                 barmode='stack',
                 xaxis=axes(),
                 yaxis=axes(
@@ -319,7 +292,7 @@ def register_students_callbacks(dashapp):
 
         else:
 
-            chart_layout = go.Layout(
+            chart_layout = figures.layout(
                 barmode='stack',
                 xaxis=axes(),
                 yaxis=axes(
@@ -335,19 +308,11 @@ def register_students_callbacks(dashapp):
     @dashapp.callback([Output('students-hybrid-chart', 'figure'),
                        Output('students-hybrid-container', 'style')],
                       [Input('dept-dropdown', 'value')])
+    @memoize_figure
     def update_student_hybrid_chart(dept):
 
-        resp = table.query(
-            KeyConditionExpression='PK = :pk AND SK BETWEEN :lower AND :upper',
-            ExpressionAttributeValues={
-                ':pk': f'DEPT#{dept}',
-                ':lower': 'DATA#STUDENTS#HYBRIDMASTERS#2005',
-                ':upper': f'DATA#STUDENTS#HYBRIDMASTERS#{int(MAX_FISCAL_YEAR) + 1}$',
-            },
-            ScanIndexForward=True,
-        )
-
-        data = resp['Items']
+        dept_data = get_department_data(dept)
+        data = dept_data.series('STUDENTS#HYBRIDMASTERS', make_fiscal_year_range(0, MAX_YEAR_ID))
 
         if is_blank_grad(data):
             return [], {'display': 'none'}
@@ -363,16 +328,17 @@ def register_students_callbacks(dashapp):
 
         for cat in categories.keys():
 
-            y_axis = [item.get(cat) for item in data]
+            y_axis = pluck(data, cat)
 
             chart_data.append(
-                go.Bar(
+                figures.bar(
                     name=categories.get(cat),
                     x=x_axis,
                     y=y_axis,
-                    text=[i if len(i) > 1 else f' {i} ' for i in y_axis],  # pad single-digit numbers to prevent rotation
+                    # Pad single-digit numbers to prevent rotation
+                    text=map_values(y_axis, lambda i: i if len(i) > 1 else f' {i} '),
                     textposition='inside',
-                    hovertext=[f'{categories.get(cat)}: {i}' for i in y_axis],
+                    hovertext=map_values(y_axis, lambda i: f'{categories.get(cat)}: {i}'),
                     hoverinfo='text',
                     marker=dict(
                         color=students_grad_colors.get(cat),
@@ -388,13 +354,12 @@ def register_students_callbacks(dashapp):
             # Do not add selectivity/yield for aggregates
             for cat in ('selectivity', 'yield'):
 
-                y_axis_selectivity = [round(float(item.get(cat)) * 100) if item.get(cat) is not None
-                                      else None for item in data]
+                y_axis_selectivity = map_values(pluck(data, cat), lambda i: round(float(i) * 100))
                 hover_labels = [f'{i}%' if i is not None else None for i in y_axis_selectivity]
                 text_labels = make_text_labels(hover_labels)
 
                 chart_data.append(
-                    go.Scatter(
+                    figures.scatter(
                         name=f'{cat.title()}',
                         x=x_axis,
                         y=y_axis_selectivity,
@@ -413,7 +378,7 @@ def register_students_callbacks(dashapp):
                     )
                 )
 
-            chart_layout = go.Layout(
+            chart_layout = figures.layout(
                 barmode='stack',
                 xaxis=axes(),
                 yaxis=axes(
@@ -433,7 +398,7 @@ def register_students_callbacks(dashapp):
 
         else:
 
-            chart_layout = go.Layout(
+            chart_layout = figures.layout(
                 barmode='stack',
                 xaxis=axes(),
                 yaxis=axes(
@@ -449,19 +414,11 @@ def register_students_callbacks(dashapp):
     @dashapp.callback([Output('students-sps-chart', 'figure'),
                        Output('students-sps-container', 'style')],
                       [Input('dept-dropdown', 'value')])
+    @memoize_figure
     def update_student_sps_chart(dept):
 
-        resp = table.query(
-            KeyConditionExpression='PK = :pk AND SK BETWEEN :lower AND :upper',
-            ExpressionAttributeValues={
-                ':pk': f'DEPT#{dept}',
-                ':lower': 'DATA#STUDENTS#SPS#2005',
-                ':upper': f'DATA#STUDENTS#SPS#{int(MAX_FISCAL_YEAR) + 1}$',
-            },
-            ScanIndexForward=True,
-        )
-
-        data = resp['Items']
+        dept_data = get_department_data(dept)
+        data = dept_data.series('STUDENTS#SPS', make_fiscal_year_range(0, MAX_YEAR_ID))
 
         if is_blank_grad(data):
             return [], {'display': 'none'}
@@ -477,16 +434,17 @@ def register_students_callbacks(dashapp):
 
         for cat in categories.keys():
 
-            y_axis = [item.get(cat) for item in data]
+            y_axis = pluck(data, cat)
 
             chart_data.append(
-                go.Bar(
+                figures.bar(
                     name=categories.get(cat),
                     x=x_axis,
                     y=y_axis,
-                    text=[i if len(i) > 1 else f' {i} ' for i in y_axis],  # pad single-digit numbers to prevent rotation
+                    # Pad single-digit numbers to prevent rotation
+                    text=map_values(y_axis, lambda i: i if len(i) > 1 else f' {i} '),
                     textposition='inside',
-                    hovertext=[f'{categories.get(cat)}: {i}' for i in y_axis],
+                    hovertext=map_values(y_axis, lambda i: f'{categories.get(cat)}: {i}'),
                     hoverinfo='text',
                     marker=dict(
                         color=students_grad_colors.get(cat),
@@ -498,7 +456,7 @@ def register_students_callbacks(dashapp):
                 )
             )
 
-        chart_layout = go.Layout(
+        chart_layout = figures.layout(
             barmode='stack',
             xaxis=axes(),
             yaxis=axes(
@@ -514,19 +472,11 @@ def register_students_callbacks(dashapp):
     @dashapp.callback([Output('students-phd-chart', 'figure'),
                        Output('students-phd-container', 'style')],
                       [Input('dept-dropdown', 'value')])
+    @memoize_figure
     def update_student_phd_chart(dept):
 
-        resp = table.query(
-            KeyConditionExpression='PK = :pk AND SK BETWEEN :lower AND :upper',
-            ExpressionAttributeValues={
-                ':pk': f'DEPT#{dept}',
-                ':lower': 'DATA#STUDENTS#PHD#2005',
-                ':upper': f'DATA#STUDENTS#PHD#{int(MAX_FISCAL_YEAR) + 1}$',
-            },
-            ScanIndexForward=True,
-        )
-
-        data = resp['Items']
+        dept_data = get_department_data(dept)
+        data = dept_data.series('STUDENTS#PHD', make_fiscal_year_range(0, MAX_YEAR_ID))
 
         if is_blank_grad(data):
             return [], {'display': 'none'}
@@ -542,16 +492,17 @@ def register_students_callbacks(dashapp):
 
         for cat in categories.keys():
 
-            y_axis = [item.get(cat) for item in data]
+            y_axis = pluck(data, cat)
 
             chart_data.append(
-                go.Bar(
+                figures.bar(
                     name=categories.get(cat),
                     x=x_axis,
                     y=y_axis,
-                    text=[i if len(i) > 1 else f' {i} ' for i in y_axis],  # pad single-digit numbers to prevent rotation
+                    # Pad single-digit numbers to prevent rotation
+                    text=map_values(y_axis, lambda i: i if len(i) > 1 else f' {i} '),
                     textposition='inside',
-                    hovertext=[f'{categories.get(cat)}: {i}' for i in y_axis],
+                    hovertext=map_values(y_axis, lambda i: f'{categories.get(cat)}: {i}'),
                     hoverinfo='text',
                     marker=dict(
                         color=students_grad_colors.get(cat),
@@ -567,13 +518,12 @@ def register_students_callbacks(dashapp):
             # Do not add selectivity/yield for aggregates
             for cat in ('selectivity', 'yield'):
 
-                y_axis_selectivity = [round(float(item.get(cat)) * 100) if item.get(cat) is not None
-                                      else None for item in data]
+                y_axis_selectivity = map_values(pluck(data, cat), lambda i: round(float(i) * 100))
                 hover_labels = [f'{i}%' if i is not None else None for i in y_axis_selectivity]
                 text_labels = make_text_labels(hover_labels)
 
                 chart_data.append(
-                    go.Scatter(
+                    figures.scatter(
                         name=f'{cat.title()}',
                         x=x_axis,
                         y=y_axis_selectivity,
@@ -592,7 +542,7 @@ def register_students_callbacks(dashapp):
                     )
                 )
 
-            chart_layout = go.Layout(
+            chart_layout = figures.layout(
                 barmode='stack',
                 xaxis=axes(),
                 yaxis=axes(
@@ -612,7 +562,7 @@ def register_students_callbacks(dashapp):
 
         else:
 
-            chart_layout = go.Layout(
+            chart_layout = figures.layout(
                 barmode='stack',
                 xaxis=axes(),
                 yaxis=axes(
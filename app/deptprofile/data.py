@@ -0,0 +1,446 @@
+"""
+Department data for the deptprofile charts
+
+All data of a department lives in a single `DEPT#{dept}` partition of the DB_DEPTPROFILE table,
+with sort keys of the form `DATA#{dataset}#{fiscal year}[#...]`, e.g.:
+
+    DATA#FACULTY_DATA#2019#Tenured
+    DATA#AGG#CLASSES#2019#Tenured
+    DATA#CLASSES#CORE#2019#Tenured
+    DATA#STUDENTS#UG#2019
+    DATA#FACULTY_LIST#2020#0001
+
+Attributes that charts select items by come before the fiscal year, e.g. the course type of CLASSES and
+ENRL items, so that the items a chart renders form a contiguous key range of their own.
+
+The partition is read once with one paginated query per prefix of RENDERED_PREFIXES, so items no chart
+renders (e.g. DATA#CLASSES#ELECTIVE#...) are never read, and split into datasets by sort key prefix.
+
+The data loader writes CLASSES and ENRL items in the former layout, DATA#CLASSES#2019#Core#Tenured, until
+`flask rekey-course-types` copies them (see `app.deptprofile.ingest`). If a course type prefix has no items,
+the former range is read with a `course_type` filter instead and the items are given the new sort keys.
+Every chart callback is then served from the cached `DepartmentData` instead of querying the table.
+
+Cached data is keyed by the data version stored in the metadata item (VERSION_KEY) of the same table.
+The version is re-read at most every DEPTPROFILE_VERSION_CHECK_INTERVAL seconds, so a data refresh
+is picked up without a restart once the loader bumps `data_version`.
+
+Finished chart callback outputs are cached as well (see `memoize_figure`), so that repeat requests
+for the same department skip building and validating Plotly graph objects altogether.
+"""
+
+# Standard library imports
+import functools
+import json
+import threading
+import time
+from collections import defaultdict
+
+# Third party imports
+import numpy as np
+from boto3.dynamodb.conditions import Attr
+from flask import current_app
+from plotly.utils import PlotlyJSONEncoder
+
+# Local application imports
+from app.extensions import dynamo
+from app.utils.cache import TTLCache
+from app.utils.dynamo import iter_query, run_concurrently
+from app.deptprofile.layouts.filters import ALL_DROPDOWN_OPTIONS
+
+
+# Key of the metadata item holding the current `data_version`
+VERSION_KEY = {'PK': 'METADATA', 'SK': 'DATA_VERSION'}
+
+# Sort key prefixes of the datasets the charts render
+RENDERED_PREFIXES = ('DATA#FACULTY_DATA#', 'DATA#FACULTY_LIST#', 'DATA#AGG#', 'DATA#CLASSES#CORE#', 'DATA#ENRL#CORE#',
+                     'DATA#STUDENTS#')
+
+# Datasets whose items have a course type
+COURSE_DATASETS = ('CLASSES', 'ENRL')
+
+# Former sort key range and course type of the course type prefixes of RENDERED_PREFIXES
+FORMER_COURSE_PREFIXES = {
+    'DATA#CLASSES#CORE#': ('DATA#CLASSES#', 'Core'),
+    'DATA#ENRL#CORE#': ('DATA#ENRL#', 'Core'),
+}
+
+# Department bundles keyed by (department code, data version).
+# Sized by DEPTPROFILE_CACHE_SIZE/DEPTPROFILE_CACHE_TTL when the app is created.
+department_cache = TTLCache()
+
+# Serialized chart callback outputs keyed by (callback name, callback arguments, data version).
+# Sized by DEPTPROFILE_FIGURE_CACHE_SIZE when the app is created.
+figure_cache = TTLCache()
+
+
+def split_sort_key(sk):
+    """
+    Splits a sort key into its dataset and fiscal year.
+    The dataset is everything between 'DATA#' and the first four-digit component.
+
+    Args:
+        sk (str): e.g. 'DATA#CLASSES#CORE#2019#Tenured'
+
+    Returns:
+        tuple: Dataset and fiscal year, e.g. ('CLASSES#CORE', '2019'). Fiscal year is None if there is none.
+    """
+    parts = sk.split('#')[1:]
+
+    for i, part in enumerate(parts):
+        if len(part) == 4 and part.isdigit():
+            return '#'.join(parts[:i]), part
+
+    return '#'.join(parts), None
+
+
+def course_type_key(sk, course_type):
+    """
+    Moves the course type of a sort key ahead of the fiscal year
+
+    Args:
+        sk (str): e.g. 'DATA#CLASSES#2019#Core#Tenured'
+        course_type (str): Value of the item's `course_type`, e.g. 'Core'
+
+    Returns:
+        str: e.g. 'DATA#CLASSES#CORE#2019#Tenured'. None if the sort key is not of the former layout.
+    """
+    dataset, year = split_sort_key(sk)
+    if dataset not in COURSE_DATASETS or year is None:
+        return None
+
+    rest = sk.split('#')[3:]  # After DATA, dataset and fiscal year
+    if course_type in rest:
+        rest.remove(course_type)
+
+    return '#'.join(['DATA', dataset, course_type.upper(), year] + rest)
+
+
+class DepartmentData(object):
+    """All chart data of a single department, grouped by dataset.
+
+    Items keep their sort key order, i.e. ascending by fiscal year, as returned by DynamoDB.
+
+    Attributes:
+        dept (str): Department code
+        datasets (dict[list[tuple]]): (fiscal year, item) tuples keyed by dataset, e.g. 'STUDENTS#PHD'
+    """
+
+    def __init__(self, dept, items):
+        """
+        Args:
+            dept (str): Department code
+            items (list[dict]): Items of the department's partition in sort key order
+        """
+        self.dept = dept
+        self.datasets = defaultdict(list)
+
+        for item in items:
+            dataset, year = split_sort_key(item['SK'])
+            self.datasets[dataset].append((year, item))
+
+    def records(self, dataset, first_year=None, last_year=None, **attributes):
+        """
+        Items of a dataset, optionally limited to a range of fiscal years and to items with given attribute values
+
+        Args:
+            dataset (str): e.g. 'FACULTY_DATA', 'ENRL#CORE', 'STUDENTS#MASTERS'
+            first_year (str|int, optional): First fiscal year to include
+            last_year (str|int, optional): Last fiscal year to include
+            **attributes: Attribute values to match, e.g. ten_stat='Tenured'
+
+        Returns:
+            list[dict]: Matching items, ascending by fiscal year
+        """
+        first_year = None if first_year is None else str(first_year)
+        last_year = None if last_year is None else str(last_year)
+
+        records = []
+        for year, item in self.datasets.get(dataset, []):
+            if first_year is not None and year < first_year:
+                continue
+            if last_year is not None and year > last_year:
+                continue
+            if all(item.get(name) == value for name, value in attributes.items()):
+                records.append(item)
+
+        return records
+
+    def series(self, dataset, years, by=None, **attributes):
+        """
+        Items of a dataset aligned with a list of fiscal years, built in a single pass over the dataset.
+        Years without an item are None, so that every series lines up with the chart's x-axis.
+
+        Args:
+            dataset (str): e.g. 'FACULTY_DATA', 'STUDENTS#PHD'
+            years (list[str]): Fiscal years, see `app.deptprofile.utils.years.make_fiscal_year_range`
+            by (str, optional): Attribute to group items by, e.g. 'ten_stat'
+            **attributes: Attribute values to match, e.g. ten_stat='Tenured'
+
+        Returns:
+            list: Item or None per year, if `by` is not given
+            dict: {value of `by`: [item or None per year]}. Values without any item map to a series of None.
+        """
+        positions = {str(year): i for i, year in enumerate(years)}
+
+        def empty():
+            return [None] * len(years)
+
+        groups = defaultdict(empty)
+        for year, item in self.datasets.get(dataset, []):
+            i = positions.get(year)
+            if i is None:
+                continue
+            if all(item.get(name) == value for name, value in attributes.items()):
+                groups[item.get(by) if by else None][i] = item
+
+        return groups if by else groups[None]
+
+    def columns(self, dataset, years, by, groups, attributes):
+        """
+        Numeric attributes of a dataset as arrays of groups x years, built in a single pass over the dataset.
+        Missing items and None values are NaN.
+
+        Args:
+            dataset (str): e.g. 'FACULTY_DATA'
+            years (list[str]): Fiscal years, see `app.deptprofile.utils.years.make_fiscal_year_range`
+            by (str): Attribute to group items by, e.g. 'ten_stat'
+            groups (list[str]): Values of `by` to include, in row order, e.g. ['Tenured', 'NTBOT']
+            attributes (list[str]): Numeric attributes, e.g. ['fte', 'percent_urm']
+
+        Returns:
+            dict[numpy.ndarray]: Float array of shape (len(groups), len(years)) per attribute
+        """
+        positions = {str(year): i for i, year in enumerate(years)}
+        rows = {group: i for i, group in enumerate(groups)}
+        arrays = {attribute: np.full((len(groups), len(years)), np.nan) for attribute in attributes}
+
+        for year, item in self.datasets.get(dataset, []):
+            i, j = rows.get(item.get(by)), positions.get(year)
+            if i is None or j is None:
+                continue
+            for attribute in attributes:
+                value = item.get(attribute)
+                if value is not None:
+                    arrays[attribute][i, j] = float(value)
+
+        return arrays
+
+    def __len__(self):
+        return sum(len(items) for items in self.datasets.values())
+
+
+def pluck(items, attribute):
+    """
+    Args:
+        items (list): Items or None, e.g. a series of `DepartmentData.series`
+        attribute (str)
+
+    Returns:
+        list: Value of the attribute per item, None for missing items
+    """
+    return [None if item is None else item.get(attribute) for item in items]
+
+
+def to_list(array, convert=float):
+    """
+    Args:
+        array (numpy.ndarray): 1-dimensional, NaN for missing values
+        convert (func): Conversion of the values, e.g. int for rounded values
+
+    Returns:
+        list: Converted values, None for NaN
+    """
+    return [None if value != value else convert(value) for value in array.tolist()]  # NaN != NaN
+
+
+def query_prefix(table, dept, prefix):
+    """
+    Reads the items of a department whose sort key starts with a prefix
+
+    Args:
+        table: DB_DEPTPROFILE table
+        dept (str): Department code
+        prefix (str): e.g. 'DATA#CLASSES#CORE#'
+
+    Returns:
+        list[dict]: Items in sort key order
+    """
+    return list(iter_query(
+        table,
+        label=f'deptprofile.{prefix}',
+        KeyConditionExpression='PK = :pk AND begins_with(SK, :prefix)',
+        ExpressionAttributeValues={
+            ':pk': f'DEPT#{dept}',
+            ':prefix': prefix,
+        },
+        ScanIndexForward=True,
+    ))
+
+
+def query_rendered_prefix(table, dept, prefix):
+    """
+    Reads the items of a prefix of RENDERED_PREFIXES. Course type prefixes without items are read from
+    the former sort key range instead (see FORMER_COURSE_PREFIXES), with the sort keys of the new layout.
+
+    Returns:
+        list[dict]: Items in sort key order
+    """
+    items = query_prefix(table, dept, prefix)
+    if items or prefix not in FORMER_COURSE_PREFIXES:
+        return items
+
+    former_prefix, course_type = FORMER_COURSE_PREFIXES[prefix]
+    items = iter_query(
+        table,
+        label=f'deptprofile.{former_prefix}{course_type}',
+        KeyConditionExpression='PK = :pk AND begins_with(SK, :prefix)',
+        FilterExpression=Attr('course_type').eq(course_type),
+        ExpressionAttributeValues={
+            ':pk': f'DEPT#{dept}',
+            ':prefix': former_prefix,
+        },
+        ScanIndexForward=True,
+    )
+
+    rekeyed = []
+    for item in items:
+        sk = course_type_key(item['SK'], course_type)
+        if sk is not None:  # None for items of the new layout, which the former range includes as well
+            rekeyed.append(dict(item, SK=sk))
+
+    return rekeyed
+
+
+def _query_department(dept):
+    """
+    Reads the rendered datasets of a department, one concurrent query per prefix of RENDERED_PREFIXES.
+    The first query runs in the calling thread, so a bundle takes len(RENDERED_PREFIXES) - 1 threads of the
+    shared pool (DYNAMO_BATCH_WORKERS).
+
+    Returns:
+        list[dict]: Items in sort key order within each prefix
+    """
+    table = dynamo.tables[current_app.config['DB_DEPTPROFILE']]
+
+    results = run_concurrently(*(functools.partial(query_rendered_prefix, table, dept, prefix)
+                                 for prefix in RENDERED_PREFIXES))
+    return [item for items in results for item in items]
+
+
+class DataVersion(object):
+    """Current version of the deptprofile data, re-read from the metadata item on an interval.
+
+    When the version changes, cached departments of the old version are dropped.
+
+    Args:
+        interval (float): Seconds between checks
+    """
+
+    def __init__(self, interval=60):
+        self._lock = threading.Lock()
+        self.interval = interval
+        self.value = None
+        self.checked = None  # time.monotonic() of the last check
+
+    def get(self):
+        """
+        Returns:
+            str: Current data version. Empty if the table has no metadata item.
+        """
+        with self._lock:
+            if self.checked is not None and time.monotonic() - self.checked < self.interval:
+                return self.value
+
+        table = dynamo.tables[current_app.config['DB_DEPTPROFILE']]
+        resp = table.get_item(Key=VERSION_KEY, ProjectionExpression='data_version')
+        value = str(resp.get('Item', {}).get('data_version', ''))
+
+        with self._lock:
+            if self.value is not None and value != self.value:
+                department_cache.clear()
+                figure_cache.clear()
+            self.value = value
+            self.checked = time.monotonic()
+
+        return value
+
+    def reset(self):
+        """
+        Forces a check on the next call of `get`
+        """
+        with self._lock:
+            self.checked = None
+
+
+data_version = DataVersion()
+
+
+def get_department_data(dept):
+    """
+    Returns a department's data, reading its partition from DynamoDB only if it is not cached
+    for the current data version. Concurrent calls for the same department wait for a single read.
+
+    Args:
+        dept (str): Department code
+
+    Returns:
+        DepartmentData
+    """
+    return department_cache.get_or_load((dept, data_version.get()),
+                                        lambda: DepartmentData(dept, _query_department(dept)))
+
+
+def memoize_figure(func):
+    """
+    Decorator for chart callbacks whose output depends only on their arguments and the department data.
+    The output is serialized to plain JSON types once and served from `figure_cache` for the same
+    arguments until the data version changes. Must be applied below `dashapp.callback`.
+
+    Do not use on callbacks whose output depends on the user, e.g. the faculty table.
+
+    Example:
+            @dashapp.callback(Output('faculty-fte-chart', 'figure'),
+                              [Input('dept-dropdown', 'value')])
+            @memoize_figure
+            def update_faculty_fte_chart(dept):
+                ...
+    """
+    @functools.wraps(func)
+    def wrapper(*args):
+        key = (func.__name__, args, data_version.get())
+
+        output = figure_cache.get(key)
+        if output is None:
+            output = json.loads(json.dumps(func(*args), cls=PlotlyJSONEncoder))
+            figure_cache.set(key, output)
+
+        return output
+
+    return wrapper
+
+
+def warm_department_cache():
+    """
+    Loads every department of the dropdown into the cache. Requires an application context.
+
+    Returns:
+        dict: Cache stats after warm-up, see `TTLCache.stats`
+    """
+    for option in ALL_DROPDOWN_OPTIONS:
+        if not option.get('disabled'):
+            get_department_data(option['value'])
+
+    return cache_stats()
+
+
+def cache_stats():
+    """
+    Returns:
+        dict: Department cache stats plus the current data version, number of cached items and figure cache stats
+    """
+    stats = department_cache.stats()
+    stats['data_version'] = data_version.value
+    stats['items'] = sum(len(data) for data in department_cache.values())
+    stats['figures'] = figure_cache.stats()
+    return stats
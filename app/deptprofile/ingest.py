@@ -0,0 +1,70 @@
+"""
+Ingest-time steps for the department profile dashboard
+
+Course type sort keys
+---------------------
+CLASSES and ENRL items carry the course type in their sort key ahead of the fiscal year,
+
+    DATA#CLASSES#CORE#2019#Tenured
+
+so that the core course charts read exactly their own key range (see `app.deptprofile.data.RENDERED_PREFIXES`).
+The data loader writes the former layout, DATA#CLASSES#2019#Core#Tenured, and `rekey_course_types`
+copies those items to the new keys. Departments without items of the new layout are read from the former
+range with a `course_type` filter (see `app.deptprofile.data.query_rendered_prefix`), so the charts work
+before the copy, only with the filtered read. Once a department has been copied, its new keys are read
+instead, so the copy has to be repeated after every later load, before the load bumps `data_version`.
+--delete-old deletes the items of the former layout, once no version older than this layout is deployed.
+
+Run after every deptprofile load:
+        flask rekey-course-types --delete-old
+"""
+
+# Third party imports
+import click
+from boto3.dynamodb.conditions import Attr
+from flask import current_app
+from flask.cli import with_appcontext
+
+# Local application imports
+from app.extensions import dynamo
+from app.utils.dynamo import iter_scan
+from app.deptprofile.data import course_type_key
+
+
+def rekey_course_types(delete_old=False):
+    """
+    Copies CLASSES and ENRL items of DB_DEPTPROFILE from the former sort key layout to the course type layout.
+    Requires an application context.
+
+    Args:
+        delete_old (bool): Delete the items of the former layout
+
+    Returns:
+        dict: Number of items copied and deleted
+    """
+    table = dynamo.tables[current_app.config['DB_DEPTPROFILE']]
+
+    stats = {'copied': 0, 'deleted': 0}
+    with table.batch_writer() as writer:
+        for item in list(iter_scan(table, label='deptprofile.rekey', FilterExpression=Attr('course_type').exists())):
+            sk = course_type_key(item['SK'], item['course_type'])
+            if sk is None:
+                continue
+
+            writer.put_item(Item=dict(item, SK=sk))
+            stats['copied'] += 1
+
+            if delete_old:
+                writer.delete_item(Key={'PK': item['PK'], 'SK': item['SK']})
+                stats['deleted'] += 1
+
+    return stats
+
+
+@click.command('rekey-course-types')
+@click.option('--delete-old', is_flag=True, help='Delete the items of the former sort key layout.')
+@with_appcontext
+def rekey_course_types_command(delete_old):
+    """Copy deptprofile course items to sort keys with the course type ahead of the fiscal year. Run after every load."""
+    stats = rekey_course_types(delete_old)
+    click.echo(f"Copied {stats['copied']} course items, deleted {stats['deleted']} items of the former layout")
@@ -20,3 +20,11 @@ def make_text_labels(hover_labels):
         text_labels[-1] = hover_labels[-1]
 
     return text_labels
+
+
+def map_values(values, func):
+    """
+    Applies a function, e.g. a label format, to every value, leaving None (years without data) as None
+    Turns [3, None, 12] into [func(3), None, func(12)]
+    """
+    return [None if value is None else func(value) for value in values]
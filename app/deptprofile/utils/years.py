@@ -48,5 +48,18 @@ def make_academic_year_range(start, end):
     return out
 
 
+def make_fiscal_year_range(start, end):
+    """
+    Args:
+        start (int): ID of the start year
+        end (int): ID of the end year
+
+    Returns:
+        list: Returns a list of fiscal years (e.g. ['2019', '2020'])
+    """
+
+    return [YEARS.get(i).fiscal for i in range(start, end + 1)]
+
+
 if __name__ == "__main__":
     print(make_academic_year_range(0, 14))
@@ -10,6 +10,7 @@ from flask import url_for
 
 # Local application imports
 from app.extensions import dynamo
+from app.utils.dynamo import iter_query
 from app.facgov.models import FacgovGeneral, FacgovFacultyMeeting
 from app.facgov.conversions import fiscal_to_academic
 
@@ -57,14 +58,14 @@ def register_facgov_callbacks(dashapp):
             expr_values[':y'] = year
             expr_names['#y'] = 'year'
 
-        resp = table.query(
+        items = list(iter_query(
+            table,
+            label='facgov.file_list',
             IndexName='unit-year-index',
             KeyConditionExpression=key_expr,
             ExpressionAttributeValues=expr_values,
             ExpressionAttributeNames=expr_names,
-        )
-
-        items = resp['Items']
+        ))
 
         if unit == 'faculty_meeting':
             files = FacgovFacultyMeeting(items=items)
@@ -91,7 +92,9 @@ def register_facgov_callbacks(dashapp):
         Needed to be done in a callback because not all units have files for all years.
         """
         table = dynamo.tables[current_app.config['DB_FACGOV']]
-        resp = table.query(
+        items = iter_query(
+            table,
+            label='facgov.years',
             IndexName='unit-year-index',
             KeyConditionExpression='#u = :u',
             ExpressionAttributeValues={
@@ -101,8 +104,6 @@ def register_facgov_callbacks(dashapp):
                 '#u': 'unit',
             },
         )
-
-        items = resp['Items']
         years = sorted({item['year'] for item in items})
 
         options = [{'label': 'All', 'value': ''}]
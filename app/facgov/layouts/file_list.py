@@ -10,6 +10,7 @@ import dash_html_components as html
 
 # Local application imports
 from app.extensions import dynamo
+from app.utils.dynamo import iter_scan
 from app.utils.func import multisort
 from app.facgov.conversions import convert_for_checkbox, fiscal_to_academic
 
@@ -20,10 +21,10 @@ def build_search_dropdown():
     Display in reverse order
     """
     table = dynamo.tables[current_app.config['DB_FACGOV']]
-    resp = table.scan()
+    items = list(iter_scan(table, label='facgov.search_dropdown'))
 
     # First sort by committee, then by year, then by file name
-    items = multisort(resp['Items'], (('unit', True), ('year', True), ('file_name', False)))
+    items = multisort(items, (('unit', True), ('year', True), ('file_name', False)))
     options = []
 
     for item in items:
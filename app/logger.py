@@ -3,7 +3,12 @@ Logger class
 """
 
 # Standard library imports
+import atexit
 import datetime
+import logging
+import queue
+import threading
+import time
 
 # Third party imports
 from flask import current_app
@@ -17,6 +22,169 @@ from flask import has_request_context
 from app.extensions import dynamo
 
 
+class AccessLogWriter(object):
+    """Background writer for access log items.
+
+    Items are put on a bounded in-process queue and drained by a daemon worker thread,
+    which writes them with `batch_writer` (BatchWriteItem, up to 25 items per call).
+    A batch is flushed once it reaches `batch_size` items or `flush_interval` seconds after its first item,
+    whichever comes first. Items still queued are flushed at interpreter shutdown.
+    Items that do not fit in the queue are dropped and counted.
+
+    Sized by ACCESS_LOG_QUEUE_SIZE, ACCESS_LOG_BATCH_SIZE and ACCESS_LOG_FLUSH_INTERVAL
+    when the worker is started on first use.
+    """
+
+    def __init__(self):
+        self._queue = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.batch_size = 25
+        self.flush_interval = 2.0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def enqueue(self, table_name, item):
+        """
+        Queues an item for writing without blocking the request.
+
+        Args:
+            table_name (str): DynamoDB table to write to
+            item (dict): Item to put
+        """
+        self._start()
+
+        try:
+            self._queue.put_nowait((table_name, item))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def _start(self):
+        """
+        Starts the worker thread on first use, sized from the current app config
+        """
+        if self._thread is not None:
+            return
+
+        with self._lock:
+            if self._thread is not None:
+                return
+
+            config = current_app.config
+            self._queue = queue.Queue(maxsize=config.get('ACCESS_LOG_QUEUE_SIZE', 10000))
+            self.batch_size = config.get('ACCESS_LOG_BATCH_SIZE', 25)
+            self.flush_interval = config.get('ACCESS_LOG_FLUSH_INTERVAL', 2.0)
+
+            self._thread = threading.Thread(target=self._run, name='access-log-writer', daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._collect()
+            if batch:
+                self._write(batch)
+
+    def _collect(self):
+        """
+        Blocks until `batch_size` items are queued or `flush_interval` has passed since the first one.
+
+        Returns:
+            list[tuple]: (table_name, item) pairs, empty if nothing was queued during the interval
+        """
+        batch = []
+        deadline = None
+
+        while len(batch) < self.batch_size:
+            timeout = self.flush_interval if deadline is None else deadline - time.monotonic()
+            if timeout <= 0:
+                break
+
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+
+        return batch
+
+    def _write(self, batch):
+        """
+        Writes a batch with one batch_writer per table.
+        Falls back to individual puts if a batch is rejected (e.g. duplicate keys within the batch).
+        """
+        by_table = {}
+        for table_name, item in batch:
+            by_table.setdefault(table_name, []).append(item)
+
+        for table_name, items in by_table.items():
+            table = dynamo.tables[table_name]
+
+            try:
+                with table.batch_writer() as writer:
+                    for item in items:
+                        writer.put_item(Item=item)
+                written = len(items)
+            except Exception:
+                written = 0
+                for item in items:
+                    try:
+                        table.put_item(Item=item)
+                        written += 1
+                    except Exception:
+                        logging.getLogger(__name__).exception('Could not write access log item')
+
+            with self._lock:
+                self.written += written
+                self.failed += len(items) - written
+
+    def flush(self):
+        """
+        Synchronously writes everything that is currently queued
+        """
+        if self._queue is None:
+            return
+
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+        if batch:
+            self._write(batch)
+
+    def close(self):
+        """
+        Stops the worker and flushes remaining items. Registered with `atexit`.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+    def stats(self):
+        """
+        Returns:
+            dict: Queue depth and written/dropped/failed counters
+        """
+        return {
+            'queued': self._queue.qsize() if self._queue is not None else 0,
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed': self.failed,
+        }
+
+
+access_log_writer = AccessLogWriter()
+
+
 class DynamoAccessLogger(object):
     """Access Logger
 
@@ -46,7 +214,7 @@ class DynamoAccessLogger(object):
         return self.app.config['DB_USERS']
 
     def log_access(self, has_access, **kwargs):
-        """Logs users access.
+        """Logs users access. The item is written in the background by `access_log_writer`.
 
             accessedBy: user's UNI, comes from the session.
             resource: which resource is being accessed, initialized at logger creation.
@@ -58,7 +226,6 @@ class DynamoAccessLogger(object):
 
         if has_request_context():
 
-            access_table = dynamo.tables[self.access_table_name]
             timestamp = datetime.datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S')
 
             # Default payload
@@ -76,9 +243,9 @@ class DynamoAccessLogger(object):
             if 'CAS_USERNAME' in session:
 
                 item['accessedBy'] = session.get('CAS_USERNAME')
-                access_table.put_item(Item=item)
+                access_log_writer.enqueue(self.access_table_name, item)
 
             # else:
 
             #     item['accessedBy'] = 'DEBUG'
-            #     access_table.put_item(Item=item)
+            #     access_log_writer.enqueue(self.access_table_name, item)
@@ -6,110 +6,159 @@ Pipeline and subfield data depend on the posting data
 
 Callback chain:
 Requisition number dropdown value changes
--> applicant data and posting data load
----> pipeline and subfield data load
------> charts and footers load
+-> one callback loads posting and applicant data, then pipeline and subfield data, into the server-side session store
+---> charts and footers load, resolving the handles held by the dcc.Store components
 """
 
+# Standard library imports
+import json
+
 # Third party imports
 from dash.dependencies import Input, Output, State
 from dash.exceptions import PreventUpdate
-import plotly.graph_objs as go
 
 from flask import current_app
 
 from boto3.dynamodb.conditions import Key
+from plotly.utils import PlotlyJSONEncoder
 
 # Local application imports
+from app.utils import figures
 from app.extensions import dynamo
+from app.utils.dynamo import iter_query, projection_expression, run_concurrently
+from app.utils.session_store import session_store
+from app.searchcom.reference import get_pipeline, get_subfields
+from app.searchcom.crosstab import CELL_IDS, crosstab_cells
+from app.searchcom.ingest import APPLICANT_CHART_FIELDS, APPLICANT_THRESHOLD_FIELDS, suppress_applicant
 from app.searchcom.chart_config.styling import axes
 from app.searchcom.chart_config.colors import colors
 
-# Crosstab table outputs
-## Category values as they are entered in HTML id fields
-gen_cat_html = ['fem', 'male', 'na']
-ethn_cat_html = ['amind', 'asian', 'black', 'pacific', 'white', 'na']
-hisp_cat_html = ['hisp', 'nonhisp', 'na']
-
-## Build a list of outputs to all combinations of those fields
+# Crosstab table outputs, one per cell (see `app.searchcom.crosstab`)
 xtab_output_list = [Output('searchcom-xtab-table', 'style'), Output('searchcom-xtab-threshold-warning', 'style')]
-for i in ethn_cat_html:
-    for j in hisp_cat_html:
-        for k in gen_cat_html:
-            xtab_output_list.append(Output(f"{i}-{j}-{k}", 'children'))
-
-
-# Category values as they are in the xtab data
-# The order should be the same as in HTML categories so that the callback output matches the output list (Male-White-Yes matches male-white-hisp, etc.)
-gen_cat = ['Female', 'Male', 'Blank']
-ethn_cat = ['American Indian or Alaska Native', 'Asian', 'Black or African American', 'Native Hawaiian or Other Pacific Islander', 'White', 'Blank']
-hisp_cat = ['Yes', 'No', 'Blank']
+xtab_output_list += [Output(cell_id, 'children') for cell_id in CELL_IDS]
+
+
+# Session data contents
+SESSION_DATA = ('posting', 'applicant', 'pipeline', 'subfields')  # In the order of the searchcom-session-data stores
+# Session data holds only the attributes the layout callbacks read
+POSTING_FIELDS = ('dept_code', 'dept_name', 'position_title', 'open_date', 'start_date', 'field')
+APPLICANT_FIELDS = ('refresh_date', 'annotated_refresh_date', 'chart_agg', 'xtab_cells')
+# Attributes `suppress_applicant` reads from items without a current annotation. Each path is listed once,
+# since the chart and threshold fields share gender_Female_sum and DynamoDB rejects duplicate paths.
+UNANNOTATED_APPLICANT_FIELDS = tuple(dict.fromkeys(
+    ('refresh_date', 'xtab') + tuple(f'agg.{name}' for name in APPLICANT_CHART_FIELDS + APPLICANT_THRESHOLD_FIELDS)
+))
+PIPELINE_FIELDS = tuple(
+    f'{group}_{measure}'
+    for group in ('combined_1993-2012', 'tenured_1993-2007', 'untenured_2008-2012', 'untenured_2013-2016')
+    for measure in ('women', 'urm', 'asian', 'white')
+)
+
+
+def applicant_session_data(item):
+    """
+    Returns:
+        dict: refresh_date,
+            agg: APPLICANT_CHART_FIELDS, or empty if the chart is suppressed,
+            xtab: Crosstab counts in the order of CELL_IDS, or empty if the crosstab is suppressed
+    """
+    return {
+        'refresh_date': item['refresh_date'],
+        'agg': item.get('chart_agg', {}),
+        'xtab': item.get('xtab_cells', []),
+    }
 
 
 def register_searchcom_callbacks(dashapp):
 
     posting_table = dynamo.tables[current_app.config['DB_SEARCHCOM_POSTING']]
     applicant_table = dynamo.tables[current_app.config['DB_SEARCHCOM_APPLICANT']]
-    pipeline_table = dynamo.tables[current_app.config['DB_SEARCHCOM_PIPELINE']]
-    subfields_table = dynamo.tables[current_app.config['DB_SEARCHCOM_SUBFIELDS']]
 
     # DATA
 
-    ## POSTING DATA
-    @dashapp.callback(Output('searchcom-session-data-posting', 'data'),
-                      [Input('req-num-dropdown', 'value')],
-                      [State('searchcom-session-data-posting', 'data')])
-    def load_posting_data(req_num, posting_data):
+    posting_projection, posting_names = projection_expression(POSTING_FIELDS)
+    applicant_projection, applicant_names = projection_expression(APPLICANT_FIELDS)
+    unannotated_projection, unannotated_names = projection_expression(UNANNOTATED_APPLICANT_FIELDS)
+
+    def resolve(req_num, **handles):
         """
-        Loads posting data for the selected job requisition number into session data
+        Returns the session data of store handles keyed by SESSION_DATA name, see `app.utils.session_store`.
+        If any of them has expired or was stored by another worker process, the data is loaded again
+        for the selected requisition.
+
+        Example:
+                posting_data, applicant_data = resolve(req_num, posting=posting_handle, applicant=applicant_handle)
         """
+        values = [session_store.get(handle) for handle in handles.values()]
+        if all(value is not None for value in values):
+            return values
+
         if (req_num == '') or (req_num is None):
             raise PreventUpdate
 
-        response = posting_table.query(KeyConditionExpression=Key('req_num').eq(req_num))
-
-        return response['Items'][0]  # DynamoDB query returns a list, since we are querying on a unique requisition number, we need the first and only element of the list
+        data = dict(zip(SESSION_DATA, search_data(req_num)))
+        return [data[name] for name in handles]
 
-    ## APPLICANT DATA
-    @dashapp.callback(Output('searchcom-session-data-applicant', 'data'),
-                      [Input('req-num-dropdown', 'value')],
-                      [State('searchcom-session-data-applicant', 'data')])
-    def load_applicant_data(req_num, applicant_data):
+    def query_first(table, key, value, projection, names):
         """
-        Loads applicant data for the selected job requisition number into session data
+        Returns the first item of a partition. Every partition of the searchcom tables holds a single item.
         """
-        if (req_num == '') or (req_num is None):
-            raise PreventUpdate
+        items = iter_query(table, KeyConditionExpression=Key(key).eq(value),
+                           ProjectionExpression=projection, ExpressionAttributeNames=names)
+        return list(items)[0]
 
-        response = applicant_table.query(KeyConditionExpression=Key('req_num').eq(req_num))
-        applicant_data = response['Items'][0]
-
-        CHART_THRESHOLD_FAIL = applicant_data['agg']['person_id_count'] < 3
-        CROSSTAB_THRESHOLD_FAIL = (applicant_data['agg']['gender_Female_sum'] < 5) or (applicant_data['agg']['gender_Male_sum'] < 5)
+    def query_applicant(req_num):
+        """
+        Reads the pre-suppressed applicant data (see `app.searchcom.ingest.annotate_applicants`).
+        Items that have not been annotated since their data was loaded are read again in full and suppressed here.
+        """
+        item = query_first(applicant_table, 'req_num', req_num, applicant_projection, applicant_names)
 
-        if CHART_THRESHOLD_FAIL:
-            applicant_data['agg'] = {}
+        if item.get('annotated_refresh_date') != item['refresh_date']:
+            item = query_first(applicant_table, 'req_num', req_num, unannotated_projection, unannotated_names)
+            item.update(suppress_applicant(item))
 
-        if CROSSTAB_THRESHOLD_FAIL:
-            applicant_data['xtab'] = {}
+        return item
 
-        return applicant_data
+    def search_data(req_num):
+        """
+        Loads all session data of a job requisition number in one round trip:
+        posting and applicant data concurrently, then the pipeline and subfields of the posting's department
+        from the in-memory reference data.
 
-    ## PIPELINE DATA
-    @dashapp.callback(Output('searchcom-session-data-pipeline', 'data'),
-                      [Input('searchcom-session-data-posting', 'modified_timestamp')],
-                      [State('searchcom-session-data-posting', 'data')])
-    def load_pipeline_data(ts, posting_data):
+        Returns:
+            tuple: Session data in the order of SESSION_DATA, as JSON types
         """
-        Loads the pipeline based on the department code of the selected job requisition number
+        posting_data, applicant_item = run_concurrently(
+            lambda: query_first(posting_table, 'req_num', req_num, posting_projection, posting_names),
+            lambda: query_applicant(req_num),
+        )
+
+        # Empty if the department has no reference data; the charts and footer are then left as they are
+        dept = posting_data.pop('dept_code')  # Only needed here
+        pipeline, subfields = get_pipeline(dept), get_subfields(dept)
+        pipeline_data = {name: pipeline[name] for name in PIPELINE_FIELDS} if pipeline else {}
+        subfields_data = {'Subfield': subfields['Subfield']} if subfields else {}
+
+        session_data = (posting_data, applicant_session_data(applicant_item), pipeline_data, subfields_data)
+
+        # Convert to the JSON types the layout callbacks received when the data went through the browser
+        return json.loads(json.dumps(session_data, cls=PlotlyJSONEncoder))
+
+    @dashapp.callback([Output('searchcom-session-data-posting', 'data'),
+                       Output('searchcom-session-data-applicant', 'data'),
+                       Output('searchcom-session-data-pipeline', 'data'),
+                       Output('searchcom-session-data-subfields', 'data')],
+                      [Input('req-num-dropdown', 'value')])
+    def load_search_data(req_num):
         """
-        if (ts is None) or (ts == -1):
+        Loads all session data of the selected job requisition number.
+        The data stays on the server, the stores receive its handles.
+        """
+        if (req_num == '') or (req_num is None):
             raise PreventUpdate
 
-        dept = posting_data['dept_code']
-        response = pipeline_table.query(KeyConditionExpression=Key('Dept').eq(dept))
-
-        return response['Items'][0]
+        return [session_store.put(data) for data in search_data(req_num)]
 
     # LAYOUT
     ## BASIC SEARCH INFO
@@ -122,14 +171,17 @@ def register_searchcom_callbacks(dashapp):
                       [Input('searchcom-session-data-posting', 'modified_timestamp'),
                       Input('searchcom-session-data-applicant', 'modified_timestamp')],
                       [State('searchcom-session-data-posting', 'data'),
-                      State('searchcom-session-data-applicant', 'data')])
-    def populate_search_info(posting_ts, applicant_ts, posting_data, applicant_data):
+                      State('searchcom-session-data-applicant', 'data'),
+                      State('req-num-dropdown', 'value')])
+    def populate_search_info(posting_ts, applicant_ts, posting_handle, applicant_handle, req_num):
         """
         Populates basic search info from the selected job requisition number's posting data
         """
         if (posting_ts is None) or (posting_ts == -1) or (applicant_ts is None) or (applicant_ts == -1):
             raise PreventUpdate
 
+        posting_data, applicant_data = resolve(req_num, posting=posting_handle, applicant=applicant_handle)
+
         return posting_data['dept_name'], \
             posting_data['position_title'], \
             posting_data['open_date'], \
@@ -140,63 +192,39 @@ def register_searchcom_callbacks(dashapp):
     ## FOOTER
 
     @dashapp.callback(Output('searchcom-search-subfields', 'children'),
-                      [Input('searchcom-session-data-posting', 'modified_timestamp')],
-                      [State('searchcom-session-data-posting', 'data')])
-    def populate_footer(ts, posting_data):
+                      [Input('searchcom-session-data-subfields', 'modified_timestamp')],
+                      [State('searchcom-session-data-subfields', 'data'),
+                       State('req-num-dropdown', 'value')])
+    def populate_footer(ts, subfields_handle, req_num):
         """
-        Populates the subfield info based on the department code of the selected job requisition number
+        Populates the subfield info of the department of the selected job requisition number
         """
         if (ts is None) or (ts == -1):
             raise PreventUpdate
 
-        dept = posting_data['dept_code']
-        response = subfields_table.query(KeyConditionExpression=Key('Dept').eq(dept))
+        subfields_data, = resolve(req_num, subfields=subfields_handle)
+        if not subfields_data:
+            raise PreventUpdate
 
-        return response['Items'][0]['Subfield']
+        return subfields_data['Subfield']
 
     ## TABLE
 
     @dashapp.callback(xtab_output_list,
                       [Input('searchcom-session-data-applicant', 'modified_timestamp')],
-                      [State('searchcom-session-data-applicant', 'data')])
-    def build_crosstab_table(applicant_ts, applicant_data):
+                      [State('searchcom-session-data-applicant', 'data'),
+                       State('req-num-dropdown', 'value')])
+    def build_crosstab_table(applicant_ts, applicant_handle, req_num):
         if (applicant_ts is None) or (applicant_ts == -1):
             raise PreventUpdate
 
-        if applicant_data['xtab']:
-
-            applicant_data_xtab = applicant_data['xtab']
+        applicant_data, = resolve(req_num, applicant=applicant_handle)
 
-            return_list = [
-                {'display': 'inline'},
-                {'display': 'none'}
-            ]
-            # Loop through gender, then hispanic, then ethnicity in order match the output list (Male-White-Yes matches male-white-hisp, etc.)
-            for j in ethn_cat:
-                for k in hisp_cat:
-                    for i in gen_cat:
-                        return_value = applicant_data_xtab[i][j][k]
-                        if return_value == 0:
-                            return_list.append('-')
-                        else:
-                            return_list.append(return_value)
-
-            return return_list
+        if applicant_data['xtab']:
+            return [{'display': 'inline'}, {'display': 'none'}] + crosstab_cells(applicant_data['xtab'])
 
         else:
-
-            return_list = [
-                {'display': 'none'},
-                {'display': 'inline'}
-            ]
-
-            # Fill with blanks
-            for j in ethn_cat:
-                for k in hisp_cat:
-                    for i in gen_cat:
-                        return_list.append('-')
-
-            return return_list
+            return [{'display': 'none'}, {'display': 'inline'}] + ['-'] * len(CELL_IDS)
 
     ## CHARTS
 
@@ -207,18 +235,23 @@ def register_searchcom_callbacks(dashapp):
                       [Input('searchcom-session-data-applicant', 'modified_timestamp'),
                        Input('searchcom-session-data-pipeline', 'modified_timestamp')],
                       [State('searchcom-session-data-applicant', 'data'),
-                       State('searchcom-session-data-pipeline', 'data')])
-    def build_applicant_chart(applicant_ts, pipeline_ts, applicant_data, pipeline_data):
+                       State('searchcom-session-data-pipeline', 'data'),
+                       State('req-num-dropdown', 'value')])
+    def build_applicant_chart(applicant_ts, pipeline_ts, applicant_handle, pipeline_handle, req_num):
         if (applicant_ts is None) or (applicant_ts == -1) or (pipeline_ts is None) or (pipeline_ts == -1):
             raise PreventUpdate
 
+        applicant_data, pipeline_data = resolve(req_num, applicant=applicant_handle, pipeline=pipeline_handle)
+        if not pipeline_data:
+            raise PreventUpdate
+
         if applicant_data['agg']:
 
             applicant_data_agg = applicant_data['agg']
             x_axis = ['Female', 'URM', 'Asian', 'White']
 
             chart_data = [
-                go.Bar(
+                figures.bar(
                     name='Combined availability 1993-2012',
                     x=x_axis,
                     y=[
@@ -239,7 +272,7 @@ def register_searchcom_callbacks(dashapp):
                     )
                 ),
 
-                go.Bar(
+                figures.bar(
                     name='Tenured availability 1993-2007',
                     x=x_axis,
                     y=[
@@ -260,7 +293,7 @@ def register_searchcom_callbacks(dashapp):
                     )
                 ),
 
-                go.Bar(
+                figures.bar(
                     name='Untenured availability 2008-2012',
                     x=x_axis,
                     y=[
@@ -281,7 +314,7 @@ def register_searchcom_callbacks(dashapp):
                     )
                 ),
 
-                go.Bar(
+                figures.bar(
                     name='Untenured availability 2013-2016',
                     x=x_axis,
                     y=[
@@ -302,7 +335,7 @@ def register_searchcom_callbacks(dashapp):
                     )
                 ),
 
-                go.Bar(
+                figures.bar(
                     name='Applicants',
                     x=x_axis,
                     y=[
@@ -330,7 +363,7 @@ def register_searchcom_callbacks(dashapp):
                     )
                 ),
 
-                # go.Scatter(
+                # figures.scatter(
                 #     name='dept',
                 #     x=x_axis,
                 #     y=[10, 20, 30, 40],
@@ -343,7 +376,7 @@ def register_searchcom_callbacks(dashapp):
                 # )
             ]
 
-            chart_layout = go.Layout(
+            chart_layout = figures.layout(
                 barmode='group',
                 xaxis=axes(),
                 yaxis=axes(
@@ -0,0 +1,86 @@
+"""
+Crosstab dimensions of the search committee dashboard
+
+The applicant crosstab is stored as nested dicts, gender -> ethnicity -> hispanic -> count.
+The table shows one cell per combination of categories, with HTML ids like 'asian-nonhisp-fem'.
+
+Dimensions are listed in the nesting order of the HTML ids (ethnicity, hispanic, gender). Each knows
+its depth in the stored dict, so the cell order and the path of every cell in the stored data are computed
+once at import. Adding a dimension, e.g. citizenship, only takes another entry in DIMENSIONS.
+
+Example:
+        cells = flatten_xtab(applicant_item['xtab'])  # At load time, in CELL_IDS order
+        crosstab_cells(cells)  # ['-', 3, '-', ...]
+"""
+
+# Standard library imports
+import itertools
+from collections import namedtuple
+
+
+Dimension = namedtuple('Dimension', ['name', 'html_values', 'data_values', 'data_depth'])
+
+# Category values as they are entered in HTML id fields and as they are in the xtab data, in the same order
+GENDER = Dimension('gender', ('fem', 'male', 'na'), ('Female', 'Male', 'Blank'), 0)
+ETHNICITY = Dimension(
+    'ethnicity',
+    ('amind', 'asian', 'black', 'pacific', 'white', 'na'),
+    ('American Indian or Alaska Native', 'Asian', 'Black or African American',
+     'Native Hawaiian or Other Pacific Islander', 'White', 'Blank'),
+    1,
+)
+HISPANIC = Dimension('hispanic', ('hisp', 'nonhisp', 'na'), ('Yes', 'No', 'Blank'), 2)
+
+# Order of the parts of a cell's HTML id, e.g. 'asian-nonhisp-fem'
+DIMENSIONS = (ETHNICITY, HISPANIC, GENDER)
+
+# Category values as they are in the xtab data
+gen_cat = list(GENDER.data_values)
+ethn_cat = list(ETHNICITY.data_values)
+hisp_cat = list(HISPANIC.data_values)
+
+
+def _cells():
+    """
+    Returns:
+        tuple: HTML ids of all cells and, for each, its key path in the stored xtab
+    """
+    by_depth = sorted(range(len(DIMENSIONS)), key=lambda i: DIMENSIONS[i].data_depth)
+
+    ids, paths = [], []
+    for combination in itertools.product(*(range(len(dimension.html_values)) for dimension in DIMENSIONS)):
+        ids.append('-'.join(dimension.html_values[j] for dimension, j in zip(DIMENSIONS, combination)))
+        paths.append(tuple(DIMENSIONS[i].data_values[combination[i]] for i in by_depth))
+
+    return tuple(ids), tuple(paths)
+
+
+CELL_IDS, CELL_PATHS = _cells()
+
+
+def flatten_xtab(xtab):
+    """
+    Args:
+        xtab (dict): Stored crosstab, nested by data depth of the dimensions
+
+    Returns:
+        list: Counts in the order of CELL_IDS
+    """
+    cells = []
+    for path in CELL_PATHS:
+        value = xtab
+        for key in path:
+            value = value[key]
+        cells.append(value)
+    return cells
+
+
+def crosstab_cells(cells):
+    """
+    Args:
+        cells (list): Counts in the order of CELL_IDS, see `flatten_xtab`
+
+    Returns:
+        list: Cell contents, with '-' for zero counts
+    """
+    return ['-' if value == 0 else value for value in cells]
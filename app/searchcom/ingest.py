@@ -0,0 +1,192 @@
+"""
+Ingest-time steps for the search committee dashboard
+
+Posting index
+-------------
+Building the requisition dropdown needs the summary attributes of every posting a user can see.
+Instead of reading those postings on page load, `rebuild_posting_index` materializes them once into
+the DB_SEARCHCOM_POSTING_INDEX table, with one item per department:
+
+    {'dept': 'AAADS', 'part': 0, 'postings': {'10012': {'req_num': '10012', ..., 'label': '2020-21 - 10012 - ...'}}}
+
+Large departments are split over several parts to stay below DynamoDB's 400 KB item limit.
+The whole index is then read with a single paginated scan (see `app.searchcom.postings.get_posting_index`).
+
+Run after every posting load:
+        flask build-posting-index
+
+Applicant privacy thresholds
+----------------------------
+Charts are suppressed for searches with fewer than 3 applicants, crosstabs for searches with fewer than
+5 women or 5 men. `annotate_applicants` stores these decisions on every applicant item as `chart_ok`/`xtab_ok`,
+together with pre-suppressed copies of the data the dashboard shows:
+
+    chart_agg: APPLICANT_CHART_FIELDS of `agg`, only if chart_ok
+    xtab_cells: `xtab` flattened in the order of the crosstab cells, only if xtab_ok
+    annotated_refresh_date: `refresh_date` of the data the annotation was computed from
+
+The dashboard then reads only these attributes, and never fetches a crosstab it would not show.
+Items whose `refresh_date` differs from `annotated_refresh_date`, i.e. reloaded since the last run,
+are suppressed on request instead.
+
+Run after every applicant load:
+        flask annotate-applicants
+"""
+
+# Third party imports
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+# Local application imports
+from app.extensions import dynamo
+from app.utils.dynamo import iter_scan
+from app.searchcom.postings import SUMMARY_ATTRIBUTES, posting_label, posting_index_cache
+from app.searchcom.crosstab import flatten_xtab
+
+
+POSTINGS_PER_PART = 1000  # About 150 KB per index item
+
+# Attributes stored by `annotate_applicants`
+ANNOTATION_ATTRIBUTES = ('chart_ok', 'xtab_ok', 'chart_agg', 'xtab_cells', 'annotated_refresh_date')
+
+# Attributes of `agg` shown in the applicant chart and used by the thresholds
+APPLICANT_CHART_FIELDS = ('gender_Female_pcnt', 'gender_Female_sum', 'ethnicity_URM_pcnt', 'ethnicity_URM_sum',
+                          'ethnicity_Asian_pcnt', 'ethnicity_Asian_sum', 'ethnicity_White_pcnt', 'ethnicity_White_sum')
+APPLICANT_THRESHOLD_FIELDS = ('person_id_count', 'gender_Female_sum', 'gender_Male_sum')
+
+
+def build_posting_index(postings):
+    """
+    Groups posting summaries by department
+
+    Args:
+        postings (list[dict]): Posting items with at least SUMMARY_ATTRIBUTES.
+            Postings are grouped by `dept_code`, or by `dept_name` if they have no code.
+
+    Returns:
+        list[dict]: Index items, keyed by `dept` and `part`
+    """
+    departments = {}
+    for posting in postings:
+        summary = {attribute: posting.get(attribute) for attribute in SUMMARY_ATTRIBUTES}
+        summary['label'] = posting_label(summary)
+
+        dept = posting.get('dept_code') or posting['dept_name']
+        departments.setdefault(dept, {})[posting['req_num']] = summary
+
+    items = []
+    for dept, summaries in sorted(departments.items()):
+        req_nums = sorted(summaries)
+        for part, start in enumerate(range(0, len(req_nums), POSTINGS_PER_PART)):
+            items.append({
+                'dept': dept,
+                'part': part,
+                'postings': {req_num: summaries[req_num] for req_num in req_nums[start:start + POSTINGS_PER_PART]},
+            })
+
+    return items
+
+
+def rebuild_posting_index():
+    """
+    Rebuilds DB_SEARCHCOM_POSTING_INDEX from DB_SEARCHCOM_POSTING and removes index items
+    of departments that no longer have postings. Requires an application context.
+
+    Returns:
+        dict: Number of postings indexed, items written and stale items deleted
+    """
+    posting_table = dynamo.tables[current_app.config['DB_SEARCHCOM_POSTING']]
+    index_table = dynamo.tables[current_app.config['DB_SEARCHCOM_POSTING_INDEX']]
+
+    postings = list(iter_scan(posting_table, label='searchcom.ingest',
+                              ProjectionExpression=', '.join(SUMMARY_ATTRIBUTES + ('dept_code',))))
+    items = build_posting_index(postings)
+
+    keys = {(item['dept'], item['part']) for item in items}
+    existing = iter_scan(index_table, label='searchcom.ingest', ProjectionExpression='#dept, #part',
+                         ExpressionAttributeNames={'#dept': 'dept', '#part': 'part'})
+    stale = [key for key in existing if (key['dept'], key['part']) not in keys]
+
+    with index_table.batch_writer() as writer:
+        for item in items:
+            writer.put_item(Item=item)
+        for key in stale:
+            writer.delete_item(Key=key)
+
+    posting_index_cache.clear()
+
+    return {'postings': len(postings), 'items': len(items), 'deleted': len(stale)}
+
+
+def suppress_applicant(item):
+    """
+    Applies the privacy thresholds to an applicant item
+
+    Args:
+        item (dict): Applicant item with `refresh_date`, `agg` (at least APPLICANT_CHART_FIELDS and
+            APPLICANT_THRESHOLD_FIELDS) and `xtab`
+
+    Returns:
+        dict: ANNOTATION_ATTRIBUTES, chart_agg and xtab_cells only where allowed
+    """
+    agg = item['agg']
+
+    CHART_THRESHOLD_FAIL = agg['person_id_count'] < 3
+    CROSSTAB_THRESHOLD_FAIL = (agg['gender_Female_sum'] < 5) or (agg['gender_Male_sum'] < 5)
+
+    attributes = {
+        'chart_ok': not CHART_THRESHOLD_FAIL,
+        'xtab_ok': not CROSSTAB_THRESHOLD_FAIL,
+        'annotated_refresh_date': item['refresh_date'],
+    }
+
+    if not CHART_THRESHOLD_FAIL:
+        attributes['chart_agg'] = {name: agg[name] for name in APPLICANT_CHART_FIELDS}
+
+    if not CROSSTAB_THRESHOLD_FAIL:
+        attributes['xtab_cells'] = flatten_xtab(item['xtab'])
+
+    return attributes
+
+
+def annotate_applicants():
+    """
+    Adds the threshold decisions and pre-suppressed data (see `suppress_applicant`) to every item of
+    DB_SEARCHCOM_APPLICANT. Stale attributes of a previous run are dropped. Requires an application context.
+
+    Returns:
+        dict: Number of applicant items annotated, and of those with charts/crosstabs shown
+    """
+    table = dynamo.tables[current_app.config['DB_SEARCHCOM_APPLICANT']]
+
+    stats = {'applicants': 0, 'charts': 0, 'crosstabs': 0}
+    with table.batch_writer() as writer:
+        for item in list(iter_scan(table, label='searchcom.ingest')):
+            for name in ANNOTATION_ATTRIBUTES:
+                item.pop(name, None)
+            item.update(suppress_applicant(item))
+            writer.put_item(Item=item)
+
+            stats['applicants'] += 1
+            stats['charts'] += item['chart_ok']
+            stats['crosstabs'] += item['xtab_ok']
+
+    return stats
+
+
+@click.command('build-posting-index')
+@with_appcontext
+def build_posting_index_command():
+    """Rebuild the searchcom posting index from the posting table."""
+    stats = rebuild_posting_index()
+    click.echo(f"Indexed {stats['postings']} postings in {stats['items']} items, deleted {stats['deleted']} stale items")
+
+
+@click.command('annotate-applicants')
+@with_appcontext
+def annotate_applicants_command():
+    """Store privacy threshold decisions on the searchcom applicant items."""
+    stats = annotate_applicants()
+    click.echo(f"Annotated {stats['applicants']} applicants: {stats['charts']} charts and "
+               f"{stats['crosstabs']} crosstabs shown")
@@ -0,0 +1,106 @@
+"""
+Posting lookups for the search committee dashboard
+
+Posting summaries are served from the precomputed posting index (see `app.searchcom.ingest`),
+which is read with a single scan and kept in memory. Requisitions that are not in the index yet,
+e.g. postings loaded after the last index build, are read from the posting table in batches.
+"""
+
+# Third party imports
+from flask import current_app
+
+# Local application imports
+from app.extensions import dynamo
+from app.utils.cache import TTLCache
+from app.utils.dynamo import batch_get_items, iter_scan
+
+
+# Posting attributes shown in the requisition dropdown
+SUMMARY_ATTRIBUTES = ('req_num', 'dept_name', 'position_title', 'academic_year')
+
+# Posting summaries keyed by requisition number.
+# Sized by SEARCHCOM_POSTING_CACHE_SIZE/SEARCHCOM_POSTING_CACHE_TTL when the app is created.
+posting_cache = TTLCache()
+
+# The posting index as a single entry, {req_num: summary}.
+# Expires after SEARCHCOM_POSTING_INDEX_TTL seconds, so that a rebuilt index is picked up.
+posting_index_cache = TTLCache(maxsize=1)
+
+
+def posting_label(summary):
+    """
+    Returns:
+        str: Dropdown label of a posting, [academic year] - [requisition number] - [department] - [position title]
+    """
+    return f"{summary['academic_year']} - {summary['req_num']} - {summary['dept_name']} - {summary['position_title']}"
+
+
+def _read_posting_index(table_name):
+    """
+    Scans the posting index table
+
+    Returns:
+        dict: Posting summaries keyed by requisition number
+    """
+    index = {}
+    for item in iter_scan(dynamo.tables[table_name], label='searchcom.posting_index'):
+        index.update(item['postings'])
+
+    return index
+
+
+def get_posting_index():
+    """
+    Returns the posting index, reading it only if it is not cached. Concurrent callers share a single read.
+
+    Returns:
+        dict: Posting summaries (SUMMARY_ATTRIBUTES plus `label`) keyed by requisition number.
+            Empty if no DB_SEARCHCOM_POSTING_INDEX table is configured.
+    """
+    table_name = current_app.config.get('DB_SEARCHCOM_POSTING_INDEX')
+    if not table_name:
+        return {}
+
+    return posting_index_cache.get_or_load(table_name, lambda: _read_posting_index(table_name))
+
+
+def get_posting_summaries(req_nums):
+    """
+    Returns the dropdown attributes of the postings of the given requisitions.
+    Summaries are looked up in the posting index first, then in `posting_cache`.
+    The rest are read with batched BatchGetItem calls.
+
+    Args:
+        req_nums (list[str]): Requisition numbers
+
+    Returns:
+        dict: Posting summaries (SUMMARY_ATTRIBUTES plus `label`) keyed by requisition number.
+            Requisitions without a posting are left out.
+    """
+    index = get_posting_index()
+
+    summaries = {}
+    missing = []
+
+    for req_num in req_nums:
+        summary = index.get(req_num) or posting_cache.get(req_num)
+        if summary is None:
+            missing.append(req_num)
+        else:
+            summaries[req_num] = summary
+
+    if missing:
+        items = batch_get_items(
+            dynamo.connection,
+            current_app.config['DB_SEARCHCOM_POSTING'],
+            [{'req_num': req_num} for req_num in missing],
+            projection=', '.join(SUMMARY_ATTRIBUTES),
+        )
+
+        for item in items:
+            summary = {attribute: item.get(attribute) for attribute in SUMMARY_ATTRIBUTES}
+            summary['label'] = posting_label(summary)
+            posting_cache.set(item['req_num'], summary)
+            summaries[item['req_num']] = summary
+
+    return summaries
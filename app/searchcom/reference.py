@@ -0,0 +1,113 @@
+"""
+Pipeline and subfield reference data for the search committee dashboard
+
+DB_SEARCHCOM_PIPELINE and DB_SEARCHCOM_SUBFIELDS hold one item per department with national availability
+data, shared by every search of that department. Both tables are small and static between data loads,
+so each is read once with a full scan and served from memory, keyed by department code.
+Departments added after the scan are queried directly and added to the cached table, as are departments
+without an item, so that each is queried at most once per scan.
+
+Tables are reloaded after SEARCHCOM_REFERENCE_TTL seconds, or immediately with `reload_reference_data`.
+"""
+
+# Third party imports
+from boto3.dynamodb.conditions import Key
+from flask import current_app
+
+# Local application imports
+from app.extensions import dynamo
+from app.utils.cache import TTLCache
+from app.utils.dynamo import iter_query, iter_scan
+
+
+# Config keys of the reference tables
+REFERENCE_TABLES = ('DB_SEARCHCOM_PIPELINE', 'DB_SEARCHCOM_SUBFIELDS')
+
+# {dept code: item} per table, keyed by table name. The item is None for departments found to have none.
+# Tables are replaced rather than changed, since request threads read them without a lock.
+# Expires after SEARCHCOM_REFERENCE_TTL seconds when the app is created.
+reference_cache = TTLCache(maxsize=len(REFERENCE_TABLES))
+
+
+def _scan_table(table_name):
+    """
+    Reads every item of a reference table
+
+    Returns:
+        dict: Items keyed by department code
+    """
+    return {item['Dept']: item for item in iter_scan(dynamo.tables[table_name], label='searchcom.reference')}
+
+
+def get_reference_table(config_key):
+    """
+    Returns a reference table, scanning it only if it is not cached. Concurrent callers share a single scan.
+
+    Args:
+        config_key (str): One of REFERENCE_TABLES
+
+    Returns:
+        dict: Items keyed by department code
+    """
+    table_name = current_app.config[config_key]
+
+    return reference_cache.get_or_load(table_name, lambda: _scan_table(table_name))
+
+
+def get_reference_item(config_key, dept):
+    """
+    Returns the item of a department. Departments missing from the cached table are queried
+    and added to it, also if they have no item.
+
+    Args:
+        config_key (str): One of REFERENCE_TABLES
+        dept (str): Department code
+
+    Returns:
+        dict: Item of the department, empty if the table has none
+    """
+    items = get_reference_table(config_key)
+    if dept in items:
+        return items[dept] or {}
+
+    table_name = current_app.config[config_key]
+    found = list(iter_query(dynamo.tables[table_name], label='searchcom.reference',
+                            KeyConditionExpression=Key('Dept').eq(dept)))
+    item = found[0] if found else None
+
+    reference_cache.replace(table_name, lambda items: {**items, dept: item})
+    return item or {}
+
+
+def get_pipeline(dept):
+    """
+    Returns:
+        dict: Pipeline item of a department, empty if it has none
+    """
+    return get_reference_item('DB_SEARCHCOM_PIPELINE', dept)
+
+
+def get_subfields(dept):
+    """
+    Returns:
+        dict: Subfields item of a department, empty if it has none
+    """
+    return get_reference_item('DB_SEARCHCOM_SUBFIELDS', dept)
+
+
+def reload_reference_data():
+    """
+    Re-reads every reference table, e.g. after a data load. Requires an application context.
+
+    Returns:
+        dict: Number of departments per table name
+    """
+    stats = {}
+
+    for config_key in REFERENCE_TABLES:
+        table_name = current_app.config[config_key]
+        items = _scan_table(table_name)
+        reference_cache.set(table_name, items)
+        stats[table_name] = len(items)
+
+    return stats
@@ -1,16 +1,129 @@
 """
 User class
+
+Permission edges
+----------------
+DB_USER_PERMISSIONS holds one item per permission a user has, so that admin lookups such as
+"all users with access to requisition 123" are a query of a single partition instead of a users table scan:
+
+    {'PK': 'REQ#123', 'SK': 'USER#abc1', 'UNI': 'abc1'}
+    {'PK': 'DEPTPROFILE_CHAIR#BIOL', 'SK': 'USER#abc1', 'UNI': 'abc1'}
+    {'PK': 'ADMIN', 'SK': 'USER#abc1', 'UNI': 'abc1'}
+
+Edges are written together with the user item by `UserBatch.put_user`/`UserBatch.delete_user`.
+Rebuild them after users are written by other tools:
+        flask build-permission-edges
 """
 
+# Standard library imports
+import threading
+import time
+from collections import defaultdict
+
 # Third party imports
+import click
 from flask import current_app
+from flask import g
 from flask import session
 from flask import has_request_context
+from flask.cli import with_appcontext
 
 from boto3.dynamodb.conditions import Attr
 
 # Local application imports
 from app.extensions import dynamo
+from app.utils.cache import TTLCache
+from app.utils.dynamo import batch_get_items, iter_query, iter_scan, parallel_scan, projection_expression
+
+
+# Attribute paths that make up the permission portion of a user item
+PERMISSION_PATHS = ('fif', 'deptprofile', 'searchcom.reqs', 'admin_tag', 'facgov')
+
+# Process-wide cache of the permission portion of user items, keyed by UNI.
+# Each entry is a tuple of (set of loaded attribute paths, permissions dict).
+# Sized by USER_CACHE_SIZE/USER_CACHE_TTL when the app is created.
+permission_cache = TTLCache()
+
+# Attribute paths that admin searches can be answered for from `user_index`
+INDEX_PATHS = ('UNI',) + PERMISSION_PATHS
+
+# Partition key prefixes of the permission edges, by attribute path.
+# Sets get one edge per member, e.g. 'REQ#123', booleans a single edge if true, e.g. 'ADMIN'.
+PERMISSION_EDGES = {
+    'searchcom.reqs': 'REQ',
+    'fif.dept': 'FIF',
+    'fif.chair_dept': 'FIF_CHAIR',
+    'deptprofile.dept': 'DEPTPROFILE',
+    'deptprofile.dept_chair': 'DEPTPROFILE_CHAIR',
+    'admin_tag': 'ADMIN',
+    'facgov': 'FACGOV',
+}
+
+
+def extract_permissions(item):
+    """
+    Returns the permission portion of a user item:
+        fif, deptprofile, searchcom.reqs, admin_tag, facgov
+
+    Args:
+        item (dict): User item from DynamoDB, either complete or projected
+
+    Returns:
+        dict: Only the permission attributes present in the item
+    """
+    permissions = {}
+
+    for attribute in ('fif', 'deptprofile', 'admin_tag', 'facgov'):
+        if attribute in item:
+            permissions[attribute] = item[attribute]
+
+    if 'reqs' in item.get('searchcom', {}):
+        permissions['searchcom'] = {'reqs': item['searchcom']['reqs']}
+
+    return permissions
+
+
+def _is_loaded(path, loaded_paths):
+    """
+    True if the path itself or one of its parents has been loaded
+    """
+    return any(path == p or path.startswith(f'{p}.') for p in loaded_paths)
+
+
+def _collapse(paths):
+    """
+    Drops paths whose parent is also given, since DynamoDB rejects overlapping paths in a ProjectionExpression
+
+    Returns:
+        frozenset: e.g. {'fif'} for ['fif', 'fif.dept']
+    """
+    return frozenset(path for path in paths if not any(path.startswith(f'{parent}.') for parent in paths))
+
+
+def invalidate(uni):
+    """
+    Drops the cached permissions of a single user.
+    Should be called by admin tooling after the user's permissions change.
+    """
+    uni = str(uni)
+    permission_cache.invalidate(uni)
+    user_index.mark_stale(uni)
+
+    if has_request_context():
+        g.setdefault('user_records', {}).pop(uni, None)
+        g.setdefault('user_permissions', {}).pop(uni, None)
+
+
+def invalidate_all():
+    """
+    Drops the cached permissions of all users.
+    """
+    permission_cache.clear()
+    user_index.clear()
+
+    if has_request_context():
+        g.setdefault('user_records', {}).clear()
+        g.setdefault('user_permissions', {}).clear()
 
 
 class User(object):
@@ -21,6 +134,13 @@ class User(object):
         OR
         2. User was initialized with a UNI
 
+    Access methods read permissions from, in order:
+        1. The current request (memoized on `flask.g`)
+        2. The process-wide `permission_cache`
+        3. DynamoDB, projecting only the attribute path the method needs
+    Use `permissions()` to load all permission attributes in one read
+    and `refresh()` when fresh data is needed.
+
     Args:
         uni (str, optional): user's UNI.
             If used, then flask session is ignored. Otherwise, uni is obtained from flask session.
@@ -36,6 +156,8 @@ class User(object):
         If provided, initialize with a given UNI
         """
         self._uni = uni
+        self._record = None  # Memoized item when there is no request context
+        self._permission_entry = None  # Memoized permissions when there is no request context
 
     @property
     def app(self):
@@ -68,21 +190,159 @@ class User(object):
             return str(self._uni)
 
     @property
-    def obj(self):
+    def is_identified(self):
         """
-        Returns the entire user object as a dictionary
+        True if the user can be looked up in DynamoDB
         """
-        if (has_request_context() and 'CAS_USERNAME' in session) or (self._uni is not None):
+        return (has_request_context() and 'CAS_USERNAME' in session) or (self._uni is not None)
 
-            try:
-                response = dynamo.tables[self.user_table_name].get_item(Key={'UNI': self.uni})
-                return response['Item']
-            except KeyError:
-                return None
+    @property
+    def record(self):
+        """
+        User's entire DynamoDB item, fetched at most once per request.
+
+        Within a request the item is memoized on `flask.g`, keyed by UNI, so that every
+        `User` instance for the same UNI shares it. Outside of a request it is memoized on the instance.
+
+        Returns:
+            dict: User item, empty if the user is not in DB. None if the user cannot be identified.
+        """
+        if not self.is_identified:
+            return None
 
+        if has_request_context():
+            records = g.setdefault('user_records', {})
+            if self.uni not in records:
+                records[self.uni] = self._fetch_record()
+            return records[self.uni]
+
+        if self._record is None:
+            self._record = self._fetch_record()
+        return self._record
+
+    def refresh(self):
+        """
+        Re-fetches the user item from DynamoDB, replacing the memoized record and cached permissions.
+
+        Returns:
+            dict: User item, empty if the user is not in DB. None if the user cannot be identified.
+        """
+        if not self.is_identified:
+            return None
+
+        record = self._fetch_record()
+        self._set_permission_entry((frozenset(PERMISSION_PATHS), extract_permissions(record)))
+
+        if has_request_context():
+            g.setdefault('user_records', {})[self.uni] = record
+        else:
+            self._record = record
+
+        return record
+
+    def _fetch_record(self, paths=None):
+        """
+        Single DynamoDB round trip for the user item
+
+        Args:
+            paths (list[str], optional): Attribute paths to project. The entire item is returned if omitted.
+        """
+        kwargs = {'Key': {'UNI': self.uni}}
+
+        if paths:
+            kwargs['ProjectionExpression'], kwargs['ExpressionAttributeNames'] = projection_expression(paths)
+
+        response = dynamo.tables[self.user_table_name].get_item(**kwargs)
+        return response.get('Item', {})
+
+    def _get_permission_entry(self):
+        """
+        Returns:
+            tuple: (set of loaded attribute paths, permissions dict)
+        """
+        if has_request_context():
+            entry = g.setdefault('user_permissions', {}).get(self.uni)
+            if entry is None:
+                record = g.setdefault('user_records', {}).get(self.uni)
+                if record is not None:
+                    # Entire item was already fetched during this request
+                    entry = (frozenset(PERMISSION_PATHS), extract_permissions(record))
         else:
+            entry = self._permission_entry
+
+        if entry is None:
+            entry = permission_cache.get(self.uni)
+
+        return entry or (frozenset(), {})
+
+    def _set_permission_entry(self, entry, shared=True):
+        """
+        Memoizes permissions for the current request (or instance) and, if `shared`, in the process-wide cache
+        """
+        if shared:
+            permission_cache.set(self.uni, entry)
+
+        if has_request_context():
+            g.setdefault('user_permissions', {})[self.uni] = entry
+        else:
+            self._permission_entry = entry
+
+    def _load_permissions(self, paths):
+        """
+        Ensures the given attribute paths are loaded, reading only the missing ones from DynamoDB.
+
+        Returns:
+            dict: Permission attributes loaded so far. None if the user cannot be identified.
+        """
+        if not self.is_identified:
             return None
 
+        loaded_paths, permissions = self._get_permission_entry()
+        missing = [path for path in paths if not _is_loaded(path, loaded_paths)]
+
+        if missing:
+            # Re-read the paths loaded earlier in the same round trip, so that the entry stored with a fresh TTL
+            # holds no value older than that TTL
+            loaded_paths = _collapse(loaded_paths.union(missing))
+            permissions = extract_permissions(self._fetch_record(paths=sorted(loaded_paths)))
+
+        # Only write back to the shared cache after a read so that its TTL is not extended indefinitely
+        self._set_permission_entry((loaded_paths, permissions), shared=bool(missing))
+        return permissions
+
+    def _permission(self, path):
+        """
+        Value at a dotted permission path, e.g. 'searchcom.reqs'
+
+        Raises:
+            KeyError: If the user cannot be identified or the attribute does not exist
+        """
+        value = self._load_permissions((path,))
+        if value is None:
+            raise KeyError(path)
+
+        for part in path.split('.'):
+            value = value[part]
+
+        return value
+
+    def permissions(self):
+        """
+        Loads all permission attributes (fif, deptprofile, searchcom.reqs, admin_tag, facgov) in one projected read.
+        Subsequent access methods are then served from cache.
+
+        Returns:
+            dict: Permission attributes present in the user item. Empty if the user cannot be identified.
+        """
+        return self._load_permissions(PERMISSION_PATHS) or {}
+
+    @property
+    def obj(self):
+        """
+        Returns the entire user object as a dictionary
+        """
+        return self.record or None
+
     def fif_access(self, arg):
         """
         Get details about user's access to the FIF dashboard for a given argument.
@@ -94,15 +354,9 @@ class User(object):
             - If user has access: a list of department codes
             - If user does not have access (either not in DB or no access to dashboard): empty list
         """
-        if (has_request_context() and 'CAS_USERNAME' in session) or (self._uni is not None):
-
-            try:
-                response = dynamo.tables[self.user_table_name].get_item(Key={'UNI': self.uni})
-                return sorted(list(response['Item']['fif'][arg]))
-            except KeyError:
-                return []
-
-        else:
+        try:
+            return sorted(list(self._permission(f'fif.{arg}')))
+        except KeyError:
             return []
 
     def deptprofile_access(self, arg):
@@ -116,15 +370,9 @@ class User(object):
             - If user has access: a list of department codes
             - If user does not have access (either not in DB or no access to dashboard): empty list
         """
-        if (has_request_context() and 'CAS_USERNAME' in session) or (self._uni is not None):
-
-            try:
-                response = dynamo.tables[self.user_table_name].get_item(Key={'UNI': self.uni})
-                return list(response['Item']['deptprofile'][arg])
-            except KeyError:
-                return []
-
-        else:
+        try:
+            return list(self._permission(f'deptprofile.{arg}'))
+        except KeyError:
             return []
 
     def searchcom_access(self):
@@ -134,16 +382,9 @@ class User(object):
             - If user has access: a list of requisition numbers to which user has access to
             - If user does not have access (either not in DB or no access to dashboard): empty list
         """
-        if (has_request_context() and 'CAS_USERNAME' in session) or (self._uni is not None):
-
-            try:
-                # TODO: can optimize by using ProjectionExpression to return only the requirements?
-                response = dynamo.tables[self.user_table_name].get_item(Key={'UNI': self.uni})
-                return sorted(list(response['Item']['searchcom']['reqs']))
-            except KeyError:
-                return []
-
-        else:
+        try:
+            return sorted(list(self._permission('searchcom.reqs')))
+        except KeyError:
             return []
 
     def has_admin_access(self):
@@ -153,15 +394,9 @@ class User(object):
             - If user has access: True
             - If user does not have access (either not in DB or no admin access): False
         """
-        if (has_request_context() and 'CAS_USERNAME' in session) or (self._uni is not None):
-
-            try:
-                response = dynamo.tables[self.user_table_name].get_item(Key={'UNI': self.uni})
-                return response['Item']['admin_tag']
-            except KeyError:
-                return False
-
-        else:
+        try:
+            return self._permission('admin_tag')
+        except KeyError:
             return False
 
     def has_facgov_access(self):
@@ -171,20 +406,293 @@ class User(object):
             - If user has access: True
             - If user does not have access (either not in DB or no admin access): False
         """
-        if (has_request_context() and 'CAS_USERNAME' in session) or (self._uni is not None):
+        try:
+            return self._permission('facgov')
+        except KeyError:
+            return False
+
+
+def edge_key(path, value=None):
+    """
+    Args:
+        path (str): One of PERMISSION_EDGES, e.g. 'searchcom.reqs'
+        value (str, optional): Member of a set attribute, e.g. a requisition number. None for boolean attributes.
+
+    Returns:
+        str: Partition key of the permission edges, e.g. 'REQ#123'
+    """
+    prefix = PERMISSION_EDGES[path]
+    return prefix if value is None else f'{prefix}#{value}'
+
+
+def permission_edges(item):
+    """
+    Args:
+        item (dict): User item with its permission attributes
 
-            try:
-                response = dynamo.tables[self.user_table_name].get_item(Key={'UNI': self.uni})
-                return response['Item']['facgov']
-            except KeyError:
-                return False
+    Returns:
+        list[dict]: Permission edge items of the user
+    """
+    uni = str(item['UNI'])
+    edges = []
+
+    for path, prefix in PERMISSION_EDGES.items():
+        value = item
+        for part in path.split('.'):
+            value = value.get(part) if isinstance(value, dict) else None
 
+        if isinstance(value, bool):
+            keys = [edge_key(path)] if value else []
         else:
-            return False
+            keys = [edge_key(path, member) for member in sorted(value or ())]
+
+        edges.extend({'PK': key, 'SK': f'USER#{uni}', 'UNI': uni} for key in keys)
+
+    return edges
+
+
+def _write_edges(old_edges, new_edges):
+    """
+    Replaces a user's permission edges, writing only the ones that changed
+    """
+    table = dynamo.tables[current_app.config['DB_USER_PERMISSIONS']]
+
+    old_keys = {(edge['PK'], edge['SK']) for edge in old_edges}
+    new_keys = {(edge['PK'], edge['SK']) for edge in new_edges}
+
+    with table.batch_writer() as writer:
+        for edge in new_edges:
+            if (edge['PK'], edge['SK']) not in old_keys:
+                writer.put_item(Item=edge)
+        for pk, sk in old_keys - new_keys:
+            writer.delete_item(Key={'PK': pk, 'SK': sk})
+
+
+def rebuild_permission_edges():
+    """
+    Rebuilds DB_USER_PERMISSIONS from DB_USERS and removes edges that no longer exist.
+    Requires an application context.
+
+    Returns:
+        dict: Number of users, edges written and stale edges deleted
+    """
+    projection, names = projection_expression(INDEX_PATHS)
+    users = parallel_scan(dynamo.tables[current_app.config['DB_USERS']], current_app.config['USER_SCAN_SEGMENTS'],
+                          label='users.edges', ProjectionExpression=projection, ExpressionAttributeNames=names)
+    edges = [edge for user in users for edge in permission_edges(user)]
+
+    table = dynamo.tables[current_app.config['DB_USER_PERMISSIONS']]
+    existing = iter_scan(table, label='users.edges', ProjectionExpression='PK, SK')
+    keys = {(edge['PK'], edge['SK']) for edge in edges}
+    stale = [key for key in existing if (key['PK'], key['SK']) not in keys]
+
+    with table.batch_writer() as writer:
+        for edge in edges:
+            writer.put_item(Item=edge)
+        for key in stale:
+            writer.delete_item(Key=key)
+
+    return {'users': len(users), 'edges': len(edges), 'deleted': len(stale)}
+
+
+@click.command('build-permission-edges')
+@with_appcontext
+def build_permission_edges_command():
+    """Rebuild the user permission edges from the users table."""
+    stats = rebuild_permission_edges()
+    click.echo(f"Wrote {stats['edges']} permission edges of {stats['users']} users, "
+               f"deleted {stats['deleted']} stale edges")
+
+
+def _leaves(value, path=''):
+    """
+    Yields (path, value) of every non-map value in a user item, e.g. ('deptprofile.dept', {'BIOL'})
+    """
+    if isinstance(value, dict):
+        for key, child in value.items():
+            yield from _leaves(child, f'{path}.{key}' if path else key)
+    else:
+        yield path, value
+
+
+def _index_key(value):
+    """
+    Returns:
+        tuple: Key of a value in `UserIndex`, which tells booleans from the numbers they equal in Python.
+            None if the value cannot be indexed.
+    """
+    if isinstance(value, (frozenset, tuple)):
+        return None
+    try:
+        hash(value)
+    except TypeError:
+        return None
+    return isinstance(value, bool), value
+
+
+class UserIndex(object):
+    """Inverted index of the INDEX_PATHS attributes of every user, attribute value -> UNIs.
+
+    Answers `eq` searches on scalar attributes and `contains` searches on sets and lists
+    (e.g. every user with 'BIOL' in deptprofile.dept) without a scan. Built with one parallel scan,
+    then kept current incrementally: users passed to `invalidate` are re-read on the next lookup.
+    The whole index is rebuilt after `ttl` seconds, to pick up changes made by other processes.
+
+    Scans and reads run outside of the lock that guards the index, and `mark_stale` only takes the lock
+    of the stale set, so writers never wait for a rebuild.
+
+    Sized by USER_INDEX_TTL/USER_SCAN_SEGMENTS when the app is created.
+    """
+
+    def __init__(self, ttl=300, segments=4):
+        self.ttl = ttl
+        self.segments = segments
+        self._lock = threading.Lock()  # Guards the index structures and `_built`
+        self._refresh_lock = threading.Lock()  # Serializes rebuilds and re-reads
+        self._stale_lock = threading.Lock()
+        self._built = None  # time.monotonic() of the last full build
+        self._stale = set()  # UNIs to re-read
+        self._clear()
+
+    def _clear(self):
+        self._equal = defaultdict(lambda: defaultdict(set))  # {path: {value: UNIs}}
+        self._members = defaultdict(lambda: defaultdict(set))  # {path: {set or list member: UNIs}}
+        self._text_paths = set()  # Paths with string values, where `contains` is a substring match
+        self._entries = {}  # {UNI: [(index, path, value)]}, to remove a user's entries
+
+    def configure(self, ttl=300, segments=4):
+        """
+        Args:
+            ttl (float): Seconds between full rebuilds
+            segments (int): Segments of the parallel scan that builds the index
+        """
+        with self._lock:
+            self.ttl = ttl
+            self.segments = segments
+            self._built = None
+
+    def clear(self):
+        """
+        Drops the index. It is rebuilt on the next lookup.
+        """
+        with self._lock:
+            self._built = None
+
+    def mark_stale(self, uni):
+        """
+        Re-reads a user on the next lookup, e.g. after their permissions change
+        """
+        with self._stale_lock:
+            self._stale.add(str(uni))
+
+    def _take_stale(self):
+        with self._stale_lock:
+            stale, self._stale = self._stale, set()
+        return stale
+
+    def _expired(self):
+        with self._lock:
+            return self._built is None or time.monotonic() - self._built > self.ttl
+
+    def _remove(self, uni):
+        for index, path, value in self._entries.pop(uni, ()):
+            unis = index[path][value]
+            unis.discard(uni)
+            if not unis:
+                del index[path][value]
+
+    def _add(self, item):
+        uni = item['UNI']
+        entries = []
+
+        for path, value in _leaves(item):
+            if isinstance(value, (set, list)):
+                keys = [_index_key(member) for member in value]
+                entries.extend((self._members, path, key) for key in keys if key is not None)
+            elif _index_key(value) is not None:
+                entries.append((self._equal, path, _index_key(value)))
+                if isinstance(value, str):
+                    self._text_paths.add(path)
+
+        for index, path, value in entries:
+            index[path][value].add(uni)
+        self._entries[uni] = entries
+
+    def _refresh(self):
+        """
+        Rebuilds the index if it has expired, otherwise re-reads stale users
+        """
+        if not self._expired() and not self._stale:
+            return
+
+        with self._refresh_lock:
+            table_name = current_app.config['DB_USERS']
+            projection, names = projection_expression(INDEX_PATHS)
+
+            if self._expired():
+                # Users marked stale from here on may have been read before their change, they stay stale
+                self._take_stale()
+                items = parallel_scan(dynamo.tables[table_name], self.segments, label='users.index',
+                                      ProjectionExpression=projection, ExpressionAttributeNames=names)
+                built = UserIndex()
+                for item in items:
+                    built._add(item)
+
+                with self._lock:
+                    self._equal, self._members = built._equal, built._members
+                    self._text_paths, self._entries = built._text_paths, built._entries
+                    self._built = time.monotonic()
+
+            stale = self._take_stale()
+            if stale:
+                try:
+                    items = batch_get_items(dynamo.connection, table_name, [{'UNI': uni} for uni in stale],
+                                            projection=projection, names=names)
+                except Exception:
+                    with self._stale_lock:
+                        self._stale.update(stale)
+                    raise
+
+                with self._lock:
+                    for uni in stale:
+                        self._remove(uni)
+                    for item in items:
+                        self._add(item)
+
+    def lookup(self, path, value, operator):
+        """
+        Args:
+            path (str): Dotted attribute path, e.g. 'deptprofile.dept'
+            value: Value to match
+            operator (str): 'eq' or 'contains', as in boto3's `Attr`
+
+        Returns:
+            set: UNIs of the matching users. None if the index cannot answer the search,
+                e.g. for paths outside of INDEX_PATHS or substring matches.
+        """
+        key = _index_key(value)
+        if not _is_loaded(path, INDEX_PATHS) or key is None or operator not in ('eq', 'contains'):
+            return None
+
+        self._refresh()
+
+        with self._lock:
+            if operator == 'eq':
+                return set(self._equal[path].get(key, ()))
+
+            if path in self._text_paths:
+                return None
+            return set(self._members[path].get(key, ()))
+
+
+user_index = UserIndex()
 
 
 class UserBatch(object):
     """DynamoDB interface to query the users table. Batch user operations.
+
+    Searches are answered from `user_index` where possible, otherwise with a parallel scan of
+    USER_SCAN_SEGMENTS segments. Lookups by permission (`users_with_permission`) query the permission edges.
     """
 
     @property
@@ -201,26 +709,140 @@ class UserBatch(object):
         """
         return self.app.config['DB_USERS']
 
-    def attribute_contains_search(self, attribute, value):
+    def _search(self, attribute, value, operator, paths, consistent):
         """
-        Returns search results where an attribute contains a certain value.
+        Users matching `Attr(attribute).<operator>(value)`
+
+        Args:
+            paths (list[str], optional): Attribute paths to return. Entire items are returned if omitted.
+            consistent (bool): Scan with strongly consistent reads instead of using `user_index`
         """
+        if not consistent:
+            unis = user_index.lookup(attribute, value, operator)
+            if unis is not None:
+                return self._get_users(sorted(unis), paths)
+
+        kwargs = {
+            'ConsistentRead': consistent,
+            'FilterExpression': getattr(Attr(attribute), operator)(value),
+        }
+        if paths:
+            kwargs['ProjectionExpression'], kwargs['ExpressionAttributeNames'] = projection_expression(paths)
+
         table = dynamo.tables[self.user_table_name]
+        return parallel_scan(table, self.app.config['USER_SCAN_SEGMENTS'], label='users.search', **kwargs)
+
+    def _get_users(self, unis, paths):
+        """
+        Reads users found in the index. No read is needed if only UNIs are requested.
+        """
+        if paths and set(paths) <= {'UNI'}:
+            return [{'UNI': uni} for uni in unis]
 
-        response = table.scan(
-            ConsistentRead=True,
-            FilterExpression=Attr(attribute).contains(value)
-        )
-        return response['Items']
+        projection, names = projection_expression(paths) if paths else (None, None)
+        return batch_get_items(dynamo.connection, self.user_table_name, [{'UNI': uni} for uni in unis],
+                               projection=projection, names=names)
 
-    def attribute_eq_search(self, attribute, value):
+    def attribute_contains_search(self, attribute, value, paths=None, consistent=True):
         """
         Returns search results where an attribute contains a certain value.
+
+        Args:
+            attribute (str): Dotted attribute path, e.g. 'deptprofile.dept'
+            value: Member of a set or list, or substring of a string
+            paths (list[str], optional): Attribute paths to return, e.g. ['UNI']. Entire items if omitted.
+            consistent (bool): Strongly consistent scan, the default. False answers from `user_index` where
+                possible, whose results may miss permission changes made by other processes in the last
+                USER_INDEX_TTL seconds.
+        """
+        return self._search(attribute, value, 'contains', paths, consistent)
+
+    def attribute_eq_search(self, attribute, value, paths=None, consistent=True):
+        """
+        Returns search results where an attribute equals a certain value.
+
+        Args:
+            attribute (str): Dotted attribute path, e.g. 'admin_tag'
+            value: Value to match
+            paths (list[str], optional): Attribute paths to return, e.g. ['UNI']. Entire items if omitted.
+            consistent (bool): Strongly consistent scan, the default. False answers from `user_index` where
+                possible, whose results may miss permission changes made by other processes in the last
+                USER_INDEX_TTL seconds.
+        """
+        return self._search(attribute, value, 'eq', paths, consistent)
+
+    @property
+    def edges_enabled(self):
+        """
+        True if a DB_USER_PERMISSIONS table is configured
+        """
+        return bool(self.app.config.get('DB_USER_PERMISSIONS'))
+
+    def put_user(self, item):
+        """
+        Writes a user item and updates the user's permission edges and cached permissions
+
+        Args:
+            item (dict): Entire user item, replacing the stored one
         """
         table = dynamo.tables[self.user_table_name]
+        uni = str(item['UNI'])
+
+        old = table.get_item(Key={'UNI': uni}, ConsistentRead=True).get('Item') if self.edges_enabled else None
+        table.put_item(Item=item)
+
+        if self.edges_enabled:
+            _write_edges(permission_edges(old) if old else [], permission_edges(item))
+        invalidate(uni)
+
+    def delete_user(self, uni):
+        """
+        Deletes a user item with its permission edges and cached permissions
+        """
+        table = dynamo.tables[self.user_table_name]
+        uni = str(uni)
+
+        old = table.get_item(Key={'UNI': uni}, ConsistentRead=True).get('Item') if self.edges_enabled else None
+        table.delete_item(Key={'UNI': uni})
 
-        response = table.scan(
-            ConsistentRead=True,
-            FilterExpression=Attr(attribute).eq(value)
-        )
-        return response['Items']
+        if old:
+            _write_edges(permission_edges(old), [])
+        invalidate(uni)
+
+    def users_with_permission(self, path, value=None, paths=None, consistent=False):
+        """
+        Returns the users with a permission, reading only their edges.
+        Without a DB_USER_PERMISSIONS table, falls back to `attribute_contains_search`/`attribute_eq_search`.
+
+        Args:
+            path (str): One of PERMISSION_EDGES, e.g. 'deptprofile.dept_chair'
+            value (str, optional): Member of a set attribute, e.g. 'BIOL'. None for boolean attributes.
+            paths (list[str], optional): Attribute paths to return, e.g. ['UNI']. Entire items if omitted.
+            consistent (bool): Strongly consistent read of the edges
+
+        Example:
+                UserBatch().users_with_permission('searchcom.reqs', '123', paths=['UNI'])
+        """
+        if not self.edges_enabled:
+            if value is None:
+                return self._search(path, True, 'eq', paths, consistent)
+            return self._search(path, value, 'contains', paths, consistent)
+
+        table = dynamo.tables[self.app.config['DB_USER_PERMISSIONS']]
+        edges = iter_query(table, label='users.permission', KeyConditionExpression='PK = :pk',
+                           ExpressionAttributeValues={':pk': edge_key(path, value)}, ProjectionExpression='UNI',
+                           ConsistentRead=consistent)
+
+        return self._get_users(sorted(edge['UNI'] for edge in edges), paths)
+
+    def searchcom_users(self, req_num, paths=None):
+        """
+        Returns the users with access to a requisition
+        """
+        return self.users_with_permission('searchcom.reqs', req_num, paths)
+
+    def deptprofile_chairs(self, dept, paths=None):
+        """
+        Returns the users with chair-level access to a department's profile
+        """
+        return self.users_with_permission('deptprofile.dept_chair', dept, paths)
@@ -0,0 +1,188 @@
+"""
+In-process caching helpers
+"""
+
+# Standard library imports
+import threading
+import time
+from collections import OrderedDict
+
+
+_MISSING = object()
+
+
+class TTLCache(object):
+    """Thread-safe LRU cache with a per-entry time-to-live.
+
+    Entries are evicted in least-recently-used order once `maxsize` is reached
+    and are treated as missing once they are older than `ttl` seconds.
+
+    Args:
+        maxsize (int): Maximum number of entries. A value of 0 disables caching.
+        ttl (float): Seconds an entry stays valid. None means entries never expire.
+
+    Example:
+            cache = TTLCache(maxsize=128, ttl=60)
+            cache.set('abc123', {'admin_tag': True})
+            cache.get('abc123')  # {'admin_tag': True}
+    """
+
+    def __init__(self, maxsize=128, ttl=None):
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self._load_locks = {}  # Key -> lock held while the value is loaded, see `get_or_load`
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def configure(self, maxsize=None, ttl=_MISSING):
+        """
+        Changes the size and/or TTL of the cache. Existing entries are dropped.
+        """
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if ttl is not _MISSING:
+                self.ttl = ttl
+            self._data.clear()
+
+    def get(self, key, default=None):
+        """
+        Returns the cached value for a key, or `default` if the key is missing or expired
+        """
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            expires, value = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(self, key, default=None):
+        """
+        Like `get`, but does not count as a hit or miss and does not refresh the entry's LRU position
+        """
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+
+        if entry is _MISSING or (entry[0] is not None and entry[0] <= time.monotonic()):
+            return default
+        return entry[1]
+
+    def get_or_load(self, key, loader):
+        """
+        Returns the cached value for a key, calling `loader` only if it is missing or expired.
+        Concurrent calls for the same key wait for a single load. Calls for other keys are not blocked.
+
+        Args:
+            key: Cache key
+            loader (func): Function without arguments that returns the value
+
+        Returns:
+            Cached or loaded value
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with lock:
+            value = self.peek(key, _MISSING)  # Loaded by the call we waited for
+            if value is _MISSING:
+                value = loader()
+                self.set(key, value)
+
+            with self._lock:
+                self._load_locks.pop(key, None)
+
+        return value
+
+    def set(self, key, value):
+        """
+        Stores a value, evicting the least recently used entries if the cache is full
+        """
+        if self.maxsize <= 0:
+            return
+
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def replace(self, key, update):
+        """
+        Replaces the value of a key with `update(value)`, keeping the entry's expiry.
+        Missing and expired keys are left as they are.
+
+        Args:
+            key: Cache key
+            update (func): Returns the new value from the current one. Called with the cache locked,
+                so it should not do I/O.
+        """
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING or (entry[0] is not None and entry[0] <= time.monotonic()):
+                return
+
+            self._data[key] = (entry[0], update(entry[1]))
+
+    def invalidate(self, key):
+        """
+        Drops a single key. Missing keys are ignored.
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """
+        Drops every entry. Counters are kept.
+        """
+        with self._lock:
+            self._data.clear()
+
+    def values(self):
+        """
+        Returns:
+            list: Values of entries that have not expired
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [value for expires, value in self._data.values() if expires is None or expires > now]
+
+    def stats(self):
+        """
+        Returns:
+            dict: Current size and hit/miss/eviction counters
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self):
+        return len(self._data)
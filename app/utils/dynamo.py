@@ -0,0 +1,298 @@
+"""
+DynamoDB helpers
+
+Queries and scans go through `iter_query`/`iter_scan`, which follow LastEvaluatedKey across DynamoDB's
+1 MB pages and record latency, pages, items and consumed read capacity of every call in `read_metrics`:
+
+        items = list(iter_query(table, label='facgov.years', KeyConditionExpression=Key('unit').eq(unit)))
+        read_metrics.stats()  # {'facgov.years': {'calls': 1, 'pages': 1, 'items': 12, 'capacity_units': 0.5, ...}}
+"""
+
+# Standard library imports
+import functools
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+
+BATCH_GET_SIZE = 100  # Maximum keys per BatchGetItem call
+BATCH_GET_ATTEMPTS = 8  # Calls per chunk before giving up on UnprocessedKeys
+BACKOFF_BASE = 0.05  # Seconds, doubled after every attempt
+BACKOFF_CAP = 2  # Seconds
+
+_executor = {'pool': None, 'workers': 4}
+_executor_lock = threading.Lock()
+
+
+def configure_batch_workers(workers):
+    """
+    Sets the size of the thread pool shared by batch reads and `run_concurrently`.
+    A pool of another size is replaced; calls already submitted to it still complete.
+    """
+    with _executor_lock:
+        workers = max(1, workers)
+        if workers != _executor['workers']:
+            _executor['pool'] = None
+        _executor['workers'] = workers
+
+
+def _get_executor():
+    with _executor_lock:
+        if _executor['pool'] is None:
+            _executor['pool'] = ThreadPoolExecutor(max_workers=_executor['workers'],
+                                                   thread_name_prefix='dynamo-batch')
+        return _executor['pool']
+
+
+def run_concurrently(*calls):
+    """
+    Runs independent calls, e.g. queries of different tables, concurrently. The first call runs in
+    the calling thread, the others on the shared thread pool.
+
+    Args:
+        *calls: Functions without arguments
+
+    Returns:
+        list: Results in the order of `calls`. The first exception raised by a call is re-raised.
+    """
+    if not calls:
+        return []
+
+    executor = _get_executor()
+    futures = [executor.submit(call) for call in calls[1:]]
+    first = calls[0]()
+    return [first] + [future.result() for future in futures]
+
+
+class ReadMetrics(object):
+    """Statistics of paginated reads, aggregated by label, in the worker process.
+
+    A call is one `iter_query`/`iter_scan`, however many pages it reads.
+    Capacity units are taken from ConsumedCapacity, so they are what DynamoDB bills for, including items
+    dropped by a FilterExpression.
+    """
+
+    FIELDS = ('calls', 'pages', 'items', 'scanned', 'capacity_units', 'seconds')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = defaultdict(lambda: dict.fromkeys(self.FIELDS, 0))
+        self._max_seconds = defaultdict(float)
+
+    def record_page(self, label, seconds, items, scanned, capacity_units, first):
+        """
+        Adds a page of a call
+
+        Args:
+            label (str)
+            seconds (float): Latency of the page request
+            items (int): Items returned
+            scanned (int): Items read before the FilterExpression
+            capacity_units (float): Read capacity units consumed
+            first (bool): First page of a call
+        """
+        with self._lock:
+            metrics = self._metrics[label]
+            metrics['calls'] += first
+            metrics['pages'] += 1
+            metrics['items'] += items
+            metrics['scanned'] += scanned
+            metrics['capacity_units'] += capacity_units
+            metrics['seconds'] += seconds
+            self._max_seconds[label] = max(self._max_seconds[label], seconds)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Totals per label, plus mean latency per call and maximum page latency in ms
+        """
+        with self._lock:
+            stats = {}
+            for label, metrics in sorted(self._metrics.items()):
+                stats[label] = dict(metrics, capacity_units=round(metrics['capacity_units'], 2),
+                                    seconds=round(metrics['seconds'], 4))
+                stats[label]['mean_ms'] = round(1000 * metrics['seconds'] / max(1, metrics['calls']), 2)
+                stats[label]['max_page_ms'] = round(1000 * self._max_seconds[label], 2)
+            return stats
+
+    def reset(self):
+        with self._lock:
+            self._metrics.clear()
+            self._max_seconds.clear()
+
+
+read_metrics = ReadMetrics()
+
+
+def _paginate(table, operation, label, kwargs):
+    """
+    Yields the items of a query or scan page by page, following LastEvaluatedKey
+    """
+    label = label or f'{table.name}.{operation}'
+    kwargs.setdefault('ReturnConsumedCapacity', 'TOTAL')
+    read = getattr(table, operation)
+
+    first = True
+    while True:
+        start = time.perf_counter()
+        resp = read(**kwargs)
+        seconds = time.perf_counter() - start
+
+        items = resp['Items']
+        read_metrics.record_page(label, seconds, len(items), resp.get('ScannedCount', len(items)),
+                                 resp.get('ConsumedCapacity', {}).get('CapacityUnits', 0), first)
+        first = False
+
+        yield from items
+
+        if 'LastEvaluatedKey' not in resp:
+            return
+
+        kwargs['ExclusiveStartKey'] = resp['LastEvaluatedKey']
+
+
+def iter_query(table, label=None, **kwargs):
+    """
+    Queries a table or index across all pages
+
+    Args:
+        table: boto3 Table, e.g. `dynamo.tables[name]`
+        label (str, optional): Name of the call in `read_metrics`. Defaults to '{table name}.query'.
+        **kwargs: Arguments of `Table.query`
+
+    Returns:
+        generator: Items. Pages are requested as the items are consumed.
+    """
+    return _paginate(table, 'query', label, kwargs)
+
+
+def iter_scan(table, label=None, **kwargs):
+    """
+    Scans a table or index across all pages
+
+    Args:
+        table: boto3 Table, e.g. `dynamo.tables[name]`
+        label (str, optional): Name of the call in `read_metrics`. Defaults to '{table name}.scan'.
+        **kwargs: Arguments of `Table.scan`
+
+    Returns:
+        generator: Items. Pages are requested as the items are consumed.
+    """
+    return _paginate(table, 'scan', label, kwargs)
+
+
+def parallel_scan(table, segments, label=None, **kwargs):
+    """
+    Scans a table as `segments` segments (Segment/TotalSegments) that are read concurrently on the shared
+    thread pool, each across all of its pages
+
+    Args:
+        table: boto3 Table
+        segments (int): Number of segments. A single segment is a plain `iter_scan`.
+        label (str, optional): Name of the calls in `read_metrics`, one call per segment
+        **kwargs: Arguments of `Table.scan`
+
+    Returns:
+        list[dict]: Items, in no particular order
+    """
+    if segments <= 1:
+        return list(iter_scan(table, label, **kwargs))
+
+    def scan_segment(segment):
+        return list(iter_scan(table, label, Segment=segment, TotalSegments=segments, **kwargs))
+
+    results = run_concurrently(*(functools.partial(scan_segment, segment) for segment in range(segments)))
+    return [item for items in results for item in items]
+
+
+def projection_expression(paths):
+    """
+    Builds a ProjectionExpression for a list of dotted attribute paths.
+    Every path element is replaced with a placeholder to avoid clashes with reserved keywords.
+    Repeated paths are projected once, since DynamoDB rejects duplicate paths.
+
+    Args:
+        paths (list[str]): e.g. ['searchcom.reqs', 'admin_tag']
+
+    Returns:
+        tuple: ProjectionExpression (str) and ExpressionAttributeNames (dict)
+    """
+    names = {}
+    expressions = []
+
+    for path in dict.fromkeys(paths):
+        placeholders = []
+        for part in path.split('.'):
+            placeholder = f'#p{len(names)}'
+            names[placeholder] = part
+            placeholders.append(placeholder)
+        expressions.append('.'.join(placeholders))
+
+    return ', '.join(expressions), names
+
+
+def _batch_get_chunk(resource, table_name, keys, projection, names):
+    """
+    One BatchGetItem request of up to 100 keys, retrying UnprocessedKeys with exponential backoff
+
+    Raises:
+        RuntimeError: If keys are still unprocessed after BATCH_GET_ATTEMPTS calls
+    """
+    request = {'Keys': keys}
+    if projection:
+        request['ProjectionExpression'] = projection
+    if names:
+        request['ExpressionAttributeNames'] = names
+
+    items = []
+    for attempt in range(BATCH_GET_ATTEMPTS):
+        if attempt:
+            time.sleep(min(BACKOFF_CAP, BACKOFF_BASE * 2 ** (attempt - 1)))
+
+        response = resource.batch_get_item(RequestItems={table_name: request})
+        items.extend(response['Responses'].get(table_name, []))
+
+        unprocessed = response.get('UnprocessedKeys', {}).get(table_name)
+        if not unprocessed or not unprocessed.get('Keys'):
+            return items
+        request = unprocessed
+
+    raise RuntimeError(f"{len(request['Keys'])} keys of {table_name} still unprocessed after "
+                       f"{BATCH_GET_ATTEMPTS} BatchGetItem calls")
+
+
+def batch_get_items(resource, table_name, keys, projection=None, names=None):
+    """
+    Reads items by primary key with BatchGetItem, in chunks of 100 keys.
+    Chunks are requested concurrently on a bounded, process-wide thread pool.
+
+    Args:
+        resource: boto3 DynamoDB resource, e.g. `app.extensions.dynamo.connection`
+        table_name (str)
+        keys (list[dict]): Primary keys. Duplicates are removed.
+        projection (str, optional): ProjectionExpression
+        names (dict, optional): ExpressionAttributeNames
+
+    Returns:
+        list[dict]: Items that exist, in no particular order
+
+    Example:
+            items = batch_get_items(dynamo.connection, 'posting', [{'req_num': '123'}, {'req_num': '456'}])
+    """
+    unique_keys = []
+    seen = set()
+    for key in keys:
+        marker = tuple(sorted(key.items()))
+        if marker not in seen:
+            seen.add(marker)
+            unique_keys.append(key)
+
+    chunks = [unique_keys[i:i + BATCH_GET_SIZE] for i in range(0, len(unique_keys), BATCH_GET_SIZE)]
+
+    if len(chunks) <= 1:
+        return _batch_get_chunk(resource, table_name, chunks[0], projection, names) if chunks else []
+
+    futures = [_get_executor().submit(_batch_get_chunk, resource, table_name, chunk, projection, names)
+               for chunk in chunks]
+    return [item for future in futures for item in future.result()]
@@ -0,0 +1,131 @@
+"""
+Plain-dict Plotly figure builders
+
+`plotly.graph_objs` validates and copies every property when a trace or layout is constructed,
+which dominates the CPU time of chart callbacks. The builders here return plain dicts with the same
+schema that `go.Bar(...).to_plotly_json()` etc. would produce, so Dash can serialize them directly.
+
+Call `set_validation(True)` (VALIDATE_FIGURES config) to check the output of every builder against
+Plotly's validators. Each combination of builder and property names is checked once per process.
+
+Example:
+        figure = {
+            'data': [figures.bar(name='Tenured', x=x_axis, y=y_axis)],
+            'layout': figures.layout(barmode='stack', yaxis=axes(title='FTE')),
+        }
+"""
+
+# Standard library imports
+import json
+import re
+import threading
+
+# Third party imports
+from plotly.utils import PlotlyJSONEncoder
+
+
+_AXIS = re.compile(r'^[xy]axis\d*$')
+
+_validation = {'enabled': False}
+_validated = set()
+_validated_lock = threading.Lock()
+
+
+def set_validation(enabled):
+    """
+    Turns checking builder output against Plotly's validators on or off
+    """
+    _validation['enabled'] = bool(enabled)
+    with _validated_lock:
+        _validated.clear()
+
+
+def _normalize_title(props):
+    """
+    Converts the `title='...'`/`titlefont={...}` shorthand to the current `title={'text': ..., 'font': ...}` schema,
+    like graph objects do
+    """
+    if isinstance(props.get('title'), str):
+        props['title'] = {'text': props['title']}
+
+    if 'titlefont' in props:
+        title = dict(props.get('title') or {})
+        title['font'] = props.pop('titlefont')
+        props['title'] = title
+
+    return props
+
+
+def _clean(props):
+    """
+    Drops properties set to None, which graph objects ignore
+    """
+    return {key: value for key, value in props.items() if value is not None}
+
+
+def _validate(kind, spec):
+    """
+    Builds the graph object for a spec once per (kind, property names) and compares the serialized output
+    """
+    signature = (kind, tuple(sorted(spec)))
+    with _validated_lock:
+        if signature in _validated:
+            return
+        _validated.add(signature)
+
+    import plotly.graph_objs as go
+
+    props = {key: value for key, value in spec.items() if key != 'type'}
+    obj = getattr(go, kind)(**props)
+
+    expected = json.loads(json.dumps(obj, cls=PlotlyJSONEncoder))
+    actual = json.loads(json.dumps(spec, cls=PlotlyJSONEncoder))
+    if expected != actual:
+        raise ValueError(f'{kind} spec does not match plotly.graph_objs.{kind}: {actual} != {expected}')
+
+
+def _build(kind, spec):
+    if _validation['enabled']:
+        _validate(kind, spec)
+    return spec
+
+
+def bar(**props):
+    """
+    Returns:
+        dict: Equivalent of `go.Bar(**props)`
+    """
+    return _build('Bar', dict(_clean(props), type='bar'))
+
+
+def scatter(**props):
+    """
+    Returns:
+        dict: Equivalent of `go.Scatter(**props)`
+    """
+    return _build('Scatter', dict(_clean(props), type='scatter'))
+
+
+def treemap(**props):
+    """
+    Returns:
+        dict: Equivalent of `go.Treemap(**props)`
+    """
+    return _build('Treemap', dict(_clean(props), type='treemap'))
+
+
+def layout(**props):
+    """
+    Axis titles given as strings with a separate `titlefont` (see `app.deptprofile.utils.styling.axes`)
+    are converted to the nested title schema.
+
+    Returns:
+        dict: Equivalent of `go.Layout(**props)`
+    """
+    spec = _normalize_title(_clean(props))
+
+    for key, value in spec.items():
+        if _AXIS.match(key) and isinstance(value, dict):
+            spec[key] = _normalize_title(_clean(value))
+
+    return _build('Layout', spec)
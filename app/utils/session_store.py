@@ -0,0 +1,171 @@
+"""
+Server-side session data for Dash callbacks
+
+Instead of sending query results to the browser in a `dcc.Store` and back as `State` with every
+dependent callback, a callback puts the data into `session_store` and writes only the returned
+handle into the store. Dependent callbacks resolve the handle on the server.
+
+Entries are scoped to the CAS user of the request that created them and expire after
+SESSION_STORE_TTL seconds. Two backends are available (SESSION_STORE_BACKEND):
+    - 'memory': LRU cache in the worker process, see `app.utils.cache.TTLCache`
+    - 'sqlite': SQLite file at SESSION_STORE_PATH, shared by every worker on the host.
+      Values must be JSON serializable.
+
+Example:
+        handle = session_store.put(applicant_data)  # Return the handle to a dcc.Store
+        applicant_data = session_store.get(handle)  # None if expired or created by another user
+"""
+
+# Standard library imports
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+# Third party imports
+from flask import has_request_context
+from flask import session
+
+# Local application imports
+from app.utils.cache import TTLCache
+
+
+PURGE_INTERVAL = 60  # Seconds between deletions of expired SQLite rows
+
+
+def _scope():
+    """
+    Returns:
+        str: CAS username of the current request, empty outside of a logged-in request
+    """
+    if has_request_context():
+        return session.get('CAS_USERNAME', '')
+    return ''
+
+
+class MemorySessionBackend(object):
+    """Entries in an in-process LRU cache. Values are returned as stored, callers must not mutate them.
+
+    Args:
+        maxsize (int): Maximum number of entries
+        ttl (float): Seconds an entry stays valid
+    """
+
+    def __init__(self, maxsize, ttl):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def set(self, key, value):
+        self._cache.set(key, value)
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def stats(self):
+        return self._cache.stats()
+
+
+class SQLiteSessionBackend(object):
+    """JSON entries in a SQLite file, so that every worker process can resolve every handle.
+
+    Args:
+        path (str): Database file, created with its directory if missing
+        ttl (float): Seconds an entry stays valid
+    """
+
+    def __init__(self, path, ttl):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()  # One connection per thread
+        self._purged = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connection() as connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT, expires REAL)')
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+        return connection
+
+    def set(self, key, value):
+        now = time.time()
+        with self._connection() as connection:
+            connection.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?)',
+                               (key, json.dumps(value), now + self.ttl))
+            if now - self._purged > PURGE_INTERVAL:
+                self._purged = now
+                connection.execute('DELETE FROM entries WHERE expires <= ?', (now,))
+
+    def get(self, key):
+        row = self._connection().execute('SELECT value FROM entries WHERE key = ? AND expires > ?',
+                                         (key, time.time())).fetchone()
+        if row is None:
+            return None
+
+        try:
+            return json.loads(row[0])
+        except (TypeError, ValueError):  # Written by an earlier version
+            return None
+
+    def stats(self):
+        count, = self._connection().execute('SELECT COUNT(*) FROM entries WHERE expires > ?',
+                                            (time.time(),)).fetchone()
+        return {'size': count, 'ttl': self.ttl, 'path': self.path}
+
+
+class SessionStore(object):
+    """Keyed store for data exchanged between Dash callbacks, scoped to the CAS user.
+
+    Uses the in-memory backend until `configure` is called (see `app.register_caches`).
+    """
+
+    def __init__(self):
+        self._backend = MemorySessionBackend(maxsize=1024, ttl=3600)
+
+    def configure(self, backend='memory', maxsize=1024, ttl=3600, path=None):
+        """
+        Replaces the backend. Existing entries are dropped.
+
+        Args:
+            backend (str): 'memory' or 'sqlite'
+            maxsize (int): Maximum number of entries of the memory backend
+            ttl (float): Seconds an entry stays valid
+            path (str): Database file of the sqlite backend
+        """
+        if backend == 'memory':
+            self._backend = MemorySessionBackend(maxsize, ttl)
+        elif backend == 'sqlite':
+            self._backend = SQLiteSessionBackend(path, ttl)
+        else:
+            raise ValueError(f'Unknown session store backend: {backend}')
+
+    def put(self, value):
+        """
+        Stores a value for the current user
+
+        Returns:
+            str: Opaque handle
+        """
+        handle = uuid.uuid4().hex
+        self._backend.set(f'{_scope()}:{handle}', value)
+        return handle
+
+    def get(self, handle):
+        """
+        Returns:
+            The value of a handle, or None if it is missing, expired or belongs to another user
+        """
+        if not handle:
+            return None
+        return self._backend.get(f'{_scope()}:{handle}')
+
+    def stats(self):
+        return self._backend.stats()
+
+
+session_store = SessionStore()
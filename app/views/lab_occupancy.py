@@ -15,6 +15,7 @@ from flask_cas import login_required
 # Local application imports
 from app.users import User
 from app.extensions import dynamo
+from app.utils.dynamo import iter_query
 
 
 bp = Blueprint('lab_occupancy', __name__, url_prefix='/lab_occupancy')
@@ -28,7 +29,9 @@ def index():
 
     # Get all existing records
     table_name = current_app.config['DB_LAB_OCCUPANCY']
-    records = dynamo.tables[table_name].query(
+    records = list(iter_query(
+        dynamo.tables[table_name],
+        label='lab_occupancy.records',
         KeyConditionExpression='uni = :uni AND #t BETWEEN :lower AND :upper',
         ExpressionAttributeValues={
             ':uni': current_user.uni,
@@ -37,9 +40,9 @@ def index():
         },
         ExpressionAttributeNames={'#t': 'timestamp'},  # timestamp is a reserved keyword
         ScanIndexForward=False,
-    )
+    ))
 
-    return render_template('lab_occupancy.html', uni=current_user.uni, url=form_url, records=records['Items'])
+    return render_template('lab_occupancy.html', uni=current_user.uni, url=form_url, records=records)
 
 
 @bp.route('/cognito', methods=['POST'])
@@ -0,0 +1,6 @@
+"""
+Benchmarks
+
+Run against the in-memory backend (`config.LocalConfig`), so no AWS access is needed.
+See `benchmarks.bench_callbacks` for end-to-end Dash callback latency.
+"""
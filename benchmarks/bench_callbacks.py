@@ -0,0 +1,164 @@
+"""
+End-to-end latency of the Dash callbacks
+
+Every benchmark posts to a Dash app's `_dash-update-component` endpoint with the Flask test client,
+exactly like the browser does, so routing, login, serialization and backend calls are all included.
+The app runs with `config.LocalConfig` against the in-memory backend loaded with synthetic fixtures.
+
+Usage:
+        python -m benchmarks.bench_callbacks --iterations 50 --output baseline.json
+        python -m benchmarks.bench_callbacks --baseline baseline.json --filter deptprofile
+"""
+
+# Standard library imports
+import argparse
+import os
+import sys
+
+# config.py requires a secret key at import time
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Local application imports
+from config import LocalConfig  # noqa: E402
+from app import create_app  # noqa: E402
+from app.backends.fixtures import AGGREGATE_DEPTS  # noqa: E402
+from app.deptprofile.layouts.filters import ALL_DROPDOWN_OPTIONS  # noqa: E402
+from app.deptprofile.utils.years import MAX_YEAR_ID  # noqa: E402
+from app.extensions import dynamo  # noqa: E402
+from benchmarks import harness  # noqa: E402
+from tests.dash_client import CallbackClient  # noqa: E402
+
+
+def _scan_all(table_name, attribute):
+    """
+    Values of an attribute across an in-memory table
+    """
+    table = dynamo.tables[table_name]
+    kwargs = {}
+    values = []
+    while True:
+        response = table.scan(**kwargs)
+        values.extend(item[attribute] for item in response['Items'])
+        if 'LastEvaluatedKey' not in response:
+            return values
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def searchcom_scenarios(client, config):
+    """
+    Benchmarks for the search committee dashboard, cycling through every requisition.
+    Session store contents for the downstream callbacks are produced by the upstream callbacks once, up front.
+    """
+    req_nums = sorted(_scan_all(config['DB_SEARCHCOM_POSTING'], 'req_num'))
+    stores = []
+    for req_num in req_nums:
+        response = client.call('searchcom', 'searchcom-session-data-posting.data', {'req-num-dropdown.value': req_num})
+        store = {'req-num-dropdown.value': req_num}
+        for name in ('posting', 'applicant', 'pipeline', 'subfields'):
+            store[f'searchcom-session-data-{name}.modified_timestamp'] = 1
+            store[f'searchcom-session-data-{name}.data'] = response[f'searchcom-session-data-{name}']['data']
+        stores.append(store)
+
+    def scenario(output):
+        return lambda i: client.call('searchcom', output, stores[i % len(stores)])
+
+    return {
+        'searchcom.serve_layout': lambda i: client.layout('searchcom'),
+        'searchcom.load_search_data': scenario('searchcom-session-data-posting.data'),
+        'searchcom.populate_footer': scenario('searchcom-search-subfields.children'),
+        'searchcom.build_crosstab_table': scenario('searchcom-xtab-table.style'),
+        'searchcom.build_applicant_chart': scenario('searchcom-applicant-chart.figure'),
+    }
+
+
+def deptprofile_scenarios(client, config):
+    """
+    Benchmarks for every department profile chart, cycling through every department
+    """
+    departments = [option['value'] for option in ALL_DROPDOWN_OPTIONS if not option.get('disabled')]
+    single_departments = [dept for dept in departments if dept not in AGGREGATE_DEPTS]
+
+    outputs = {
+        'update_faculty_fte_chart': 'faculty-fte-chart.figure',
+        'update_faculty_demo_chart': 'faculty-demo-chart.figure',
+        'update_classes_bar_chart': 'classes-bar-chart.figure',
+        'update_classes_core_chart': 'classes-core-chart.figure',
+        'update_classes_tree_chart': 'classes-tree-chart.figure',
+        'update_enrollments_bar_chart': 'enrollments-bar-chart.figure',
+        'update_enrollments_core_chart': 'enrollments-core-chart.figure',
+        'update_student_ug_chart': 'students-ug-chart.figure',
+        'update_student_masters_chart': 'students-masters-chart.figure',
+        'update_student_interdept_chart': 'students-interdept-chart.figure',
+        'update_student_hybrid_chart': 'students-hybrid-chart.figure',
+        'update_student_sps_chart': 'students-sps-chart.figure',
+        'update_student_phd_chart': 'students-phd-chart.figure',
+    }
+
+    def scenario(output, choices):
+        return lambda i: client.call('deptprofile', output, {
+            'dept-dropdown.value': choices[i % len(choices)],
+            'classes-tree-chart-slider.value': MAX_YEAR_ID,
+        })
+
+    scenarios = {f'deptprofile.{name}': scenario(output, departments) for name, output in outputs.items()}
+    # The faculty list is only shown for single departments
+    scenarios['deptprofile.update_faculty_table'] = scenario('faculty-table.data', single_departments)
+    return scenarios
+
+
+def facgov_scenarios(client, config):
+    """
+    Benchmarks for the faculty governance file lists, cycling through every unit with and without a year
+    """
+    units = ('faculty_meeting', 'PPC', 'EPPC', 'CED')
+    years = sorted(set(_scan_all(config['DB_FACGOV'], 'year')))
+    filters = [(unit, year) for unit in units for year in [''] + years]
+
+    return {
+        'facgov.display_lists': lambda i: client.call('faculty_governance', 'file-list-left.children', {
+            'unit-input.value': filters[i % len(filters)][0],
+            'year-input.value': filters[i % len(filters)][1],
+        }),
+        'facgov.build_year_options': lambda i: client.call('faculty_governance', 'year-input.options', {
+            'unit-input.value': units[i % len(units)],
+        }),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=50, help='Timed calls per callback')
+    parser.add_argument('--warmup', type=int, default=3, help='Untimed calls per callback')
+    parser.add_argument('--scale', type=int, default=1, help='Fixture scale, see app.backends.fixtures')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Simulated round trip per backend call')
+    parser.add_argument('--filter', default='', help='Only run benchmarks whose name contains this string')
+    parser.add_argument('--output', help='Write results to this JSON file')
+    parser.add_argument('--baseline', help='Compare results with this JSON file')
+    args = parser.parse_args(argv)
+
+    server = create_app(type('BenchmarkConfig', (LocalConfig,), {
+        'DATA_FIXTURES_SCALE': args.scale,
+        'MEMORY_LATENCY_MS': args.latency_ms,
+    }))
+    client = CallbackClient(server)
+    resources = (dynamo._connection_instance, server.config['S3_RESOURCE'])
+
+    scenarios = {}
+    for build in (searchcom_scenarios, deptprofile_scenarios, facgov_scenarios):
+        scenarios.update(build(client, server.config))
+
+    results = {}
+    for name, func in sorted(scenarios.items()):
+        if args.filter in name:
+            results[name] = harness.run(name, func, args.iterations, warmup=args.warmup, resources=resources)
+
+    if args.output:
+        harness.write_results(args.output, results, iterations=args.iterations, scale=args.scale,
+                              latency_ms=args.latency_ms)
+    if args.baseline:
+        harness.compare(results, args.baseline)
+
+
+if __name__ == '__main__':
+    main()
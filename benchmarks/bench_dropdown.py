@@ -0,0 +1,93 @@
+"""
+Micro-benchmark: sorting the searchcom requisition dropdown with pandas vs `app.utils.func.multisort`
+
+The pandas path is the previous implementation of `build_req_dropdown_options` (DataFrame sort, then `.iloc`
+per row). pandas is only needed for this comparison and is installed from requirements-dev.txt.
+
+Usage:
+        python -m benchmarks.bench_dropdown --counts 50 500 5000
+"""
+
+# Standard library imports
+import argparse
+import os
+import random
+import subprocess
+import sys
+import time
+
+# config.py requires a secret key at import time
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Local application imports
+from app.utils.func import multisort
+from benchmarks import harness
+
+
+def make_postings(count, seed=0):
+    rng = random.Random(seed)
+    depts = [f'Department {i:02d}' for i in range(30)]
+    return [
+        {
+            'req_num': str(10000 + i),
+            'dept_name': rng.choice(depts),
+            'position_title': rng.choice(('Assistant Professor', 'Associate Professor', 'Professor')),
+            'academic_year': f'{rng.randint(2015, 2020)}-{rng.randint(16, 21)}',
+        }
+        for i in range(count)
+    ]
+
+
+def pandas_options(postings):
+    import pandas as pd
+
+    search_info = {key: [posting[key] for posting in postings]
+                   for key in ('req_num', 'dept_name', 'position_title', 'academic_year')}
+
+    options_df = pd.DataFrame.from_dict(search_info)
+    options_df.sort_values(by=['dept_name', 'academic_year', 'req_num'], inplace=True, ascending=[True, False, True])
+
+    options = []
+    for i in range(len(options_df)):
+        options.append({'label': f"{options_df['academic_year'].iloc[i]} - {options_df['req_num'].iloc[i]} - "
+                                 f"{options_df['dept_name'].iloc[i]} - {options_df['position_title'].iloc[i]}",
+                        'value': options_df['req_num'].iloc[i]})
+    return options
+
+
+def multisort_options(postings):
+    postings = multisort(list(postings), (('dept_name', False), ('academic_year', True), ('req_num', False)))
+    return [{'label': f"{p['academic_year']} - {p['req_num']} - {p['dept_name']} - {p['position_title']}",
+             'value': p['req_num']} for p in postings]
+
+
+def import_time(module):
+    """
+    Seconds to import a module in a fresh interpreter
+    """
+    code = f'import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)'
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    return float(output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--counts', type=int, nargs='+', default=[50, 500, 5000], help='Requisitions per dropdown')
+    parser.add_argument('--iterations', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    print(f"Cold import of pandas: {import_time('pandas') * 1000:.0f} ms")
+    print(f'(measured in {time.perf_counter() - start:.1f} s)\n')
+
+    for count in args.counts:
+        postings = make_postings(count)
+        assert pandas_options(postings) == multisort_options(postings), 'Paths produce different options'
+
+        harness.run(f'pandas ({count} reqs)', lambda i: pandas_options(postings), args.iterations)
+        harness.run(f'multisort ({count} reqs)', lambda i: multisort_options(postings), args.iterations)
+
+
+if __name__ == '__main__':
+    main()
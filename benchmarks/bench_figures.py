@@ -0,0 +1,101 @@
+"""
+Micro-benchmark: building chart figures with plotly.graph_objs vs the plain-dict builders in app.utils.figures
+
+Both paths build and JSON-serialize the same stacked bar + line chart as the faculty demographics chart.
+
+Usage:
+        python -m benchmarks.bench_figures --iterations 500
+"""
+
+# Standard library imports
+import argparse
+import json
+import os
+import sys
+from decimal import Decimal
+
+# config.py requires a secret key at import time
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Third party imports
+import plotly.graph_objs as go
+from plotly.utils import PlotlyJSONEncoder
+
+# Local application imports
+from app.utils import figures
+from app.deptprofile.utils.styling import axes, margin
+from benchmarks import harness
+
+
+YEARS = [f'{year}/{str(year + 1)[-2:]}' for year in range(2004, 2020)]
+CATEGORIES = ('Tenured', 'NTBOT', 'NTBOT-professor-term', 'Lecturers', 'Other Full-Time', 'Adjunct')
+VALUES = [Decimal(f'{i}.5') for i in range(len(YEARS))]
+PERCENTS = [i * 3 for i in range(len(YEARS))]
+
+
+def build(module, trace_names):
+    """
+    Builds the chart with either `plotly.graph_objs` or `app.utils.figures`
+    """
+    bar, scatter, layout = (getattr(module, name) for name in trace_names)
+
+    data = [
+        bar(
+            name=cat,
+            x=YEARS,
+            y=VALUES,
+            text=[f' {round(float(i))} ' for i in VALUES],
+            textposition='inside',
+            hovertext=[f'{cat}: {i}' for i in VALUES],
+            hoverinfo='text',
+            marker=dict(color='#1f77b4', line=dict(color='floralwhite', width=1)),
+        )
+        for cat in CATEGORIES
+    ]
+    data.append(
+        scatter(
+            name='% Female',
+            x=YEARS,
+            y=PERCENTS,
+            mode='lines+markers+text',
+            text=[f'{i}%' for i in PERCENTS],
+            textposition='top center',
+            hoverinfo='text',
+            yaxis='y2',
+        )
+    )
+
+    chart_layout = layout(
+        barmode='stack',
+        xaxis=axes(),
+        yaxis=axes(title='FTE'),
+        yaxis2=axes(title='% FTE', overlaying='y', side='right', rangemode='tozero', showgrid=False),
+        legend={'traceorder': 'normal', 'x': 1.05},
+        margin=margin(),
+    )
+
+    return json.dumps({'data': data, 'layout': chart_layout}, cls=PlotlyJSONEncoder)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=500)
+    args = parser.parse_args(argv)
+
+    graph_objs = build(go, ('Bar', 'Scatter', 'Layout'))
+    dicts = build(figures, ('bar', 'scatter', 'layout'))
+    assert json.loads(graph_objs) == json.loads(dicts), 'Builders produce different figures'
+
+    results = {
+        'graph_objs': harness.run('graph_objs', lambda i: build(go, ('Bar', 'Scatter', 'Layout')), args.iterations),
+        'dict_builders': harness.run('dict_builders', lambda i: build(figures, ('bar', 'scatter', 'layout')),
+                                     args.iterations),
+    }
+
+    speedup = results['graph_objs']['p50_ms'] / results['dict_builders']['p50_ms']
+    print(f'\nDict builders are {speedup:.1f}x faster at p50')
+
+
+if __name__ == '__main__':
+    main()
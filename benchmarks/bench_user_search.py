@@ -0,0 +1,85 @@
+"""
+Benchmark: admin user searches with a single scan, a parallel segmented scan and the inverted index
+
+The single scan is the previous `UserBatch.attribute_contains_search`, one strongly consistent scan with a
+filter. The parallel scan splits it over USER_SCAN_SEGMENTS segments, and the index (`app.users.user_index`)
+answers repeated searches without reading the users table.
+
+Usage:
+        python -m benchmarks.bench_user_search --scale 40 --latency-ms 5 --page-kb 64
+"""
+
+# Standard library imports
+import argparse
+import os
+import sys
+
+# config.py requires a secret key at import time
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Third party imports
+from boto3.dynamodb.conditions import Attr
+
+# Local application imports
+from config import LocalConfig
+from app import create_app
+from app.deptprofile.layouts.filters import ALL_DROPDOWN_OPTIONS
+from app.extensions import dynamo
+from app.users import UserBatch
+from app.utils.dynamo import iter_scan
+from benchmarks import harness
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--scale', type=int, default=40, help='Fixture scale, see app.backends.fixtures')
+    parser.add_argument('--latency-ms', type=float, default=5, help='Simulated round trip per backend call')
+    parser.add_argument('--page-kb', type=int, default=64, help='Page size of the in-memory backend')
+    parser.add_argument('--segments', type=int, default=4)
+    args = parser.parse_args(argv)
+
+    server = create_app(type('BenchmarkConfig', (LocalConfig,), {
+        'DATA_FIXTURES_SCALE': args.scale,
+        'MEMORY_LATENCY_MS': args.latency_ms,
+        'MEMORY_PAGE_BYTES': args.page_kb * 1024,
+        'USER_SCAN_SEGMENTS': args.segments,
+        'DYNAMO_BATCH_WORKERS': args.segments,
+    }))
+    resources = (dynamo._connection_instance,)
+    depts = [option['value'] for option in ALL_DROPDOWN_OPTIONS if not option.get('disabled')]
+
+    with server.test_request_context():
+        table = dynamo.tables[server.config['DB_USERS']]
+        batch = UserBatch()
+
+        def single_scan(i):
+            condition = Attr('deptprofile.dept').contains(depts[i % len(depts)])
+            return list(iter_scan(table, ConsistentRead=True, FilterExpression=condition))
+
+        def parallel_scan(i):
+            return batch.attribute_contains_search('deptprofile.dept', depts[i % len(depts)])
+
+        def index(i):
+            dept = depts[i % len(depts)]
+            return batch.attribute_contains_search('deptprofile.dept', dept, paths=['UNI'], consistent=False)
+
+        for i in range(len(depts)):
+            found = sorted(user['UNI'] for user in single_scan(i))
+            assert found == sorted(user['UNI'] for user in parallel_scan(i)) == sorted(user['UNI'] for user in index(i))
+
+        results = {
+            'single': harness.run('single scan', single_scan, args.iterations, resources=resources),
+            'parallel': harness.run(f'parallel scan ({args.segments} segments)', parallel_scan, args.iterations,
+                                    resources=resources),
+            'index': harness.run('index, UNIs only', index, args.iterations, resources=resources),
+        }
+
+    for name in ('parallel', 'index'):
+        speedup = results['single']['p50_ms'] / results[name]['p50_ms']
+        print(f'\n{name}: {speedup:.1f}x faster than a single scan at p50')
+
+
+if __name__ == '__main__':
+    main()
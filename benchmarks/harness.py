@@ -0,0 +1,178 @@
+"""
+Benchmark helpers: timing, allocation and backend call measurements, JSON baselines and diffs
+"""
+
+# Standard library imports
+import gc
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from collections import Counter
+
+
+def percentile(values, pct):
+    """
+    Nearest-rank percentile
+
+    Args:
+        values (list[float])
+        pct (float): 0-100
+
+    Returns:
+        float
+    """
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def time_calls(func, iterations, warmup=3):
+    """
+    Calls `func(i)` for i in range(iterations) after `warmup` untimed calls.
+
+    Returns:
+        list[float]: Latency of each call in milliseconds
+    """
+    for i in range(warmup):
+        func(i)
+
+    timings = []
+    gc.collect()
+    for i in range(iterations):
+        start = time.perf_counter()
+        func(i)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return timings
+
+
+def measure_allocations(func, iterations):
+    """
+    Peak traced memory allocated during each call, measured in a separate pass
+    because tracemalloc slows calls down.
+
+    Returns:
+        float: Mean peak allocation per call in KiB
+    """
+    peaks = []
+    tracemalloc.start()
+    try:
+        for i in range(iterations):
+            tracemalloc.clear_traces()
+            func(i)
+            peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+    finally:
+        tracemalloc.stop()
+
+    return statistics.mean(peaks)
+
+
+class BackendCallCounter(object):
+    """Counts calls made to in-memory backends while active.
+
+    Args:
+        *resources: Objects with a `calls` Counter (`MemoryDynamoResource`, `MemoryS3Resource`)
+    """
+
+    def __init__(self, *resources):
+        self._resources = resources
+        self._before = Counter()
+        self.calls = Counter()
+
+    def _snapshot(self):
+        total = Counter()
+        for resource in self._resources:
+            for (name, operation), count in resource.calls.items():
+                total[f'{name}:{operation}'] += count
+        return total
+
+    def __enter__(self):
+        self._before = self._snapshot()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.calls = self._snapshot() - self._before
+
+
+def summarize(timings, allocations_kb=None, backend_calls=None, iterations=None):
+    """
+    Returns:
+        dict: p50/p95/p99/mean latency in ms, mean peak allocation and backend calls per iteration
+    """
+    result = {
+        'iterations': len(timings),
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'mean_ms': round(statistics.mean(timings), 3),
+    }
+
+    if allocations_kb is not None:
+        result['peak_alloc_kb'] = round(allocations_kb, 1)
+
+    if backend_calls is not None:
+        per_call = iterations or len(timings)
+        result['backend_calls'] = {key: round(count / per_call, 2) for key, count in sorted(backend_calls.items())}
+
+    return result
+
+
+def run(name, func, iterations, warmup=3, resources=()):
+    """
+    Measures a benchmark function: latency, allocations and (optionally) backend calls.
+
+    Args:
+        name (str): Benchmark name, only used for progress output
+        func (callable): Called with the iteration number
+        iterations (int)
+        warmup (int)
+        resources (tuple): In-memory backends whose calls should be counted
+
+    Returns:
+        dict: See `summarize`
+    """
+    with BackendCallCounter(*resources) as counter:
+        timings = time_calls(func, iterations, warmup=warmup)
+
+    allocations = measure_allocations(func, max(1, min(iterations, 20)))
+    result = summarize(timings, allocations, counter.calls if resources else None, iterations + warmup)
+    print(f"{name:<45} p50 {result['p50_ms']:>9.3f} ms   p95 {result['p95_ms']:>9.3f} ms   "
+          f"p99 {result['p99_ms']:>9.3f} ms   alloc {result['peak_alloc_kb']:>9.1f} KiB")
+    return result
+
+
+def write_results(path, results, **meta):
+    """
+    Writes results as a JSON baseline
+    """
+    payload = {
+        'meta': dict(meta, python=platform.python_version(), timestamp=time.strftime('%Y-%m-%dT%H:%M:%S')),
+        'results': results,
+    }
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+
+
+def compare(results, baseline_path):
+    """
+    Prints the change of every benchmark against a baseline written by `write_results`.
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)['results']
+
+    print(f"\n{'benchmark':<45} {'p50 change':>12} {'p95 change':>12} {'backend calls':>20}")
+    for name, result in sorted(results.items()):
+        if name not in baseline:
+            print(f'{name:<45} {"new":>12}')
+            continue
+
+        old = baseline[name]
+        changes = []
+        for key in ('p50_ms', 'p95_ms'):
+            changes.append(f'{(result[key] - old[key]) / old[key] * 100:+.1f}%' if old[key] else 'n/a')
+
+        old_calls = sum(old.get('backend_calls', {}).values())
+        new_calls = sum(result.get('backend_calls', {}).values())
+        print(f'{name:<45} {changes[0]:>12} {changes[1]:>12} {old_calls:>9.2f} -> {new_calls:<8.2f}')
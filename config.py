@@ -46,6 +46,46 @@ class Config(object):
 
     FORM_URL = os.getenv('FORM_URL')
 
+    # Data backend: 'dynamodb' for AWS, 'memory' for in-process stand-ins (see app.backends)
+    DATA_BACKEND = os.getenv('DATA_BACKEND', 'dynamodb')
+
+    # In-process caches
+    USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', 1024))  # Number of users
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 300))  # Seconds
+    USER_INDEX_TTL = int(os.getenv('USER_INDEX_TTL', 300))  # Seconds between rebuilds of the admin search index
+    USER_SCAN_SEGMENTS = int(os.getenv('USER_SCAN_SEGMENTS', 4))  # Parallel segments of users table scans
+    DEPTPROFILE_CACHE_SIZE = int(os.getenv('DEPTPROFILE_CACHE_SIZE', 64))  # Number of departments
+    DEPTPROFILE_CACHE_TTL = int(os.getenv('DEPTPROFILE_CACHE_TTL', 86400))  # Seconds, versioning handles refreshes
+    DEPTPROFILE_FIGURE_CACHE_SIZE = int(os.getenv('DEPTPROFILE_FIGURE_CACHE_SIZE', 1024))  # Chart outputs
+    DEPTPROFILE_VERSION_CHECK_INTERVAL = int(os.getenv('DEPTPROFILE_VERSION_CHECK_INTERVAL', 60))  # Seconds
+    DEPTPROFILE_WARM_CACHE = os.getenv('DEPTPROFILE_WARM_CACHE', 'true').lower() == 'true'  # Preload at start
+
+    # DynamoDB batch reads
+    SERVER_THREADS = int(os.getenv('SERVER_THREADS', 15))  # Request threads per process, e.g. gunicorn --threads
+    DYNAMO_BATCH_WORKERS = int(os.getenv('DYNAMO_BATCH_WORKERS', SERVER_THREADS))  # Shared by fan-out calls of all requests
+    SEARCHCOM_POSTING_CACHE_SIZE = int(os.getenv('SEARCHCOM_POSTING_CACHE_SIZE', 4096))  # Requisitions
+    SEARCHCOM_POSTING_CACHE_TTL = int(os.getenv('SEARCHCOM_POSTING_CACHE_TTL', 600))  # Seconds
+    SEARCHCOM_POSTING_INDEX_TTL = int(os.getenv('SEARCHCOM_POSTING_INDEX_TTL', 300))  # Seconds between index reads
+    SEARCHCOM_REFERENCE_TTL = int(os.getenv('SEARCHCOM_REFERENCE_TTL', 86400))  # Pipeline/subfields reload, seconds
+    SEARCHCOM_WARM_REFERENCE = os.getenv('SEARCHCOM_WARM_REFERENCE', 'true').lower() == 'true'  # Preload at start
+
+    # Query/scan metrics (see app.utils.dynamo.read_metrics)
+    DYNAMO_METRICS_LOG_INTERVAL = int(os.getenv('DYNAMO_METRICS_LOG_INTERVAL', 0))  # Seconds between log lines, 0 disables
+
+    # Server-side data exchanged between Dash callbacks (see app.utils.session_store)
+    SESSION_STORE_BACKEND = os.getenv('SESSION_STORE_BACKEND', 'memory')  # 'memory' or 'sqlite' for multiple workers
+    SESSION_STORE_PATH = os.getenv('SESSION_STORE_PATH')  # SQLite file, defaults to sessions.db in the instance folder
+    SESSION_STORE_SIZE = int(os.getenv('SESSION_STORE_SIZE', 4096))  # Entries of the memory backend
+    SESSION_STORE_TTL = int(os.getenv('SESSION_STORE_TTL', 3600))  # Seconds
+
+    # Check chart figure dicts against Plotly's validators (see app.utils.figures)
+    VALIDATE_FIGURES = os.getenv('VALIDATE_FIGURES', 'false').lower() == 'true'
+
+    # Background access logging
+    ACCESS_LOG_QUEUE_SIZE = int(os.getenv('ACCESS_LOG_QUEUE_SIZE', 10000))  # Items held before dropping
+    ACCESS_LOG_BATCH_SIZE = 25  # Items per BatchWriteItem call (DynamoDB maximum)
+    ACCESS_LOG_FLUSH_INTERVAL = float(os.getenv('ACCESS_LOG_FLUSH_INTERVAL', 2))  # Seconds
+
 
 class ProdConfig(Config):
     """Production configuration"""
@@ -56,9 +96,11 @@ class ProdConfig(Config):
     CAS_SERVER = os.getenv('CAS_SERVER_PROD')
     CAS_AFTER_LOGOUT = os.getenv('CAS_AFTER_LOGOUT_PROD')
     DB_USERS = os.getenv('DB_USERS_PROD')
+    DB_USER_PERMISSIONS = os.getenv('DB_USER_PERMISSIONS_PROD')
     DB_ACCESS_LOGS = os.getenv('DB_ACCESS_LOGS_PROD')
     DB_SEARCHCOM_APPLICANT = os.getenv('DB_SEARCHCOM_APPLICANT_PROD')
     DB_SEARCHCOM_POSTING = os.getenv('DB_SEARCHCOM_POSTING_PROD')
+    DB_SEARCHCOM_POSTING_INDEX = os.getenv('DB_SEARCHCOM_POSTING_INDEX_PROD')
     DB_SEARCHCOM_PIPELINE = os.getenv('DB_SEARCHCOM_PIPELINE_PROD')
     DB_SEARCHCOM_SUBFIELDS = os.getenv('DB_SEARCHCOM_SUBFIELDS_PROD')
     DB_LAB_OCCUPANCY = os.getenv('DB_LAB_OCCUPANCY_PROD')
@@ -76,12 +118,47 @@ class DevConfig(Config):
     CAS_SERVER = os.getenv('CAS_SERVER_DEV')
     CAS_AFTER_LOGOUT = os.getenv('CAS_AFTER_LOGOUT_DEV')
     DB_USERS = os.getenv('DB_USERS_DEV')
+    DB_USER_PERMISSIONS = os.getenv('DB_USER_PERMISSIONS_DEV')
     DB_ACCESS_LOGS = os.getenv('DB_ACCESS_LOGS_DEV')
     DB_SEARCHCOM_APPLICANT = os.getenv('DB_SEARCHCOM_APPLICANT_DEV')
     DB_SEARCHCOM_POSTING = os.getenv('DB_SEARCHCOM_POSTING_DEV')
+    DB_SEARCHCOM_POSTING_INDEX = os.getenv('DB_SEARCHCOM_POSTING_INDEX_DEV')
     DB_SEARCHCOM_PIPELINE = os.getenv('DB_SEARCHCOM_PIPELINE_DEV')
     DB_SEARCHCOM_SUBFIELDS = os.getenv('DB_SEARCHCOM_SUBFIELDS_DEV')
     DB_LAB_OCCUPANCY = os.getenv('DB_LAB_OCCUPANCY_DEV')
     DB_DEPTPROFILE = os.getenv('DB_DEPTPROFILE_DEV')
     DB_FACGOV = os.getenv('DB_FACGOV_DEV')
     FACGOV_BUCKET = os.getenv('FACGOV_BUCKET_NAME_DEV')
+
+
+class LocalConfig(Config):
+    """Offline configuration: in-memory DynamoDB/S3 stand-ins loaded with synthetic fixtures"""
+
+    ENV = 'local'
+    DEBUG = True
+    SESSION_COOKIE_SECURE = False
+
+    DATA_BACKEND = 'memory'
+    DATA_FIXTURES_SCALE = int(os.getenv('DATA_FIXTURES_SCALE', 1))
+    MEMORY_PAGE_BYTES = int(os.getenv('MEMORY_PAGE_BYTES', 1024 * 1024))
+    MEMORY_LATENCY_MS = float(os.getenv('MEMORY_LATENCY_MS', 0))  # Simulated round trip per call
+    DEPTPROFILE_WARM_CACHE = os.getenv('DEPTPROFILE_WARM_CACHE', 'false').lower() == 'true'
+    SEARCHCOM_WARM_REFERENCE = os.getenv('SEARCHCOM_WARM_REFERENCE', 'false').lower() == 'true'
+    VALIDATE_FIGURES = os.getenv('VALIDATE_FIGURES', 'true').lower() == 'true'
+
+    CAS_SERVER = os.getenv('CAS_SERVER_DEV', 'http://localhost')
+    CAS_AFTER_LOGOUT = os.getenv('CAS_AFTER_LOGOUT_DEV')
+    DB_USERS = 'local-users'
+    DB_USER_PERMISSIONS = 'local-user-permissions'
+    DB_ACCESS_LOGS = 'local-access-logs'
+    DB_SEARCHCOM_APPLICANT = 'local-searchcom-applicant'
+    DB_SEARCHCOM_POSTING = 'local-searchcom-posting'
+    DB_SEARCHCOM_POSTING_INDEX = 'local-searchcom-posting-index'
+    DB_SEARCHCOM_PIPELINE = 'local-searchcom-pipeline'
+    DB_SEARCHCOM_SUBFIELDS = 'local-searchcom-subfields'
+    DB_LAB_OCCUPANCY = 'local-lab-occupancy'
+    DB_DEPTPROFILE = 'local-deptprofile'
+    DB_FACGOV = 'local-facgov'
+    FACGOV_BUCKET = 'local-facgov'
+    FIF_FILES_BUCKET = 'local-fif-files'
+    TEMPLATES_BUCKET = 'local-templates'
@@ -0,0 +1,69 @@
+"""
+Fixtures for tests against the in-memory backend (see `app.backends.memory`)
+"""
+
+# Standard library imports
+import os
+
+# config.py requires a secret key at import time
+os.environ.setdefault('SECRET_KEY', 'test')
+
+# Third party imports
+import pytest
+
+# Local application imports
+from config import LocalConfig
+from app import create_app
+from app.extensions import dynamo
+from app.utils import cache
+from tests.dash_client import CallbackClient
+
+
+class TestConfig(LocalConfig):
+    TESTING = True
+    DATA_FIXTURES_SCALE = 1
+    USER_CACHE_TTL = 60
+    USER_INDEX_TTL = 60
+
+
+@pytest.fixture
+def app():
+    server = create_app(TestConfig)
+    with server.app_context():
+        yield server
+
+
+@pytest.fixture
+def users_table(app):
+    return dynamo.tables[app.config['DB_USERS']]
+
+
+@pytest.fixture
+def dash_client(app):
+    """
+    Calls Dash callbacks as fixtures.ADMIN_UNI, see `tests.dash_client`
+    """
+    return CallbackClient(app)
+
+
+class Clock(object):
+    """Replaces time.monotonic of the cache module, see `clock`"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    Controls the time seen by `TTLCache`, e.g. `clock.advance(61)` to expire entries with a 60 second TTL
+    """
+    fake = Clock()
+    monkeypatch.setattr(cache, 'time', fake)
+    return fake
@@ -0,0 +1,103 @@
+"""
+Dash test client, shared by the tests and `benchmarks.bench_callbacks`
+"""
+
+# Local application imports
+from app.backends.fixtures import ADMIN_UNI
+
+
+class CallbackClient(object):
+    """Calls Dash callbacks through the `_dash-update-component` endpoint.
+
+    Callback dependencies are read from each app's `_dash-dependencies` endpoint, so a callback
+    is addressed by its first output and only the values of its inputs and states need to be given.
+
+    Args:
+        server (Flask object)
+        uni (str): User to log in as
+    """
+
+    def __init__(self, server, uni=ADMIN_UNI):
+        self.client = server.test_client()
+        with self.client.session_transaction() as session:
+            session['CAS_USERNAME'] = uni
+        self._dependencies = {}
+
+    def dependency(self, base, output):
+        """
+        Args:
+            base (str): Dash app pathname, e.g. 'searchcom'
+            output (str): First output of the callback, e.g. 'searchcom-applicant-chart.figure'
+
+        Returns:
+            dict: Callback dependency as served by Dash
+        """
+        if base not in self._dependencies:
+            response = self.client.get(f'/{base}/_dash-dependencies')
+            self._dependencies[base] = response.get_json()
+
+        for dependency in self._dependencies[base]:
+            if dependency['output'] == output or dependency['output'].startswith(f'..{output}...'):
+                return dependency
+
+        raise KeyError(f'No callback with output {output} in /{base}/')
+
+    def call(self, base, output, values):
+        """
+        Triggers a callback with every input marked as changed
+
+        Args:
+            base (str): Dash app pathname
+            output (str): First output of the callback
+            values (dict): Values of inputs and states keyed by 'id.property'. Missing values are sent as None.
+
+        Returns:
+            dict: Callback response keyed by component id, or None if the callback prevented the update
+        """
+        dependency = self.dependency(base, output)
+
+        def resolve(dependencies):
+            return [dict(d, value=values.get(f"{d['id']}.{d['property']}")) for d in dependencies]
+
+        inputs = resolve(dependency['inputs'])
+        payload = {
+            'output': dependency['output'],
+            'outputs': self._outputs(dependency['output']),
+            'inputs': inputs,
+            'state': resolve(dependency['state']),
+            'changedPropIds': [f"{d['id']}.{d['property']}" for d in inputs],
+        }
+
+        response = self.client.post(f'/{base}/_dash-update-component', json=payload)
+        if response.status_code == 204:
+            return None
+        if response.status_code != 200:
+            raise RuntimeError(f"{dependency['output']} returned {response.status_code}")
+        return response.get_json()['response']
+
+    def layout(self, base):
+        """
+        Requests a Dash app's layout, as the browser does on page load
+
+        Returns:
+            dict: Layout
+        """
+        response = self.client.get(f'/{base}/_dash-layout')
+        if response.status_code != 200:
+            raise RuntimeError(f'/{base}/_dash-layout returned {response.status_code}')
+        return response.get_json()
+
+    @staticmethod
+    def _outputs(output):
+        """
+        Dash's `outputs` payload: a dict for a single output, a list for multiple outputs
+        """
+        if not output.startswith('..'):
+            component_id, prop = output.rsplit('.', 1)
+            return {'id': component_id, 'property': prop}
+
+        outputs = []
+        for part in output[2:-2].split('...'):
+            component_id, prop = part.rsplit('.', 1)
+            outputs.append({'id': component_id, 'property': prop})
+        return outputs
@@ -0,0 +1,73 @@
+"""
+Pre-suppressed applicant data (`app.searchcom.ingest.annotate_applicants`) read by the searchcom callbacks
+
+The in-memory backend rejects projections DynamoDB would reject, so the fallback read of items without
+a current annotation runs against the same validation as in production.
+"""
+
+# Local application imports
+from app.extensions import dynamo
+from app.searchcom.ingest import ANNOTATION_ATTRIBUTES, annotate_applicants
+from app.utils.dynamo import iter_scan
+
+
+def crosstab_style(dash_client, req_num):
+    stores = dash_client.call('searchcom', 'searchcom-session-data-posting.data', {'req-num-dropdown.value': req_num})
+    values = {
+        'req-num-dropdown.value': req_num,
+        'searchcom-session-data-applicant.modified_timestamp': 1,
+        'searchcom-session-data-applicant.data': stores['searchcom-session-data-applicant']['data'],
+    }
+    return dash_client.call('searchcom', 'searchcom-xtab-table.style', values)['searchcom-xtab-table']['style']
+
+
+def reload_without_crosstab(app, dash_client):
+    """
+    Reloads an applicant item that passed the crosstab threshold, so that it no longer does,
+    without annotating it again
+
+    Returns:
+        str: Requisition number
+    """
+    table = dynamo.tables[app.config['DB_SEARCHCOM_APPLICANT']]
+    item = min((item for item in iter_scan(table) if item['xtab_ok']), key=lambda item: item['req_num'])
+    assert crosstab_style(dash_client, item['req_num']) == {'display': 'inline'}
+
+    item['refresh_date'] = '2020-12-01'
+    item['agg']['gender_Male_sum'] = 0
+    table.put_item(Item=item)
+    return item['req_num']
+
+
+def applicant_queries(app):
+    return dynamo._connection_instance.calls[(app.config['DB_SEARCHCOM_APPLICANT'], 'query')]
+
+
+def test_annotations_of_an_earlier_load_are_ignored(app, dash_client):
+    req_num = reload_without_crosstab(app, dash_client)
+
+    queries = applicant_queries(app)
+    assert crosstab_style(dash_client, req_num) == {'display': 'none'}
+    assert applicant_queries(app) - queries == 2  # Annotated attributes, then the fallback read
+
+
+def test_unannotated_items_are_suppressed_on_request(app, dash_client):
+    table = dynamo.tables[app.config['DB_SEARCHCOM_APPLICANT']]
+    item = min((item for item in iter_scan(table) if item['xtab_ok']), key=lambda item: item['req_num'])
+    for name in ANNOTATION_ATTRIBUTES:
+        item.pop(name, None)
+    table.put_item(Item=item)
+
+    queries = applicant_queries(app)
+    assert crosstab_style(dash_client, item['req_num']) == {'display': 'inline'}
+    assert applicant_queries(app) - queries == 2
+
+
+def test_annotate_applicants_records_refresh_date(app, dash_client):
+    req_num = reload_without_crosstab(app, dash_client)
+    annotate_applicants()
+
+    item = dynamo.tables[app.config['DB_SEARCHCOM_APPLICANT']].get_item(Key={'req_num': req_num})['Item']
+    assert item['annotated_refresh_date'] == '2020-12-01'
+    assert not item['xtab_ok'] and 'xtab_cells' not in item
+    assert crosstab_style(dash_client, req_num) == {'display': 'none'}
@@ -0,0 +1,74 @@
+"""
+Load-once behaviour of `app.utils.cache.TTLCache.get_or_load`
+"""
+
+# Standard library imports
+import threading
+import time
+
+# Local application imports
+from app.utils.cache import TTLCache
+
+
+def test_concurrent_calls_share_one_load():
+    cache = TTLCache(maxsize=4)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return 'value'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load('key', loader))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ['value'] * 8
+
+
+def test_other_keys_are_not_blocked_by_a_load():
+    cache = TTLCache(maxsize=4)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_loader():
+        started.set()
+        release.wait(5)
+        return 'slow'
+
+    thread = threading.Thread(target=cache.get_or_load, args=('slow', slow_loader))
+    thread.start()
+    started.wait(5)
+
+    assert cache.get_or_load('fast', lambda: 'fast') == 'fast'
+    release.set()
+    thread.join()
+    assert cache.get('slow') == 'slow'
+
+
+def test_expired_value_is_reloaded(clock):
+    cache = TTLCache(maxsize=4, ttl=10)
+    cache.get_or_load('key', lambda: 1)
+
+    clock.advance(5)
+    assert cache.get_or_load('key', lambda: 2) == 1
+
+    clock.advance(6)
+    assert cache.get_or_load('key', lambda: 2) == 2
+
+
+def test_replace_keeps_expiry(clock):
+    cache = TTLCache(maxsize=4, ttl=10)
+    cache.set('key', {'a': 1})
+
+    clock.advance(6)
+    cache.replace('key', lambda value: {**value, 'b': 2})
+    cache.replace('missing', lambda value: {})
+    assert cache.get('key') == {'a': 1, 'b': 2}
+    assert cache.get('missing') is None
+
+    clock.advance(5)
+    assert cache.get('key') is None
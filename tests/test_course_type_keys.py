@@ -0,0 +1,74 @@
+"""
+Course type sort keys of the deptprofile data (`app.deptprofile.ingest`)
+"""
+
+# Third party imports
+from boto3.dynamodb.conditions import Key
+
+# Local application imports
+from app.backends.fixtures import FORMER_LAYOUT_DEPTS
+from app.deptprofile.data import course_type_key, department_cache, get_department_data
+from app.deptprofile.ingest import rekey_course_types
+from app.extensions import dynamo
+from app.utils.dynamo import iter_query
+
+
+COURSE_DATASETS = ('CLASSES#CORE', 'ENRL#CORE')
+
+
+def partition_keys(app, dept):
+    table = dynamo.tables[app.config['DB_DEPTPROFILE']]
+    return [item['SK'] for item in iter_query(table, KeyConditionExpression=Key('PK').eq(f'DEPT#{dept}'))]
+
+
+def former_keys(app, dept):
+    keys = (sk.split('#') for sk in partition_keys(app, dept))
+    return ['#'.join(parts) for parts in keys if parts[1] in ('CLASSES', 'ENRL') and parts[2].isdigit()]
+
+
+def core_records(dept):
+    department_cache.clear()
+    data = get_department_data(dept)
+    return {dataset: data.records(dataset) for dataset in COURSE_DATASETS}
+
+
+def test_course_type_key():
+    assert course_type_key('DATA#CLASSES#2019#Core#Tenured', 'Core') == 'DATA#CLASSES#CORE#2019#Tenured'
+    assert course_type_key('DATA#ENRL#2019#Elective#NTBOT', 'Elective') == 'DATA#ENRL#ELECTIVE#2019#NTBOT'
+    assert course_type_key('DATA#CLASSES#CORE#2019#Tenured', 'Core') is None
+    assert course_type_key('DATA#STUDENTS#UG#2019', 'Core') is None
+
+
+def test_former_layout_is_read_with_course_type_filter(app):
+    dept = FORMER_LAYOUT_DEPTS[0]
+    assert not [sk for sk in partition_keys(app, dept) if sk.startswith('DATA#CLASSES#CORE#')]
+
+    records = core_records(dept)
+    for dataset in COURSE_DATASETS:
+        assert records[dataset]
+        assert all(item['course_type'] == 'Core' for item in records[dataset])
+        assert all(item['SK'].startswith(f'DATA#{dataset}#') for item in records[dataset])
+
+
+def test_rekey_course_types_copies_and_deletes_former_items(app):
+    before = {dept: core_records(dept) for dept in FORMER_LAYOUT_DEPTS}
+    former = {dept: former_keys(app, dept) for dept in FORMER_LAYOUT_DEPTS}
+
+    stats = rekey_course_types(delete_old=True)
+
+    copied = sum(len(keys) for keys in former.values())
+    assert copied and stats == {'copied': copied, 'deleted': copied}
+    for dept in FORMER_LAYOUT_DEPTS:
+        keys = partition_keys(app, dept)
+        assert not set(former[dept]) & set(keys)
+        assert [sk for sk in keys if sk.startswith('DATA#CLASSES#ELECTIVE#')]
+        assert core_records(dept) == before[dept]
+
+
+def test_rekey_course_types_keeps_former_items_by_default(app):
+    former = former_keys(app, FORMER_LAYOUT_DEPTS[0])
+
+    stats = rekey_course_types()
+
+    assert former and stats['deleted'] == 0
+    assert set(former) <= set(partition_keys(app, FORMER_LAYOUT_DEPTS[0]))
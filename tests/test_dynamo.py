@@ -0,0 +1,29 @@
+"""
+DynamoDB helpers (`app.utils.dynamo`)
+"""
+
+# Standard library imports
+import threading
+
+# Local application imports
+from app.utils.dynamo import _executor, projection_expression, run_concurrently
+
+
+def test_first_call_runs_in_calling_thread(app):
+    threads = run_concurrently(*[threading.current_thread] * 3)
+
+    assert threads[0] is threading.current_thread()
+    assert all(thread.name.startswith('dynamo-batch') for thread in threads[1:])
+
+
+def test_pool_is_sized_from_config(app):
+    run_concurrently(lambda: None, lambda: None)
+    assert _executor['workers'] == app.config['DYNAMO_BATCH_WORKERS'] == app.config['SERVER_THREADS']
+    assert _executor['pool']._max_workers == app.config['DYNAMO_BATCH_WORKERS']
+
+
+def test_projection_expression_projects_repeated_paths_once():
+    projection, names = projection_expression(['refresh_date', 'agg.gender_Female_sum', 'agg.gender_Female_sum'])
+
+    paths = ['.'.join(names[part] for part in path.split('.')) for path in projection.split(', ')]
+    assert paths == ['refresh_date', 'agg.gender_Female_sum']
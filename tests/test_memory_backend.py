@@ -0,0 +1,48 @@
+"""
+Condition semantics of the in-memory DynamoDB stand-in
+"""
+
+# Standard library imports
+from decimal import Decimal
+
+# Third party imports
+import pytest
+from boto3.dynamodb.conditions import Attr
+
+# Local application imports
+from app.backends.fixtures import USERS_PER_SCALE
+from app.backends.memory import MemoryBackendError
+from app.utils.dynamo import iter_scan
+
+
+def scan_unis(table, condition):
+    return sorted(item['UNI'] for item in iter_scan(table, FilterExpression=condition))
+
+
+def test_booleans_do_not_match_numbers(users_table):
+    users_table.put_item(Item={'UNI': 'number', 'admin_tag': Decimal(1), 'fif': {'dept': {Decimal(1)}}})
+
+    assert 'number' not in scan_unis(users_table, Attr('admin_tag').eq(True))
+    assert 'admin1' not in scan_unis(users_table, Attr('admin_tag').eq(1))
+    assert scan_unis(users_table, Attr('admin_tag').eq(1)) == ['number']
+    assert scan_unis(users_table, Attr('fif.dept').contains(True)) == []
+    assert 'admin1' in scan_unis(users_table, Attr('admin_tag').ne(1))
+
+
+def test_scan_follows_pages(app, users_table):
+    users_table._resource.page_bytes = 200
+
+    assert len(list(iter_scan(users_table))) == app.config['DATA_FIXTURES_SCALE'] * USERS_PER_SCALE + 1
+
+
+@pytest.mark.parametrize('projection', ['UNI, #f.#d, UNI', '#f, #f.#d', '#f.#d, #f'])
+def test_overlapping_projection_paths_are_rejected(users_table, projection):
+    with pytest.raises(MemoryBackendError):
+        users_table.get_item(Key={'UNI': 'user0'}, ProjectionExpression=projection,
+                             ExpressionAttributeNames={'#f': 'fif', '#d': 'dept'})
+
+
+def test_sibling_projection_paths_are_accepted(users_table):
+    item = users_table.get_item(Key={'UNI': 'user0'}, ProjectionExpression='#f.#d, #f.chair_dept, fifth',
+                                ExpressionAttributeNames={'#f': 'fif', '#d': 'dept'})['Item']
+    assert set(item['fif']) == {'dept', 'chair_dept'}
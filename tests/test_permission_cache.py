@@ -0,0 +1,56 @@
+"""
+Permission cache of `app.users.User`
+"""
+
+# Local application imports
+from app.users import User, invalidate
+
+
+def revoke_reqs(users_table, uni, reqs):
+    item = users_table.get_item(Key={'UNI': uni})['Item']
+    item['searchcom']['reqs'] = reqs
+    users_table.put_item(Item=item)
+
+
+def test_permissions_are_served_from_cache_within_ttl(app, users_table, clock):
+    before = User('user0').searchcom_access()
+    revoke_reqs(users_table, 'user0', {'1'})
+
+    clock.advance(30)
+    assert User('user0').searchcom_access() == before
+
+
+def test_permissions_expire_after_ttl(app, users_table, clock):
+    User('user0').searchcom_access()
+    revoke_reqs(users_table, 'user0', {'1'})
+
+    clock.advance(61)
+    assert User('user0').searchcom_access() == ['1']
+
+
+def test_loading_another_path_does_not_extend_older_paths(app, users_table, clock):
+    User('user0').searchcom_access()
+    revoke_reqs(users_table, 'user0', {'1'})
+
+    # Loading a new path stores the entry with a fresh TTL, which must not keep the revoked requisitions alive
+    clock.advance(50)
+    User('user0').fif_access('dept')
+    clock.advance(50)
+
+    assert User('user0').searchcom_access() == ['1']
+
+
+def test_overlapping_paths_are_loaded_together(app):
+    user = User('user0')
+    depts = user.fif_access('dept')
+
+    assert User('user0').permissions()['fif']['dept'] == set(depts)
+    assert User('user0').fif_access('dept') == depts
+
+
+def test_invalidate_drops_cached_permissions(app, users_table, clock):
+    User('user0').searchcom_access()
+    revoke_reqs(users_table, 'user0', {'1'})
+
+    invalidate('user0')
+    assert User('user0').searchcom_access() == ['1']
@@ -0,0 +1,82 @@
+"""
+Permission edges written by `UserBatch.put_user`/`delete_user` and read by `users_with_permission`
+"""
+
+# Third party imports
+import pytest
+
+# Local application imports
+from app.backends.memory import MemoryBatchWriter
+from app.extensions import dynamo
+from app.users import UserBatch, permission_edges
+from app.utils.dynamo import iter_scan
+
+
+@pytest.fixture
+def edges_table(app):
+    return dynamo.tables[app.config['DB_USER_PERMISSIONS']]
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    """
+    Edge keys put and deleted through batch writers
+    """
+    recorded = {'put': set(), 'delete': set()}
+    put, delete = MemoryBatchWriter.put_item, MemoryBatchWriter.delete_item
+
+    def record_put(writer, Item):
+        recorded['put'].add((Item['PK'], Item['SK']))
+        put(writer, Item)
+
+    def record_delete(writer, Key):
+        recorded['delete'].add((Key['PK'], Key['SK']))
+        delete(writer, Key)
+
+    monkeypatch.setattr(MemoryBatchWriter, 'put_item', record_put)
+    monkeypatch.setattr(MemoryBatchWriter, 'delete_item', record_delete)
+    return recorded
+
+
+def stored_edges(edges_table, uni):
+    return {(edge['PK'], edge['SK']) for edge in iter_scan(edges_table) if edge['UNI'] == uni}
+
+
+def test_fixture_edges_match_users(app, users_table, edges_table):
+    for user in iter_scan(users_table):
+        assert stored_edges(edges_table, user['UNI']) == {(e['PK'], e['SK']) for e in permission_edges(user)}
+
+
+def test_put_user_writes_only_changed_edges(app, users_table, edges_table, writes):
+    item = users_table.get_item(Key={'UNI': 'user0'})['Item']
+    item['deptprofile']['dept_chair'] = set()
+    item['searchcom']['reqs'] = item['searchcom']['reqs'] | {'NEW'}
+    item['facgov'] = True
+
+    UserBatch().put_user(item)
+
+    assert writes['put'] == {('REQ#NEW', 'USER#user0'), ('FACGOV', 'USER#user0')}
+    assert writes['delete'] == {('DEPTPROFILE_CHAIR#PSYC', 'USER#user0')}
+    assert stored_edges(edges_table, 'user0') == {(e['PK'], e['SK']) for e in permission_edges(item)}
+
+
+def test_put_user_without_changes_writes_nothing(app, users_table, writes):
+    UserBatch().put_user(users_table.get_item(Key={'UNI': 'user0'})['Item'])
+    assert writes == {'put': set(), 'delete': set()}
+
+
+def test_put_new_user_adds_edges(app, edges_table):
+    UserBatch().put_user({'UNI': 'new1', 'searchcom': {'reqs': {'NEW'}}, 'admin_tag': True})
+
+    assert stored_edges(edges_table, 'new1') == {('REQ#NEW', 'USER#new1'), ('ADMIN', 'USER#new1')}
+    assert [user['UNI'] for user in UserBatch().users_with_permission('searchcom.reqs', 'NEW', paths=['UNI'])] == ['new1']
+
+
+def test_delete_user_removes_edges(app, users_table, edges_table):
+    chairs = UserBatch().deptprofile_chairs('PSYC', paths=['UNI'])
+    assert 'user0' in [user['UNI'] for user in chairs]
+
+    UserBatch().delete_user('user0')
+
+    assert stored_edges(edges_table, 'user0') == set()
+    assert 'user0' not in [user['UNI'] for user in UserBatch().deptprofile_chairs('PSYC', paths=['UNI'])]
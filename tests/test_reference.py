@@ -0,0 +1,30 @@
+"""
+Pipeline and subfield reference data of the searchcom dashboard (`app.searchcom.reference`)
+"""
+
+# Local application imports
+from app.extensions import dynamo
+from app.searchcom.reference import get_pipeline, get_reference_table, get_subfields
+
+
+def reference_queries(app, config_key):
+    return dynamo._connection_instance.calls[(app.config[config_key], 'query')]
+
+
+def test_department_added_after_scan_is_queried_and_cached(app):
+    before = get_reference_table('DB_SEARCHCOM_SUBFIELDS')
+    table = dynamo.tables[app.config['DB_SEARCHCOM_SUBFIELDS']]
+    table.put_item(Item={'Dept': 'NEW', 'Subfield': 'New subfield'})
+
+    assert get_subfields('NEW') == {'Dept': 'NEW', 'Subfield': 'New subfield'}
+    assert get_reference_table('DB_SEARCHCOM_SUBFIELDS')['NEW'] == {'Dept': 'NEW', 'Subfield': 'New subfield'}
+    assert 'NEW' not in before  # Replaced, not changed under readers
+
+
+def test_missing_department_is_empty_and_queried_once(app):
+    queries = reference_queries(app, 'DB_SEARCHCOM_PIPELINE')
+
+    assert get_pipeline('NONE') == {}
+    assert get_pipeline('NONE') == {}
+    assert get_subfields('NONE') == {}
+    assert reference_queries(app, 'DB_SEARCHCOM_PIPELINE') - queries == 1
@@ -0,0 +1,49 @@
+"""
+Server-side session data of the searchcom dashboard (`app.utils.session_store`)
+"""
+
+# Standard library imports
+import pickle
+import sqlite3
+
+# Local application imports
+from app.extensions import dynamo
+from app.utils.dynamo import iter_scan
+from app.utils.session_store import SQLiteSessionBackend
+
+
+def test_sqlite_backend_stores_json(tmp_path):
+    path = str(tmp_path / 'instance' / 'sessions.db')
+    backend = SQLiteSessionBackend(path, ttl=60)
+
+    backend.set('user:1', {'agg': {'Female': 12.5}, 'xtab': [1, 2]})
+
+    assert SQLiteSessionBackend(path, ttl=60).get('user:1') == {'agg': {'Female': 12.5}, 'xtab': [1, 2]}
+    value, = sqlite3.connect(path).execute("SELECT value FROM entries WHERE key = 'user:1'").fetchone()
+    assert value == '{"agg": {"Female": 12.5}, "xtab": [1, 2]}'
+
+
+def test_sqlite_backend_ignores_pickled_entries(tmp_path):
+    path = str(tmp_path / 'sessions.db')
+    backend = SQLiteSessionBackend(path, ttl=60)
+
+    with sqlite3.connect(path) as connection:
+        connection.execute('INSERT INTO entries VALUES (?, ?, ?)', ('user:1', pickle.dumps({'a': 1}), 1e12))
+
+    assert backend.get('user:1') is None
+
+
+def test_missing_handle_reloads_requisition(app, dash_client):
+    req_num = min(item['req_num'] for item in iter_scan(dynamo.tables[app.config['DB_SEARCHCOM_POSTING']]))
+
+    stores = dash_client.call('searchcom', 'searchcom-session-data-posting.data', {'req-num-dropdown.value': req_num})
+    values = {'req-num-dropdown.value': req_num}
+    for name in ('posting', 'applicant', 'pipeline', 'subfields'):
+        values[f'searchcom-session-data-{name}.modified_timestamp'] = 1
+        values[f'searchcom-session-data-{name}.data'] = stores[f'searchcom-session-data-{name}']['data']
+
+    expected = dash_client.call('searchcom', 'searchcom-applicant-chart.figure', values)
+
+    # A handle stored by another worker process, or expired
+    values['searchcom-session-data-applicant.data'] = 'unknown'
+    assert dash_client.call('searchcom', 'searchcom-applicant-chart.figure', values) == expected
@@ -0,0 +1,80 @@
+"""
+Admin searches answered by `app.users.user_index` against strongly consistent scans
+"""
+
+# Standard library imports
+import threading
+
+# Third party imports
+import pytest
+
+# Local application imports
+from app import users
+from app.deptprofile.layouts.filters import ALL_DROPDOWN_OPTIONS
+from app.users import UserBatch, invalidate, user_index
+
+
+DEPTS = [option['value'] for option in ALL_DROPDOWN_OPTIONS if not option.get('disabled')]
+
+
+def unis(results):
+    return sorted(user['UNI'] for user in results)
+
+
+def search_both(method, attribute, value):
+    search = getattr(UserBatch(), method)
+    return unis(search(attribute, value, paths=['UNI'])), unis(search(attribute, value, consistent=False))
+
+
+@pytest.mark.parametrize('attribute', ['deptprofile.dept', 'deptprofile.dept_chair', 'fif.dept'])
+def test_contains_search_matches_scan(app, attribute):
+    for dept in DEPTS:
+        scanned, indexed = search_both('attribute_contains_search', attribute, dept)
+        assert scanned == indexed
+
+
+@pytest.mark.parametrize('attribute, value', [('admin_tag', True), ('facgov', False), ('UNI', 'user3')])
+def test_eq_search_matches_scan(app, attribute, value):
+    scanned, indexed = search_both('attribute_eq_search', attribute, value)
+    assert scanned and scanned == indexed
+
+
+def test_index_follows_invalidated_writes(app, users_table):
+    UserBatch().attribute_contains_search('searchcom.reqs', 'NEW', consistent=False)
+
+    item = users_table.get_item(Key={'UNI': 'user1'})['Item']
+    item['searchcom']['reqs'] = {'NEW'}
+    users_table.put_item(Item=item)
+    invalidate('user1')
+
+    assert search_both('attribute_contains_search', 'searchcom.reqs', 'NEW') == (['user1'], ['user1'])
+
+
+def test_mark_stale_does_not_wait_for_a_rebuild(app, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    scan = users.parallel_scan
+
+    def slow_scan(*args, **kwargs):
+        started.set()
+        release.wait(5)
+        return scan(*args, **kwargs)
+
+    monkeypatch.setattr(users, 'parallel_scan', slow_scan)
+
+    def lookup():
+        with app.app_context():
+            user_index.lookup('deptprofile.dept', 'BIOL', 'contains')
+
+    rebuild = threading.Thread(target=lookup)
+    rebuild.start()
+    started.wait(5)
+
+    writer = threading.Thread(target=user_index.mark_stale, args=('user2',))
+    writer.start()
+    writer.join(1)
+    blocked = writer.is_alive()
+
+    release.set()
+    rebuild.join()
+    writer.join()
+    assert not blocked